@@ -6,6 +6,7 @@ from datetime import datetime
 from collections import defaultdict, Counter
 from tkinter import messagebox
 import traceback
+from cancellation import OperationCancelled
 
 
 class AutoFolderOrganizer:
@@ -369,9 +370,14 @@ class AutoFolderOrganizer:
 
         return None  # Brak dynamicznej kategorii
 
-    def create_folders_and_move_files(self, file_mapping, dry_run=False, use_existing_structure=True):
+    def create_folders_and_move_files(self, file_mapping, dry_run=False, use_existing_structure=True,
+                                      token=None, progress=None):
         """
-        Tworzy foldery i przenosi pliki zgodnie z mapowaniem
+        Tworzy foldery i przenosi pliki zgodnie z mapowaniem.
+
+        token - CancellationToken sprawdzany przed każdym plikiem: anulowanie kończy pracę po
+        bieżącym pliku (pozostałe trafiają do 'skipped', a 'cancelled' = True).
+        progress(etap, nazwa_pliku) - wywoływane po każdym pliku ("przeniesione" / "błędy").
         """
         print(f"\n=== {'SYMULACJA' if dry_run else 'WYKONANIE'} PRZENOSZENIA ===")
         print(f"Używanie istniejącej struktury: {'TAK' if use_existing_structure else 'NIE'}")
@@ -381,7 +387,8 @@ class AutoFolderOrganizer:
             'failed': [],
             'folders_created': set(),
             'folders_reused': set(),
-            'skipped': []
+            'skipped': [],
+            'cancelled': False
         }
 
         # Jeśli włączona jest opcja używania istniejącej struktury, przeanalizuj istniejące foldery
@@ -394,7 +401,21 @@ class AutoFolderOrganizer:
         else:
             existing_structure = {}
 
-        for source_path, target_path in file_mapping.items():
+        mapping_items = list(file_mapping.items())
+        for position, (source_path, target_path) in enumerate(mapping_items):
+            if token is not None:
+                try:
+                    token.checkpoint()
+                except OperationCancelled:
+                    print(f"\n⛔ Przerwano - nieprzeniesione pliki: {len(mapping_items) - position}")
+                    results['cancelled'] = True
+                    results['skipped'].extend(
+                        {'source': source, 'target': target, 'reason': 'Anulowano'}
+                        for source, target in mapping_items[position:]
+                    )
+                    break
+
+            stage = "przeniesione"
             try:
                 # Sprawdź czy plik źródłowy istnieje
                 if not os.path.exists(source_path):
@@ -403,6 +424,7 @@ class AutoFolderOrganizer:
                         'target': target_path,
                         'error': 'Plik źródłowy nie istnieje'
                     })
+                    stage = "błędy"
                     continue
 
                 # Dostosuj ścieżkę docelową do istniejącej struktury (jeśli włączone)
@@ -466,6 +488,11 @@ class AutoFolderOrganizer:
                     'target': target_path,
                     'error': str(e)
                 })
+                stage = "błędy"
+
+            finally:
+                if progress is not None:
+                    progress(stage, os.path.basename(source_path))
 
         # Podsumowanie
         print(f"\n=== PODSUMOWANIE ===")
@@ -473,6 +500,8 @@ class AutoFolderOrganizer:
         print(f"Błędy: {len(results['failed'])}")
         print(f"Nowe foldery: {len(results['folders_created'])}")
         print(f"Ponownie użyte foldery: {len(results['folders_reused'])}")
+        if results['cancelled']:
+            print(f"Przerwano - nieprzeniesione: {len(results['skipped'])}")
 
         return results
 
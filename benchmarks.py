@@ -0,0 +1,286 @@
+# benchmarks.py
+"""Mikrobenchmarki wydajności analizy nazw plików.
+
+Uruchomienie: python benchmarks.py [liczba_nazw]
+"""
+import re
+import sys
+import time
+import random
+import tracemalloc
+
+from category_analyzer import (
+    SIMPLE_PATTERNS, IGNORE_WORDS, NameScan, scan_name, extract_dynamic_categories
+)
+from series_grouping import find_series, find_common_part, LaterNameIndex
+from bucketing import np, DAY, SIZE_SCALE, AGE_SCALE, size_bucket_codes, age_bucket_codes
+
+SYNTHETIC_WORDS = [
+    'raport', 'faktura', 'zdjecie', 'wakacje', 'backup', 'kopia', 'config', 'temp',
+    'test', 'proba', 'projekt', 'umowa', 'notatki', 'prezentacja', 'muzyka', 'film',
+    'dokument', 'final', 'wersja', 'zażółć', 'gęślą', 'jaźń', 'img', 'dsc', 'scan'
+]
+SYNTHETIC_SEPARATORS = ['_', '-', ' ', '.', '']
+
+
+def legacy_scan(name_lower):
+    """Pierwotna analiza nazwy (kilka osobnych wyszukiwań) - punkt odniesienia"""
+    simple = []
+    for pattern_name, patterns in SIMPLE_PATTERNS.items():
+        for pattern in patterns:
+            if re.search(pattern, name_lower):
+                simple.append(pattern_name)
+                break
+
+    clean_name = re.sub(r'[^\w\s]', ' ', name_lower)
+    clean_name = re.sub(r'\d+', ' ', clean_name)
+    words = [w.strip() for w in clean_name.split() if len(w.strip()) >= 3]
+    meaningful_words = [w for w in words if w not in IGNORE_WORDS]
+
+    time_patterns = []
+    if re.search(r'\d{4}-\d{2}-\d{2}', name_lower):
+        time_patterns.append('dzienny')
+    elif re.search(r'\d{4}-\d{2}', name_lower):
+        time_patterns.append('miesięczny')
+    elif re.search(r'\b\d{4}\b', name_lower):
+        time_patterns.append('roczny')
+
+    learn_words = [w for w in re.findall(r'[a-zA-ZżółćęśąźńŻÓŁĆĘŚĄŹŃ]{4,}', name_lower)
+                   if w not in IGNORE_WORDS]
+
+    return NameScan(tuple(simple), tuple(time_patterns), tuple(meaningful_words), tuple(learn_words))
+
+
+def synthetic_names(count, seed=42):
+    """Generuje syntetyczne nazwy plików z datami, numerami i słowami"""
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        parts = rng.sample(SYNTHETIC_WORDS, rng.randint(1, 4))
+        roll = rng.random()
+        if roll < 0.3:
+            parts.append(f"{rng.randint(2000, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+        elif roll < 0.45:
+            parts.append(f"{rng.randint(2000, 2025)}-{rng.randint(1, 12):02d}")
+        elif roll < 0.6:
+            parts.append(str(rng.randint(1990, 2025)))
+        elif roll < 0.8:
+            parts.append(str(rng.randint(1, 99999)))
+        rng.shuffle(parts)
+        names.append(rng.choice(SYNTHETIC_SEPARATORS).join(parts))
+    return names
+
+
+def check_equivalence(names):
+    """Sprawdza, czy skaner daje te same wyniki co pierwotna analiza"""
+    mismatches = 0
+    for name in names:
+        if scan_name(name) != legacy_scan(name):
+            mismatches += 1
+    return mismatches
+
+
+def benchmark_name_scan(count=1_000_000):
+    """Porównuje pierwotną analizę nazw ze skanerem jednoprzebiegowym"""
+    names = synthetic_names(count)
+    patterns = {'raport': 3, 'faktura': 2}
+
+    print(f"=== Skanowanie nazw: {count} syntetycznych nazw ===")
+    print(f"Niezgodności z pierwotną analizą (10000 nazw): {check_equivalence(names[:10000])}")
+
+    start = time.perf_counter()
+    for name in names:
+        scan = legacy_scan(name)
+        extract_dynamic_categories(scan.words, patterns)
+    legacy_time = time.perf_counter() - start
+    print(f"Pierwotna analiza:         {legacy_time:.2f}s ({count / legacy_time:,.0f} nazw/s)")
+
+    start = time.perf_counter()
+    for name in names:
+        scan = scan_name(name)
+        extract_dynamic_categories(scan.words, patterns)
+    single_time = time.perf_counter() - start
+    print(f"Skaner jednoprzebiegowy:   {single_time:.2f}s ({count / single_time:,.0f} nazw/s)")
+    print(f"Przyspieszenie: {legacy_time / single_time:.1f}x")
+
+
+def legacy_size_category(file_size):
+    """Pierwotna drabinka if/elif dla rozmiaru - punkt odniesienia"""
+    KB = 1024
+    MB = KB * 1024
+    if file_size < 10 * KB:
+        return 'bardzo_mały'
+    elif file_size < 500 * KB:
+        return 'mały'
+    elif file_size < 5 * MB:
+        return 'średni'
+    elif file_size < 50 * MB:
+        return 'duży'
+    elif file_size < 500 * MB:
+        return 'bardzo_duży'
+    else:
+        return 'ogromny'
+
+
+def legacy_age_category(age_in_days):
+    """Pierwotna drabinka if/elif dla wieku pliku - punkt odniesienia"""
+    if age_in_days < 1:
+        return 'dzisiaj'
+    elif age_in_days < 7:
+        return 'ostatni_tydzień'
+    elif age_in_days < 30:
+        return 'ostatni_miesiąc'
+    elif age_in_days < 365:
+        return 'ostatni_rok'
+    else:
+        return 'starszy'
+
+
+def benchmark_bucketing(count=1_000_000):
+    """Porównuje drabinkę if/elif z kubełkowaniem wektorowym rozmiarów i dat"""
+    rng = random.Random(7)
+    now = time.time()
+    sizes = [int(rng.lognormvariate(11, 3)) for _ in range(count)]
+    modified = [now - rng.uniform(0, 800 * DAY) for _ in range(count)]
+
+    print(f"=== Kubełkowanie rozmiaru i daty: {count} plików ===")
+
+    start = time.perf_counter()
+    legacy_sizes = [legacy_size_category(size) for size in sizes]
+    legacy_dates = [legacy_age_category(int((now - m) // DAY)) for m in modified]
+    legacy_time = time.perf_counter() - start
+    print(f"Drabinka if/elif:       {legacy_time * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    size_codes = size_bucket_codes(sizes)
+    date_codes = age_bucket_codes(modified, now)
+    codes_time = time.perf_counter() - start
+    print(f"Kody z list Pythona:    {codes_time * 1000:.0f} ms")
+
+    if np is not None:
+        size_array = np.asarray(sizes, dtype=np.float64)
+        modified_array = np.asarray(modified, dtype=np.float64)
+        start = time.perf_counter()
+        size_bucket_codes(size_array)
+        age_bucket_codes(modified_array, now)
+        array_time = time.perf_counter() - start
+        print(f"Kody z tablic numpy:    {array_time * 1000:.0f} ms")
+
+    mismatches = sum(a != b for a, b in zip(legacy_sizes, SIZE_SCALE.labels_for(size_codes)))
+    mismatches += sum(a != b for a, b in zip(legacy_dates, AGE_SCALE.labels_for(date_codes)))
+    print(f"Niezgodności etykiet: {mismatches}")
+
+
+def legacy_series(names):
+    """Pierwotne grupowanie serii - porównanie każdej pary nazw (O(n²)), punkt odniesienia"""
+    def similar(name1, name2):
+        clean1 = re.sub(r'[^\w]', '', name1)
+        clean2 = re.sub(r'[^\w]', '', name2)
+        common_prefix_len = 0
+        for c1, c2 in zip(clean1, clean2):
+            if c1 == c2:
+                common_prefix_len += 1
+            else:
+                break
+        if common_prefix_len >= 4:
+            return True
+        if len(clean1) >= 6 and len(clean2) >= 6:
+            shorter = clean1 if len(clean1) < len(clean2) else clean2
+            longer = clean2 if len(clean1) < len(clean2) else clean1
+            if shorter in longer:
+                return True
+        return False
+
+    processed = set()
+    series = []
+    for index, name in enumerate(names):
+        if index in processed:
+            continue
+        group = [index]
+        for other in range(len(names)):
+            if other != index and other not in processed and similar(name.lower(), names[other].lower()):
+                group.append(other)
+                processed.add(other)
+        processed.add(index)
+        series.append((index, group))
+    return series
+
+
+def synthetic_file_names(count, seed=11):
+    """Nazwy plików z seriami (wspólne prefiksy, numeracja) i nazwami zawierającymi inne"""
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.5:
+            names.append(f"{rng.choice(SYNTHETIC_WORDS)}_{rng.randint(1, count)}")
+        elif roll < 0.8:
+            names.append(f"{rng.randint(1, 999)}_{rng.choice(SYNTHETIC_WORDS)}{rng.choice(SYNTHETIC_WORDS)}")
+        else:
+            names.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 12))))
+    return names
+
+
+def benchmark_series_grouping(sizes=(10_000, 100_000), legacy_count=2_000):
+    """Porównuje grupowanie serii parami z grupowaniem przez kubełki prefiksów"""
+    print("=== Grupowanie serii nazw ===")
+
+    names = synthetic_file_names(legacy_count)
+    start = time.perf_counter()
+    legacy = legacy_series(names)
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    current = find_series(names)
+    current_time = time.perf_counter() - start
+    print(f"{legacy_count} plików: parami {legacy_time:.2f}s, kubełki {current_time * 1000:.0f} ms, "
+          f"wyniki zgodne: {legacy == current}")
+
+    for count in sizes:
+        names = synthetic_file_names(count)
+        start = time.perf_counter()
+        series = find_series(names)
+        for _, members in series:
+            if len(members) > 1:
+                find_common_part([names[i] for i in members])
+        elapsed = time.perf_counter() - start
+        print(f"{count} plików: {elapsed:.2f}s, {len(series)} grup "
+              f"(parami szacunkowo {legacy_time * (count / legacy_count) ** 2:.0f}s)")
+
+
+def synthetic_letter_names(count, seed=5):
+    """Długie nazwy z samych liter (15-30) - najgorszy przypadek indeksu fragmentów"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyzżółćęśąźń'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(15, 30))) for _ in range(count)]
+
+
+def benchmark_name_index(count=100_000):
+    """Budowa i zapytania indeksu prefiksów i słów grupowania "slowa_nazwy" - czas i pamięć"""
+    print(f"=== Indeks nazw (slowa_nazwy): {count} nazw ===")
+    for label, names in (("syntetyczne nazwy plików", [name.lower() for name in synthetic_file_names(count)]),
+                         ("same litery 15-30", synthetic_letter_names(count))):
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = LaterNameIndex(names)
+        build_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        entries = sum(len(files) for files in index._fragments.values())
+
+        start = time.perf_counter()
+        queries = 0
+        for position, name in enumerate(names):
+            for word in LaterNameIndex.WORD_PATTERN.findall(name):
+                index.has_later_word(word, position)
+                queries += 1
+        query_time = time.perf_counter() - start
+        print(f"{label}: budowa {build_time:.2f}s (szczyt pamięci {peak / 2 ** 20:.0f} MB, "
+              f"{entries:,} wpisów fragmentów), {queries:,} zapytań w {query_time:.2f}s")
+
+
+if __name__ == "__main__":
+    names_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    benchmark_name_scan(names_count)
+    benchmark_bucketing(names_count)
+    benchmark_series_grouping()
+    benchmark_name_index()
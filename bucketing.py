@@ -0,0 +1,86 @@
+# bucketing.py
+import bisect
+
+try:
+    import numpy as np
+except ImportError:
+    print("Biblioteka 'numpy' nie jest zainstalowana. Kubełkowanie wsadowe będzie wolniejsze.")
+    np = None
+
+DAY = 86400
+KB = 1024
+MB = KB * 1024
+GB = MB * 1024
+
+
+class BucketScale:
+    """Skala kubełków: granice przedziałów + etykiety, kody kubełków jako liczby całkowite.
+
+    Wartość v trafia do kubełka i, gdy edges[i-1] <= v < edges[i] (jak w drabince if/elif
+    z porównaniami '<'). Ostatni kod (unknown_code) oznacza brak wartości (NaN / None).
+    """
+
+    def __init__(self, edges, labels, unknown_label):
+        if len(labels) != len(edges) + 1:
+            raise ValueError("Liczba etykiet musi być o jeden większa niż liczba granic")
+        self.edges = tuple(edges)
+        self.labels = tuple(labels) + (unknown_label,)
+        self.unknown_code = len(labels)
+        self._edges_array = np.asarray(self.edges, dtype=np.float64) if np is not None else None
+        self._labels_array = np.asarray(self.labels, dtype=object) if np is not None else None
+
+    def code(self, value):
+        """Kod kubełka dla pojedynczej wartości"""
+        if value is None or value != value:  # None lub NaN
+            return self.unknown_code
+        return bisect.bisect_right(self.edges, value)
+
+    def codes(self, values):
+        """Kody kubełków dla całej tablicy wartości (np.searchsorted, bez pętli w Pythonie)"""
+        if np is None:
+            return [self.code(value) for value in values]
+
+        values = np.asarray(values, dtype=np.float64)
+        codes = np.searchsorted(self._edges_array, values, side='right').astype(np.int8)
+        codes[np.isnan(values)] = self.unknown_code
+        return codes
+
+    def label(self, code):
+        """Etykieta dla kodu kubełka"""
+        return self.labels[code]
+
+    def labels_for(self, codes):
+        """Lista etykiet dla tablicy kodów (tablica etykiet jako tabela odnośników)"""
+        if np is None:
+            return [self.labels[code] for code in codes]
+        return self._labels_array[np.asarray(codes)].tolist()
+
+
+# Domyślne skale - te same progi co w CategoryAnalyzer._categorize_by_size/_categorize_by_date
+SIZE_SCALE = BucketScale(
+    edges=(10 * KB, 500 * KB, 5 * MB, 50 * MB, 500 * MB),
+    labels=('bardzo_mały', 'mały', 'średni', 'duży', 'bardzo_duży', 'ogromny'),
+    unknown_label='nieznany'
+)
+
+# Wiek w sekundach: pełne dni < N  <=>  sekundy < N * DAY
+AGE_SCALE = BucketScale(
+    edges=(1 * DAY, 7 * DAY, 30 * DAY, 365 * DAY),
+    labels=('dzisiaj', 'ostatni_tydzień', 'ostatni_miesiąc', 'ostatni_rok', 'starszy'),
+    unknown_label='nieznana'
+)
+
+
+def size_bucket_codes(sizes, scale=SIZE_SCALE):
+    """Kody kategorii wielkości dla tablicy rozmiarów w bajtach"""
+    return scale.codes(sizes)
+
+
+def age_bucket_codes(modified, now, scale=AGE_SCALE):
+    """Kody kategorii daty dla tablicy czasów modyfikacji (epoka; None/NaN = nieznana)"""
+    if np is None:
+        return [scale.code(None if m is None else now - m) for m in modified]
+
+    if not isinstance(modified, np.ndarray):
+        modified = [np.nan if m is None else m for m in modified]
+    return scale.codes(now - np.asarray(modified, dtype=np.float64))
@@ -0,0 +1,52 @@
+# cancellation.py
+import threading
+
+PAUSE_POLL_INTERVAL = 0.05  # jak często wstrzymana operacja sprawdza wznowienie (s)
+
+
+class OperationCancelled(Exception):
+    """Operacja przerwana przez użytkownika"""
+
+
+class CancellationToken:
+    """Kooperacyjne anulowanie i wstrzymywanie długich operacji.
+
+    Operacja wywołuje checkpoint() między plikami - przerwanie lub pauza działa więc najpóźniej
+    po bieżącym pliku i nigdy w trakcie jego przenoszenia. idle - wywoływane w czasie pauzy
+    (np. obsługa zdarzeń okna postępu, gdy operacja biegnie w wątku Tk).
+    """
+
+    def __init__(self, idle=None):
+        self.idle = idle
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        """Zgłasza anulowanie (budzi też operację wstrzymaną)"""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def checkpoint(self):
+        """Czeka, dopóki operacja jest wstrzymana; zgłasza OperationCancelled po anulowaniu"""
+        while not self._running.is_set():
+            if self.idle is not None:
+                self.idle()
+            self._running.wait(PAUSE_POLL_INTERVAL)
+        if self._cancelled.is_set():
+            raise OperationCancelled()
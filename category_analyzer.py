@@ -1,10 +1,23 @@
 # category_analyzer.py
 import os
 import re
-import json
+import time
+import atexit
+import threading
 import traceback
+import weakref
 from datetime import datetime
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, namedtuple
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from suggestion_index import SuggestionIndex
+from path_table import PathTable, normalize_destination
+from history_limits import DAY, current_day, decay_factor, decay_counter, display_count, select_evictions
+from counter_shards import ShardedCounter, CombinedCounts
+from history_store import file_lock, atomic_write_json, read_json, file_stamp
+from series_grouping import find_series, find_common_part
+from bucketing import SIZE_SCALE, AGE_SCALE, size_bucket_codes, age_bucket_codes
+from group_engine import shared_file_table
 
 #Rozszerzenia - reszta będzie dynamiczna
 FILE_CATEGORIES = {
@@ -57,54 +70,569 @@ IGNORE_WORDS = {
     'bez', 'tytulu', 'untitled', 'bez_nazwy', 'unnamed', 'noname'
 }
 
+# Skaner nazw: jedno wyrażenie z nazwanymi grupami dla prostych wzorców, wzorców czasowych
+# i słów. Wzorce czasowe są w lookahead, żeby nie konsumowały znaków (nakładające się daty).
+TIME_PATTERN_GROUPS = {'czas_dzienny': 'dzienny', 'czas_miesieczny': 'miesięczny', 'czas_roczny': 'roczny'}
+
+NAME_SCANNER = re.compile(
+    '|'.join(f"(?P<{name}>{'|'.join(patterns)})" for name, patterns in SIMPLE_PATTERNS.items()) +
+    r'|(?=(?P<czas_dzienny>\d{4}-\d{2}-\d{2}))'
+    r'|(?=(?P<czas_miesieczny>\d{4}-\d{2}))'
+    r'|(?=(?P<czas_roczny>\b\d{4}\b))'
+    r'|(?P<slowo>[^\W\d]+)'
+)
+
+# Słowa do nauki wzorców - alfabet jak w pierwotnym wyrażeniu _learn_from_filename
+LEARN_WORD_RE = re.compile(r'[a-zA-ZżółćęśąźńŻÓŁĆĘŚĄŹŃ]{4,}')
+LEARN_ALPHABET = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZżółćęśąźńŻÓŁĆĘŚĄŹŃ')
+
+NameScan = namedtuple('NameScan', ['simple', 'time', 'words', 'learn_words'])
+
+
+def scan_name(name_lower):
+    """Skanuje nazwę pliku jeden raz i zwraca wszystko, czego potrzebuje kategoryzacja.
+
+    simple - proste wzorce (kolejność jak w SIMPLE_PATTERNS), time - wzorzec czasowy,
+    words - znaczące słowa (>= 3 znaki, bez ignorowanych), learn_words - słowa do nauki.
+    """
+    found = set()
+    tokens = []
+
+    for match in NAME_SCANNER.finditer(name_lower):
+        group = match.lastgroup
+        if group == 'slowo':
+            tokens.append(match.group())
+        elif group in TIME_PATTERN_GROUPS:
+            found.add(group)
+        else:
+            # Prosty wzorzec to całe słowo - jest też zwykłym tokenem
+            found.add(group)
+            tokens.append(match.group())
+
+    simple = tuple(name for name in SIMPLE_PATTERNS if name in found)
+
+    if 'czas_dzienny' in found:
+        time_patterns = ('dzienny',)
+    elif 'czas_miesieczny' in found:
+        time_patterns = ('miesięczny',)
+    elif 'czas_roczny' in found:
+        time_patterns = ('roczny',)
+    else:
+        time_patterns = ()
+
+    words = tuple(w for w in tokens if len(w) >= 3 and w not in IGNORE_WORDS)
+
+    learn_words = []
+    for token in tokens:
+        if len(token) < 4:
+            continue
+        if LEARN_ALPHABET.issuperset(token):
+            learn_words.append(token)
+        else:
+            learn_words.extend(LEARN_WORD_RE.findall(token))
+    learn_words = tuple(w for w in learn_words if w not in IGNORE_WORDS)
+
+    return NameScan(simple, time_patterns, words, learn_words)
+
+
+def extract_dynamic_categories(meaningful_words, patterns):
+    """Dynamiczne kategorie ze znaczących słów nazwy na podstawie liczników wzorców"""
+    categories = []
+
+    # Znajdź najbardziej znaczące słowa (najdłuższe lub z historii)
+    for word in meaningful_words:
+        if len(word) >= 4:  # Minimum 4 znaki
+            # Sprawdź czy to słowo już wystąpiło w historii
+            if patterns.get(word, 0) >= 2:
+                categories.append(f"grupa_{word}")
+            elif len(word) >= 6:  # Długie słowa są prawdopodobnie znaczące
+                categories.append(f"temat_{word}")
+
+    # Znajdź prefiksy i sufiksy (pierwsze/ostatnie słowo)
+    if meaningful_words:
+        first_word = meaningful_words[0]
+        if len(first_word) >= 4:
+            categories.append(f"seria_{first_word}")
+
+        if len(meaningful_words) > 1:
+            last_word = meaningful_words[-1]
+            if len(last_word) >= 4 and last_word != first_word:
+                categories.append(f"typ_{last_word}")
+
+    return categories[:3]  # Maksymalnie 3 kategorie dynamiczne
+
+
+def name_categories_for(name_lower, patterns, scan=None):
+    """Kategorie nazwy (proste wzorce + dynamiczne) dla podanych liczników wzorców"""
+    scan = scan or scan_name(name_lower)
+    return scan.simple + tuple(extract_dynamic_categories(scan.words, patterns))
+
+
+# Kategoryzacja dwuprzebiegowa: funkcje na poziomie modułu, żeby działały też w procesach.
+# Oba przebiegi dostają gotowe skany nazw (NameScan) - nazwa skanowana jest raz na partię.
+def count_pattern_words(scans):
+    """Map: liczniki słów do nauki i zbiór słów sprawdzanych w liczniku wzorców"""
+    counts = Counter()
+    lookup_words = set()
+    for scan in scans:
+        counts.update(scan.learn_words)
+        lookup_words.update(word for word in scan.words if len(word) >= 4)
+    return counts, lookup_words
+
+
+def classify_names(scans, patterns):
+    """Klasyfikuje skany nazw względem zamrożonej migawki liczników wzorców"""
+    return [scan.simple + tuple(extract_dynamic_categories(scan.words, patterns)) for scan in scans]
+
+
+def map_name_chunks(function, scans, workers=None, use_processes=False):
+    """Dzieli skany nazw na fragmenty i wykonuje funkcję równolegle (wyniki w kolejności fragmentów)"""
+    if not workers or workers <= 1 or len(scans) < 2:
+        return [function(scans)]
+
+    chunk_size = max(1, -(-len(scans) // (workers * 4)))
+    chunks = [scans[i:i + chunk_size] for i in range(0, len(scans), chunk_size)]
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        return list(executor.map(function, chunks))
+
+
+# Zapis wzorców dynamicznych (write-behind) - co N nauczonych słów lub co N sekund
+PATTERNS_FILE = 'dynamic_patterns.json'
+PATTERNS_FLUSH_EVERY = 200
+PATTERNS_FLUSH_SECONDS = 30.0
+
+# Wersja formatu historii: 2 = ścieżki docelowe internowane w 'destination_table'
+HISTORY_FORMAT_VERSION = 2
+
+# Ograniczenia historii - limity wpisów i zanikanie liczników w czasie
+HISTORY_MAX_PATTERNS = 2000  # maks. kluczy w transfer_history['patterns']
+DYNAMIC_PATTERNS_MAX = 10000  # maks. słów w dynamic_patterns
+HISTORY_HALF_LIFE_DAYS = 180  # po tylu dniach licznik spada o połowę
+EVICTION_PROTECTED_COUNT = 3  # wpisy z mniejszą liczbą są usuwane w pierwszej kolejności
+DECAY_DROP_BELOW = 0.5  # liczniki, które zanikły poniżej progu, są usuwane
+
+# Migawka pliku do kategoryzacji wsadowej - czasy jako znaczniki epoki (None = nieznane)
+FileSnapshot = namedtuple('FileSnapshot', ['path', 'size', 'created', 'modified'])
+
+
+def snapshot_file(file_path):
+    """Tworzy migawkę pliku na podstawie os.stat"""
+    try:
+        file_stats = os.stat(file_path)
+        return FileSnapshot(file_path, file_stats.st_size, file_stats.st_ctime, file_stats.st_mtime)
+    except OSError:
+        return FileSnapshot(file_path, 0, None, None)
+
+
+class CategorizedFiles:
+    """Wynik kategoryzacji wsadowej w układzie kolumnowym.
+
+    Każda kolumna to lista o długości równej liczbie plików - i-ty element każdej
+    kolumny dotyczy i-tego pliku. Słownik w starym formacie tworzy dopiero as_dict(i).
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.extensions = []
+        self.extension_categories = []
+        self.size_categories = []
+        self.date_categories = []
+        self.size_codes = []  # kody kubełków SIZE_SCALE (tablica numpy gdy dostępna)
+        self.date_codes = []  # kody kubełków AGE_SCALE
+        self.name_categories = []  # krotki kategorii nazwy
+        self.time_categories = []  # krotki wzorców czasowych
+        self.suggested_locations = []
+        self.sizes = []  # rozmiary z migawek (bajty)
+        self.created_times = []  # st_ctime z migawek (None, gdy os.stat zawiódł)
+        self.modified_times = []  # st_mtime z migawek
+
+    def __len__(self):
+        return len(self.paths)
+
+    def as_dict(self, index):
+        """Zwraca wynik dla jednego pliku w formacie categorize_file"""
+        extension_category = self.extension_categories[index]
+        name_categories = list(self.name_categories[index])
+        time_patterns = list(self.time_categories[index])
+
+        all_categories = set(name_categories)
+        if extension_category != 'nieznana':
+            all_categories.add(extension_category)
+        all_categories.update(f"czas_{pattern}" for pattern in time_patterns)
+        all_categories.add(f"rozmiar_{self.size_categories[index]}")
+        all_categories.add(f"data_{self.date_categories[index]}")
+
+        return {
+            'kategoria_rozszerzenia': extension_category,
+            'kategoria_nazwy': name_categories,
+            'kategoria_wielkości': self.size_categories[index],
+            'kategoria_daty': self.date_categories[index],
+            'kategoria_przedmiotu': [],
+            'kategoria_czasowa': time_patterns,
+            'sugerowane_lokalizacje': list(self.suggested_locations[index]),
+            'wszystkie_kategorie': list(all_categories)
+        }
+
+
+# Analizatory z niezapisanymi wzorcami zapisywane przy zamykaniu programu - jedna rejestracja
+# atexit dla wszystkich, bez trzymania analizatorów przy życiu do końca programu
+_open_analyzers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_analyzers():
+    for analyzer in list(_open_analyzers):
+        try:
+            analyzer.flush()
+        except Exception as e:
+            print(f"Błąd zapisu wzorców przy zamykaniu: {e}")
+
 
 class CategoryAnalyzer:
-    def __init__(self, history_file='transfer_history.json'):
+    def __init__(self, history_file='transfer_history.json', patterns_file=PATTERNS_FILE,
+                 patterns_flush_every=PATTERNS_FLUSH_EVERY, patterns_flush_seconds=PATTERNS_FLUSH_SECONDS,
+                 max_history_patterns=HISTORY_MAX_PATTERNS, max_dynamic_patterns=DYNAMIC_PATTERNS_MAX,
+                 half_life_days=HISTORY_HALF_LIFE_DAYS):
+        # Limity i zanikanie (None = bez limitu / bez zanikania)
+        self.max_history_patterns = max_history_patterns
+        self.max_dynamic_patterns = max_dynamic_patterns
+        self.half_life_days = half_life_days
+
+        # Jeden zapisujący naraz: zmiany historii, scalanie liczników i zapis plików
+        self._write_lock = threading.RLock()
+
         self.history_file = history_file
         self.transfer_history = self._load_history()
+        # Indeks top-k lokalizacji - sugestie bez sortowania całej historii
+        self.suggestion_index = SuggestionIndex(k=2)
+        self.suggestion_index.rebuild(self.transfer_history, self.path_table)
+
+        # Write-behind: licznik niezapisanych zmian zamiast sumowania całego słownika
+        self.patterns_flush_every = patterns_flush_every  # None = bez limitu liczby
+        self.patterns_flush_seconds = patterns_flush_seconds  # None = bez limitu czasu
+        self._patterns_dirty = 0
+        self._patterns_flushed_at = time.monotonic()
+
         # Nowa: historia dynamicznych kategorii
+        self.patterns_file = patterns_file
         self.dynamic_patterns = defaultdict(int)  # wzorzec -> liczba wystąpień
+        self._pattern_last_used = {}  # wzorzec -> dzień ostatniego użycia (LRU)
+        self._patterns_decayed_at = time.time()
+        self._patterns_delta = Counter()  # przyrosty od ostatniego zapisu (scalane z plikiem)
+        self._patterns_stamp = None  # znacznik pliku po naszym ostatnim odczycie/zapisie
         self._load_dynamic_patterns()
+        # Przyrosty liczników per wątek - scalane z dynamic_patterns przy zapisie
+        self._pattern_shards = ShardedCounter()
+
+        # Zapisz niezapisane wzorce przy zamykaniu programu
+        _open_analyzers.add(self)
 
     def _load_history(self):
         """Wczytuje historię przenoszenia plików"""
+        self.path_table = PathTable()
+        self._history_stamp = None  # znacznik pliku po naszym ostatnim odczycie/zapisie
+        self._history_deltas = defaultdict(Counter)  # (tabela, klucz) -> ścieżka -> przyrost od zapisu
         if os.path.exists(self.history_file):
             try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-
-                    required_keys = ['extensions', 'patterns', 'destinations', 'content_types']
-                    for key in required_keys:
-                        if key not in history:
-                            history[key] = {}
-                    return history
+                stamp = file_stamp(self.history_file)
+                history, self.path_table, legacy = self._read_history_file()
+
+                if legacy:
+                    # Jednorazowa kompaktacja starego formatu - zapisz od razu
+                    print(f"Skompaktowano historię do {len(self.path_table)} unikalnych lokalizacji")
+                    with file_lock(self.history_file):
+                        self._save_history_data(history)
+                else:
+                    self._history_stamp = stamp
+                return history
             except Exception as e:
                 print(f"Błąd podczas wczytywania historii: {e}")
-
-        return {'extensions': {}, 'patterns': {}, 'destinations': {}, 'content_types': {}}
+                self.path_table = PathTable()
+
+        return {'format_version': HISTORY_FORMAT_VERSION, 'extensions': {}, 'patterns': {},
+                'destinations': {}, 'content_types': {}, 'destination_table': self.path_table.paths,
+                'decayed_at': time.time(), 'last_used': {}}
+
+    def _read_history_file(self):
+        """Wczytuje historię z pliku. Zwraca (historia, tabela ścieżek, czy_stary_format)"""
+        history = read_json(self.history_file)
+
+        required_keys = ['extensions', 'patterns', 'destinations', 'content_types']
+        for key in required_keys:
+            if key not in history:
+                history[key] = {}
+
+        path_table, legacy = self._intern_history(history)
+
+        # Znaczniki ostatniego użycia i zanik liczników od ostatniego uruchomienia
+        history.setdefault('decayed_at', time.time())
+        history.setdefault('last_used', {})
+        fallback_day = current_day(history['decayed_at'])
+        for key in history['patterns']:
+            history['last_used'].setdefault(key, fallback_day)
+        self._decay_history(history)
+        self._evict_history_patterns(history)
+
+        return history, path_table, legacy
+
+    def _intern_history(self, history):
+        """Internuje ścieżki docelowe w historii. Zwraca (tabela ścieżek, czy_stary_format).
+
+        Stary format używał ścieżek jako kluczy, przez co 'C:/a/b' i 'C:\\a\\b'
+        były liczone osobno - przy migracji są normalizowane i scalane.
+        """
+        legacy = history.get('format_version', 1) < HISTORY_FORMAT_VERSION
+        path_table = PathTable(() if legacy else history.get('destination_table', []))
+
+        for table in ('extensions', 'patterns'):
+            for key, destinations in history[table].items():
+                merged = {}
+                for destination, count in destinations.items():
+                    if legacy:
+                        destination_id = path_table.intern(normalize_destination(destination))
+                    else:
+                        destination_id = int(destination)
+                    merged[destination_id] = merged.get(destination_id, 0) + count
+                history[table][key] = merged
+
+        history['format_version'] = HISTORY_FORMAT_VERSION
+        history['destination_table'] = path_table.paths
+        return path_table, legacy
+
+    def _decay_history(self, history, now=None):
+        """Wygasza liczniki historii wykładniczo (najwyżej raz na dobę). Zwraca True po zmianie"""
+        now = time.time() if now is None else now
+        elapsed = now - history.get('decayed_at', now)
+        if not self.half_life_days or elapsed < DAY:
+            return False
+
+        factor = decay_factor(elapsed, self.half_life_days)
+        for table in ('extensions', 'patterns'):
+            for key, destinations in list(history[table].items()):
+                decay_counter(destinations, factor, DECAY_DROP_BELOW)
+                if not destinations:
+                    del history[table][key]
+                    if table == 'patterns':
+                        history['last_used'].pop(key, None)
+        history['decayed_at'] = now
+        return True
+
+    def _evict_history_patterns(self, history):
+        """Usuwa najdawniej używane, rzadkie wzorce gdy przekroczono limit. Zwraca usunięte klucze"""
+        if self.max_history_patterns is None:
+            return []
+
+        patterns = history['patterns']
+        last_used = history['last_used']
+        evicted = select_evictions(
+            [(key, sum(destinations.values()), last_used.get(key, 0)) for key, destinations in patterns.items()]
+            if len(patterns) > self.max_history_patterns else [],
+            self.max_history_patterns, EVICTION_PROTECTED_COUNT
+        )
+        for key in evicted:
+            del patterns[key]
+            last_used.pop(key, None)
+        return evicted
+
+    def _maintain_history(self):
+        """Zanik i limity historii w długo działającym procesie; utrzymuje spójność indeksu"""
+        if self._decay_history(self.transfer_history):
+            self.suggestion_index.rebuild(self.transfer_history, self.path_table)
+        for key in self._evict_history_patterns(self.transfer_history):
+            self.suggestion_index.discard('patterns', key)
 
     def _load_dynamic_patterns(self):
         """Wczytuje dynamiczne wzorce z historii"""
         try:
-            dynamic_file = 'dynamic_patterns.json'
-            if os.path.exists(dynamic_file):
-                with open(dynamic_file, 'r', encoding='utf-8') as f:
-                    self.dynamic_patterns = defaultdict(int, json.load(f))
+            stamp = file_stamp(self.patterns_file)
+            data = read_json(self.patterns_file)
+            if data is not None:
+                self._set_dynamic_patterns(*self._parse_dynamic_patterns(data))
+                self._patterns_stamp = stamp
+                self._maintain_dynamic_patterns()
         except Exception as e:
             print(f"Błąd wczytywania dynamicznych wzorców: {e}")
 
+    def _parse_dynamic_patterns(self, data):
+        """Rozpakowuje dane pliku wzorców. Zwraca (liczniki, ostatnie użycia, czas zaniku)"""
+        if 'counts' in data:
+            counts = data['counts']
+            last_used = data.get('last_used', {})
+            decayed_at = data.get('decayed_at', time.time())
+        else:
+            # Stary format: płaski słownik wzorzec -> liczba
+            counts = data
+            last_used = {}
+            decayed_at = time.time()
+
+        fallback_day = current_day(decayed_at)
+        return counts, {word: last_used.get(word, fallback_day) for word in counts}, decayed_at
+
+    def _set_dynamic_patterns(self, counts, last_used, decayed_at):
+        """Podmienia stan wzorców w pamięci (czytający w innych wątkach widzą stary albo nowy)"""
+        self.dynamic_patterns = defaultdict(int, counts)
+        self._pattern_last_used = last_used
+        self._patterns_decayed_at = decayed_at
+
+    def _maintain_dynamic_patterns(self, now=None):
+        """Zanik liczników wzorców (raz na dobę) i usuwanie najdawniej używanych ponad limit"""
+        now = time.time() if now is None else now
+        elapsed = now - self._patterns_decayed_at
+        if self.half_life_days and elapsed >= DAY:
+            removed = decay_counter(self.dynamic_patterns, decay_factor(elapsed, self.half_life_days),
+                                    DECAY_DROP_BELOW)
+            for word in removed:
+                self._pattern_last_used.pop(word, None)
+            self._patterns_decayed_at = now
+            self._patterns_dirty += 1
+
+        if self.max_dynamic_patterns is not None and len(self.dynamic_patterns) > self.max_dynamic_patterns:
+            evicted = select_evictions(
+                [(word, count, self._pattern_last_used.get(word, 0))
+                 for word, count in self.dynamic_patterns.items()],
+                self.max_dynamic_patterns, EVICTION_PROTECTED_COUNT
+            )
+            for word in evicted:
+                del self.dynamic_patterns[word]
+                self._pattern_last_used.pop(word, None)
+            self._patterns_dirty += 1
+
     def _save_dynamic_patterns(self):
-        """Zapisuje dynamiczne wzorce"""
+        """Zapisuje dynamiczne wzorce (format kompaktowy, bez wcięć).
+
+        Pod blokadą pliku: jeśli inny proces zmienił plik od naszego odczytu, nasze
+        przyrosty są doliczane do jego zawartości zamiast jej nadpisywania.
+        """
         try:
-            with open('dynamic_patterns.json', 'w', encoding='utf-8') as f:
-                json.dump(dict(self.dynamic_patterns), f, ensure_ascii=False, indent=2)
+            with file_lock(self.patterns_file):
+                stamp = file_stamp(self.patterns_file)
+                if stamp is not None and stamp != self._patterns_stamp:
+                    self._merge_dynamic_patterns_from_disk()
+
+                data = {
+                    'format_version': 2,
+                    'decayed_at': self._patterns_decayed_at,
+                    'counts': dict(self.dynamic_patterns),
+                    'last_used': self._pattern_last_used
+                }
+                atomic_write_json(self.patterns_file, data, separators=(',', ':'))
+                self._patterns_stamp = file_stamp(self.patterns_file)
+
+            self._patterns_delta.clear()
+            self._patterns_dirty = 0
+            self._patterns_flushed_at = time.monotonic()
         except Exception as e:
             print(f"Błąd zapisywania dynamicznych wzorców: {e}")
 
+    def _merge_dynamic_patterns_from_disk(self):
+        """Stan z pliku (zmieniony przez inny proces) + nasze przyrosty od ostatniego zapisu"""
+        our_last_used = self._pattern_last_used
+        self._set_dynamic_patterns(*self._parse_dynamic_patterns(read_json(self.patterns_file)))
+        # Zanik stanu z pliku przed doliczeniem świeżych przyrostów
+        self._maintain_dynamic_patterns()
+
+        for word, count in self._patterns_delta.items():
+            self.dynamic_patterns[word] += count
+        for word, day in our_last_used.items():
+            if word in self.dynamic_patterns and day > self._pattern_last_used.get(word, 0):
+                self._pattern_last_used[word] = day
+        self._maintain_dynamic_patterns()
+
+    def _patterns_flush_due(self, pending=0):
+        """Sprawdza czy minął interwał zapisu wzorców (liczba zmian lub czas).
+
+        pending - niescalone zmiany we fragmencie bieżącego wątku.
+        """
+        dirty = self._patterns_dirty + pending
+        if not dirty:
+            return False
+        if self.patterns_flush_every is not None and dirty >= self.patterns_flush_every:
+            return True
+        # Bez limitu liczby fragment nie może urosnąć ponad limit słownika przed scaleniem
+        if self.max_dynamic_patterns is not None and pending > self.max_dynamic_patterns:
+            return True
+        if self.patterns_flush_seconds is not None:
+            return time.monotonic() - self._patterns_flushed_at >= self.patterns_flush_seconds
+        return False
+
+    def _pattern_counts(self):
+        """Liczniki wzorców do odczytu: scalone + niescalone przyrosty bieżącego wątku"""
+        return CombinedCounts(self.dynamic_patterns, self._pattern_shards.local_counts())
+
+    def _merge_pattern_shards(self):
+        """Scala fragmenty liczników wszystkich wątków (wywoływane pod blokadą zapisu)"""
+        counts, last_used, touched, pending = self._pattern_shards.drain()
+
+        for word, count in counts.items():
+            self.dynamic_patterns[word] += count
+        self._patterns_delta.update(counts)
+        self._pattern_last_used.update(last_used)
+        self._patterns_dirty += pending
+
+        history_last_used = self.transfer_history['last_used']
+        for key, day in touched.items():
+            if key in self.transfer_history['patterns']:
+                history_last_used[key] = day
+
+        # Limit słownika wzorców - usuwanie z zapasem, więc sortowanie jest rzadkie
+        if self.max_dynamic_patterns is not None and len(self.dynamic_patterns) > self.max_dynamic_patterns:
+            self._maintain_dynamic_patterns()
+
+    def flush(self):
+        """Zapisuje zaległe zmiany wzorców - wywoływane na końcu przebiegu i przy zamykaniu"""
+        with self._write_lock:
+            self._merge_pattern_shards()
+            if self._patterns_dirty:
+                self._save_dynamic_patterns()
+
+    def close(self):
+        """Zapisuje zaległe wzorce i wyrejestrowuje analizator z zapisu przy zamykaniu programu"""
+        self.flush()
+        _open_analyzers.discard(self)
+
     def save_history(self):
-        """Zapisuje historię przenoszenia plików"""
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.transfer_history, f, ensure_ascii=False, indent=2)
+        """Zapisuje historię przenoszenia plików.
+
+        Pod blokadą pliku: jeśli inny proces zmienił historię od naszego odczytu, nasze
+        przyrosty są doliczane do jego wersji (scalanie po ścieżkach, nie identyfikatorach).
+        """
+        with self._write_lock, file_lock(self.history_file):
+            stamp = file_stamp(self.history_file)
+            if stamp is not None and stamp != self._history_stamp:
+                self._merge_history_from_disk()
+            self._save_history_data(self.transfer_history)
+            self._history_deltas.clear()
+
+    def _merge_history_from_disk(self):
+        """Historia z pliku (zmieniona przez inny proces) + nasze przyrosty od ostatniego zapisu"""
+        try:
+            history, path_table, _ = self._read_history_file()
+        except Exception as e:
+            print(f"Błąd scalania historii z pliku: {e}")
+            return
+
+        for (table, key), destinations in self._history_deltas.items():
+            counts = history[table].setdefault(key, {})
+            for destination, count in destinations.items():
+                destination_id = path_table.intern(destination)
+                counts[destination_id] = counts.get(destination_id, 0) + count
+
+        last_used = history['last_used']
+        for key, day in self.transfer_history['last_used'].items():
+            if key in history['patterns'] and day > last_used.get(key, 0):
+                last_used[key] = day
+        self._evict_history_patterns(history)
+
+        # Indeks przechowuje ścieżki, więc czytający nie łączą starych identyfikatorów z nową tabelą
+        self.suggestion_index.rebuild(history, path_table)
+        self.transfer_history = history
+        self.path_table = path_table
+
+    def _save_history_data(self, history):
+        """Zapisuje podany słownik historii do pliku (atomowo, przez plik tymczasowy)"""
+        atomic_write_json(self.history_file, history, indent=2)
+        self._history_stamp = file_stamp(self.history_file)
 
     def categorize_file(self, file_path):
         """UPROSZCZONA kategoryzacja - tylko rozszerzenia + dynamiczne kategorie"""
@@ -139,22 +667,22 @@ class CategoryAnalyzer:
             results['kategoria_rozszerzenia'] = EXTENSION_TO_CATEGORY[extension]
             results['wszystkie_kategorie'].add(EXTENSION_TO_CATEGORY[extension])
 
+        # Jedno skanowanie nazwy dla wszystkich wzorców i nauki
+        scan = scan_name(name_lower)
+
         # 2. Sprawdź tylko kilka prostych wzorców
-        for pattern_name, patterns in SIMPLE_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, name_lower):
-                    results['kategoria_nazwy'].append(pattern_name)
-                    results['wszystkie_kategorie'].add(pattern_name)
-                    break
+        for pattern_name in scan.simple:
+            results['kategoria_nazwy'].append(pattern_name)
+            results['wszystkie_kategorie'].add(pattern_name)
 
         # 3. Dynamiczne kategorie z nazwy pliku
-        dynamic_categories = self._extract_dynamic_categories(name_lower)
+        dynamic_categories = extract_dynamic_categories(scan.words, self._pattern_counts())
         results['kategoria_nazwy'].extend(dynamic_categories)
         for cat in dynamic_categories:
             results['wszystkie_kategorie'].add(cat)
 
         # 4. Wzorce czasowe
-        time_patterns = self._detect_time_patterns(name_lower)
+        time_patterns = list(scan.time)
         results['kategoria_czasowa'] = time_patterns
         for pattern in time_patterns:
             results['wszystkie_kategorie'].add(f"czas_{pattern}")
@@ -171,94 +699,120 @@ class CategoryAnalyzer:
         results['wszystkie_kategorie'] = list(results['wszystkie_kategorie'])
 
         # Zapisz nowe dynamiczne wzorce
-        self._learn_from_filename(name_lower)
+        self._learn_from_filename(name_lower, scan)
 
         return results
 
-    def _extract_dynamic_categories(self, filename):
-
-        categories = []
-
-        # Usuń cyfry i znaki specjalne, zostaw tylko słowa
-        clean_name = re.sub(r'[^\w\s]', ' ', filename)
-        clean_name = re.sub(r'\d+', ' ', clean_name)
-
-        # Podziel na słowa
-        words = [w.strip() for w in clean_name.split() if len(w.strip()) >= 3]
-
-        # Filtruj słowa ignorowane
-        meaningful_words = [w for w in words if w not in IGNORE_WORDS]
-
-        # Znajdź najbardziej znaczące słowa (najdłuższe lub z historii)
-        for word in meaningful_words:
-            if len(word) >= 4:  # Minimum 4 znaki
-                # Sprawdź czy to słowo już wystąpiło w historii
-                if word in self.dynamic_patterns and self.dynamic_patterns[word] >= 2:
-                    categories.append(f"grupa_{word}")
-                elif len(word) >= 6:  # Długie słowa są prawdopodobnie znaczące
-                    categories.append(f"temat_{word}")
-
-        # Znajdź prefiksy i sufiksy (pierwsze/ostatnie słowo)
-        if meaningful_words:
-            first_word = meaningful_words[0]
-            if len(first_word) >= 4:
-                categories.append(f"seria_{first_word}")
-
-            if len(meaningful_words) > 1:
-                last_word = meaningful_words[-1]
-                if len(last_word) >= 4 and last_word != first_word:
-                    categories.append(f"typ_{last_word}")
-
-        return categories[:3]  # Maksymalnie 3 kategorie dynamiczne
+    def categorize_files(self, snapshots, now=None, size_scale=SIZE_SCALE, age_scale=AGE_SCALE,
+                         two_pass=False, workers=None, use_processes=False):
+        """Kategoryzacja wsadowa - zwraca CategorizedFiles (kolumny zamiast słowników).
+
+        snapshots: FileSnapshot lub ścieżki (wtedy migawka z os.stat). Cała partia
+        używa jednego odniesienia czasu 'now', a nazwy są skanowane raz na unikalną nazwę.
+        Kategorie wielkości i daty są liczone wektorowo dla całej partii (size_scale, age_scale).
+
+        Domyślnie nauka wzorców przebiega w kolejności plików, jak przy wywołaniach
+        categorize_file. two_pass=True: najpierw liczniki słów dla całej partii (map-reduce),
+        potem klasyfikacja względem zamrożonej migawki - wynik nie zależy od kolejności plików
+        i może być liczony równolegle (workers wątków lub procesów przy use_processes=True).
+        """
+        now = time.time() if now is None else now
+        snapshots = [s if isinstance(s, FileSnapshot) else snapshot_file(s) for s in snapshots]
+
+        names = []
+        extensions = []
+        for snapshot in snapshots:
+            name, extension = os.path.splitext(os.path.basename(snapshot.path))
+            names.append(name.lower())
+            extensions.append(extension.lower())
+
+        # Skan każdej unikalnej nazwy tylko raz (słownik żyje tylko w obrębie partii)
+        scans = {}
+        for name in names:
+            if name not in scans:
+                scans[name] = scan_name(name)
+
+        if two_pass:
+            name_categories = self._classify_two_pass([scans[name] for name in names], workers, use_processes)
+        else:
+            name_categories = []
+            for name in names:
+                scan = scans[name]
+                name_categories.append(name_categories_for(name, self._pattern_counts(), scan))
+                self._learn_from_filename(name, scan)
+
+        batch = CategorizedFiles()
+        suggestions_cache = {}
+
+        for snapshot, name, extension, categories in zip(snapshots, names, extensions, name_categories):
+            key = (extension, categories)
+            suggestions = suggestions_cache.get(key)
+            if suggestions is None:
+                suggestions = suggestions_cache[key] = tuple(
+                    self._get_suggested_locations(extension, categories)
+                )
 
-    def _learn_from_filename(self, filename):
+            batch.paths.append(snapshot.path)
+            batch.extensions.append(extension)
+            batch.extension_categories.append(EXTENSION_TO_CATEGORY.get(extension, 'nieznana'))
+            batch.name_categories.append(categories)
+            batch.time_categories.append(scans[name].time)
+            batch.suggested_locations.append(suggestions)
+
+        sizes = [snapshot.size or 0 for snapshot in snapshots]
+        modified = [None if snapshot.created is None else snapshot.modified for snapshot in snapshots]
+        batch.sizes = sizes
+        batch.created_times = [snapshot.created for snapshot in snapshots]
+        batch.modified_times = modified
+        batch.size_codes = size_bucket_codes(sizes, size_scale)
+        batch.date_codes = age_bucket_codes(modified, now, age_scale)
+        batch.size_categories = size_scale.labels_for(batch.size_codes)
+        batch.date_categories = age_scale.labels_for(batch.date_codes)
+
+        return batch
+
+    def _classify_two_pass(self, scans, workers=None, use_processes=False):
+        """Dwa przebiegi: nauka liczników całej partii, potem klasyfikacja względem migawki"""
+        # 1. Map-reduce liczników słów
+        learned = Counter()
+        lookup_words = set()
+        for counts, words in map_name_chunks(count_pattern_words, scans, workers, use_processes):
+            learned.update(counts)
+            lookup_words.update(words)
+
+        # 2. Zamrożona migawka - tylko słowa, o które zapyta klasyfikacja tej partii
+        current = self._pattern_counts()
+        frozen = {word: current.get(word, 0) + learned.get(word, 0) for word in lookup_words}
+
+        name_categories = []
+        for chunk in map_name_chunks(partial(classify_names, patterns=frozen), scans, workers, use_processes):
+            name_categories.extend(chunk)
+
+        self._learn_counts(learned)
+        return name_categories
+
+    def _learn_from_filename(self, filename, scan=None):
         """Uczy się z nazw plików dla przyszłych kategoryzacji"""
-        # Ekstraktuj słowa kluczowe
-        words = re.findall(r'[a-zA-ZżółćęśąźńŻÓŁĆĘŚĄŹŃ]{4,}', filename)
-
-        for word in words:
-            if word not in IGNORE_WORDS:
-                self.dynamic_patterns[word] += 1
+        # Słowa kluczowe z tego samego skanowania co kategoryzacja, do fragmentu wątku
+        scan = scan or scan_name(filename)
+        pending = self._pattern_shards.add(scan.learn_words, current_day())
+        self._patterns_updated(pending)
 
-        # Zapisuj co 10 nowych wzorców
-        if sum(self.dynamic_patterns.values()) % 10 == 0:
-            self._save_dynamic_patterns()
+    def _learn_counts(self, counts):
+        """Dolicza liczniki słów nauczone z całej partii (tryb dwuprzebiegowy)"""
+        pending = self._pattern_shards.add_counts(counts, current_day())
+        self._patterns_updated(pending)
 
-    def _detect_time_patterns(self, name):
-        """Wykrywa wzorce czasowe w nazwie pliku"""
-        patterns = []
-
-        # Proste wzorce dat
-        if re.search(r'\d{4}-\d{2}-\d{2}', name):
-            patterns.append('dzienny')
-        elif re.search(r'\d{4}-\d{2}', name):
-            patterns.append('miesięczny')
-        elif re.search(r'\b\d{4}\b', name):
-            patterns.append('roczny')
-
-        return patterns
+    def _patterns_updated(self, pending):
+        """Zapis odroczony - scalenie i zapis tylko gdy minął interwał (liczba zmian lub czas)"""
+        if self._patterns_flush_due(pending):
+            self.flush()
 
     def _categorize_by_size(self, file_size):
         """Kategoryzuje plik na podstawie rozmiaru"""
         try:
             file_size = int(file_size) if file_size else 0
-
-            KB = 1024
-            MB = KB * 1024
-            GB = MB * 1024
-
-            if file_size < 10 * KB:
-                return 'bardzo_mały'
-            elif file_size < 500 * KB:
-                return 'mały'
-            elif file_size < 5 * MB:
-                return 'średni'
-            elif file_size < 50 * MB:
-                return 'duży'
-            elif file_size < 500 * MB:
-                return 'bardzo_duży'
-            else:
-                return 'ogromny'
+            return SIZE_SCALE.label(SIZE_SCALE.code(file_size))
         except:
             return 'nieznany'
 
@@ -268,41 +822,26 @@ class CategoryAnalyzer:
             return 'nieznana'
 
         now = datetime.now()
-        age_in_days = (now - modification_date).days
-
-        if age_in_days < 1:
-            return 'dzisiaj'
-        elif age_in_days < 7:
-            return 'ostatni_tydzień'
-        elif age_in_days < 30:
-            return 'ostatni_miesiąc'
-        elif age_in_days < 365:
-            return 'ostatni_rok'
-        else:
-            return 'starszy'
+        return self._categorize_by_age((now - modification_date).days)
+
+    def _categorize_by_age(self, age_in_days):
+        """Kategoria daty dla wieku pliku w pełnych dniach"""
+        return AGE_SCALE.label(AGE_SCALE.code(age_in_days * DAY))
 
     def _get_suggested_locations(self, extension, name_categories):
         """Pobiera sugerowane lokalizacje na podstawie historii"""
         suggestions = []
+        today = current_day()
 
         # Na podstawie rozszerzenia
-        if extension in self.transfer_history['extensions']:
-            ext_locations = sorted(
-                self.transfer_history['extensions'][extension].items(),
-                key=lambda x: x[1], reverse=True
-            )
-            for loc, count in ext_locations[:2]:
-                suggestions.append((loc, f"Rozszerzenie {extension}", count))
+        for location, count in self.suggestion_index.top('extensions', extension, 2):
+            suggestions.append((location, f"Rozszerzenie {extension}", display_count(count)))
 
         # Na podstawie kategorii nazwy
         for category in name_categories:
-            if category in self.transfer_history['patterns']:
-                pattern_locations = sorted(
-                    self.transfer_history['patterns'][category].items(),
-                    key=lambda x: x[1], reverse=True
-                )
-                for loc, count in pattern_locations[:1]:
-                    suggestions.append((loc, f"Kategoria '{category}'", count))
+            for location, count in self.suggestion_index.top('patterns', category, 1):
+                suggestions.append((location, f"Kategoria '{category}'", display_count(count)))
+                self._pattern_shards.touch(category, today)
 
         return suggestions
 
@@ -311,60 +850,60 @@ class CategoryAnalyzer:
         if file_info.status != "Przeniesiono" or not file_info.destination_path:
             return
 
-        extension = file_info.extension.lower()
-        destination_dir = os.path.dirname(file_info.destination_path)
-
-        # Zapisz historię rozszerzeń
-        if extension not in self.transfer_history['extensions']:
-            self.transfer_history['extensions'][extension] = {}
-        if destination_dir not in self.transfer_history['extensions'][extension]:
-            self.transfer_history['extensions'][extension][destination_dir] = 0
-        self.transfer_history['extensions'][extension][destination_dir] += 1
-
-        # Zapisz historię wzorców
-        for category_name in file_info.category_name:
-            if category_name not in self.transfer_history['patterns']:
-                self.transfer_history['patterns'][category_name] = {}
-            if destination_dir not in self.transfer_history['patterns'][category_name]:
-                self.transfer_history['patterns'][category_name][destination_dir] = 0
-            self.transfer_history['patterns'][category_name][destination_dir] += 1
-
-        # Zapisz historię
-        self.save_history()
+        # Zmiany historii tylko pod blokadą zapisu - odczyty sugestii idą z indeksu
+        with self._write_lock:
+            extension = file_info.extension.lower()
+            # Znormalizowana i internowana ścieżka - jeden klucz niezależnie od separatorów
+            destination = normalize_destination(os.path.dirname(file_info.destination_path))
+            destination_id = self.path_table.intern(destination)
+
+            # Zapisz historię rozszerzeń
+            if extension not in self.transfer_history['extensions']:
+                self.transfer_history['extensions'][extension] = {}
+            if destination_id not in self.transfer_history['extensions'][extension]:
+                self.transfer_history['extensions'][extension][destination_id] = 0
+            self.transfer_history['extensions'][extension][destination_id] += 1
+            self._history_deltas[('extensions', extension)][destination] += 1
+            self.suggestion_index.record('extensions', extension, destination,
+                                         self.transfer_history['extensions'][extension][destination_id])
+
+            # Zapisz historię wzorców
+            today = current_day()
+            for category_name in file_info.category_name:
+                self.transfer_history['last_used'][category_name] = today
+                if category_name not in self.transfer_history['patterns']:
+                    self.transfer_history['patterns'][category_name] = {}
+                if destination_id not in self.transfer_history['patterns'][category_name]:
+                    self.transfer_history['patterns'][category_name][destination_id] = 0
+                self.transfer_history['patterns'][category_name][destination_id] += 1
+                self._history_deltas[('patterns', category_name)][destination] += 1
+                self.suggestion_index.record('patterns', category_name, destination,
+                                             self.transfer_history['patterns'][category_name][destination_id])
+
+            # Ostatnie użycia z odczytów innych wątków, zanik i limity historii, potem zapis
+            self._merge_pattern_shards()
+            self._maintain_history()
+            self.save_history()
 
     def group_files_by_category(self, files_info_list):
-        """Grupuje pliki według kategorii"""
-        grouped_by_extension_category = defaultdict(list)
-        grouped_by_name_category = defaultdict(list)
-        grouped_by_size = defaultdict(list)
-        grouped_by_age = defaultdict(list)
-        grouped_by_dynamic = defaultdict(list)  # NOWE: grupy dynamiczne
+        """Grupuje pliki według kategorii (wspólna tabela grupowania, grupy jako widoki indeksów)"""
+        table = shared_file_table(files_info_list)
+
+        grouped_by_extension_category = defaultdict(list, table.groups('type'))
+        grouped_by_name_category = defaultdict(list, table.groups('name'))
+        grouped_by_size = defaultdict(list, table.groups('size'))
+        grouped_by_age = defaultdict(list, table.groups('date'))
+        # NOWE: grupy dynamiczne
+        grouped_by_dynamic = defaultdict(list, {
+            name_cat: files for name_cat, files in grouped_by_name_category.items()
+            if name_cat.startswith(('grupa_', 'seria_', 'temat_'))
+        })
 
         all_groups = defaultdict(list)
-
-        for file_info in files_info_list:
-            # Grupowanie według rozszerzenia
-            ext_category = file_info.category_extension
-            grouped_by_extension_category[ext_category].append(file_info)
-            all_groups[f"rozszerzenie_{ext_category}"].append(file_info)
-
-            # Grupowanie według kategorii nazwy
-            for name_cat in file_info.category_name:
-                grouped_by_name_category[name_cat].append(file_info)
-                all_groups[f"nazwa_{name_cat}"].append(file_info)
-
-                # Specjalne grupowanie dynamiczne
-                if name_cat.startswith(('grupa_', 'seria_', 'temat_')):
-                    grouped_by_dynamic[name_cat].append(file_info)
-
-            # Pozostałe grupowania
-            size_category = file_info.size_category
-            grouped_by_size[size_category].append(file_info)
-            all_groups[f"rozmiar_{size_category}"].append(file_info)
-
-            age_category = file_info.date_category
-            grouped_by_age[age_category].append(file_info)
-            all_groups[f"wiek_{age_category}"].append(file_info)
+        all_groups.update(table.groups('type', prefix="rozszerzenie_"))
+        all_groups.update(table.groups('name', prefix="nazwa_"))
+        all_groups.update(table.groups('size', prefix="rozmiar_"))
+        all_groups.update(table.groups('date', prefix="wiek_"))
 
         return {
             'według_rozszerzenia': grouped_by_extension_category,
@@ -377,44 +916,33 @@ class CategoryAnalyzer:
 
     def get_dynamic_patterns_stats(self):
         """Zwraca statystyki dynamicznych wzorców"""
-        if not self.dynamic_patterns:
+        with self._write_lock:
+            self._merge_pattern_shards()
+            patterns = list(self.dynamic_patterns.items())
+
+        if not patterns:
             return "Brak wzorców dynamicznych"
 
-        stats = f"Wzorce dynamiczne ({len(self.dynamic_patterns)} unikalnych):\n"
-        top_patterns = sorted(self.dynamic_patterns.items(), key=lambda x: x[1], reverse=True)
+        stats = f"Wzorce dynamiczne ({len(patterns)} unikalnych):\n"
+        top_patterns = sorted(patterns, key=lambda x: x[1], reverse=True)
 
         for pattern, count in top_patterns[:10]:
-            stats += f"  {pattern}: {count} wystąpień\n"
+            stats += f"  {pattern}: {display_count(count)} wystąpień\n"
 
         return stats
 
     def smart_group_files_by_name(self, files_info_list):
-        """Inteligentne grupowanie na podstawie podobieństwa nazw"""
+        """Inteligentne grupowanie na podstawie podobieństwa nazw (serie bez porównań parami)"""
         groups = defaultdict(list)
-        processed_files = set()
 
-        for file_info in files_info_list:
-            if file_info in processed_files:
-                continue
-
-            filename = file_info.name.lower()
-
-            # Znajdź pliki o podobnych nazwach
-            similar_files = [file_info]
-
-            for other_file in files_info_list:
-                if other_file != file_info and other_file not in processed_files:
-                    other_name = other_file.name.lower()
-
-                    # Sprawdź podobieństwo (wspólny prefiks/sufiks)
-                    if self._files_are_similar(filename, other_name):
-                        similar_files.append(other_file)
-                        processed_files.add(other_file)
+        for seed_index, members in find_series([f.name for f in files_info_list]):
+            file_info = files_info_list[seed_index]
 
             # Utwórz grupę
-            if len(similar_files) > 1:
+            if len(members) > 1:
+                similar_files = [files_info_list[i] for i in members]
                 # Znajdź wspólną część nazwy
-                common_part = self._find_common_part([f.name for f in similar_files])
+                common_part = find_common_part([f.name for f in similar_files])
                 group_name = f"Seria: {common_part}" if common_part else f"Grupa: {file_info.name[:10]}"
                 groups[group_name] = similar_files
             else:
@@ -425,54 +953,4 @@ class CategoryAnalyzer:
                 else:
                     groups["Różne"].append(file_info)
 
-            processed_files.add(file_info)
-
         return dict(groups)
-
-    def _files_are_similar(self, name1, name2):
-        """Sprawdza czy nazwy plików są podobne"""
-        # Usuń cyfry i znaki specjalne
-        clean1 = re.sub(r'[^\w]', '', name1)
-        clean2 = re.sub(r'[^\w]', '', name2)
-
-        # Sprawdź wspólny prefiks (minimum 4 znaki)
-        common_prefix_len = 0
-        for c1, c2 in zip(clean1, clean2):
-            if c1 == c2:
-                common_prefix_len += 1
-            else:
-                break
-
-        if common_prefix_len >= 4:
-            return True
-
-        # Sprawdź czy jeden zawiera drugi (dla dłuższych nazw)
-        if len(clean1) >= 6 and len(clean2) >= 6:
-            shorter = clean1 if len(clean1) < len(clean2) else clean2
-            longer = clean2 if len(clean1) < len(clean2) else clean1
-
-            if shorter in longer:
-                return True
-
-        return False
-
-    def _find_common_part(self, names):
-        """Znajduje wspólną część nazw"""
-        if not names:
-            return ""
-
-        # Znajdź najdłuższy wspólny prefiks
-        common = names[0]
-        for name in names[1:]:
-            new_common = ""
-            for c1, c2 in zip(common, name):
-                if c1.lower() == c2.lower():
-                    new_common += c1
-                else:
-                    break
-            common = new_common
-
-        # Usuń końcowe cyfry i znaki specjalne
-        common = re.sub(r'[\d_\-\s]+$', '', common)
-
-        return common if len(common) >= 3 else ""
\ No newline at end of file
@@ -0,0 +1,107 @@
+# counter_shards.py
+import threading
+from collections import Counter
+
+
+class CounterShard:
+    """Liczniki jednego wątku - blokadę pobiera tylko właściciel i (rzadko) scalanie"""
+
+    __slots__ = ('counts', 'last_used', 'touched', 'pending', 'lock')
+
+    def __init__(self):
+        self.counts = Counter()  # słowo -> przyrost licznika od ostatniego scalenia
+        self.last_used = {}  # słowo -> dzień ostatniego użycia
+        self.touched = {}  # inne klucze (np. wzorce historii) -> dzień ostatniego użycia
+        self.pending = 0  # liczba niescalonych zmian
+        self.lock = threading.Lock()
+
+
+class ShardedCounter:
+    """Licznik podzielony na fragmenty per wątek, scalany dopiero przy zapisie.
+
+    Wątki zwiększają liczniki we własnym fragmencie, więc równoległa kategoryzacja
+    nie walczy o wspólną blokadę. drain() zabiera przyrosty ze wszystkich fragmentów.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def shard(self):
+        """Fragment bieżącego wątku (tworzony przy pierwszym użyciu)"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = CounterShard()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def add(self, words, day, count=1):
+        """Zwiększa liczniki słów w fragmencie wątku. Zwraca liczbę niescalonych zmian fragmentu"""
+        shard = self.shard()
+        with shard.lock:
+            for word in words:
+                shard.counts[word] += count
+                shard.last_used[word] = day
+                shard.pending += count
+            return shard.pending
+
+    def add_counts(self, counts, day):
+        """Dolicza gotowe liczniki (np. z całej partii). Zwraca liczbę niescalonych zmian fragmentu"""
+        shard = self.shard()
+        with shard.lock:
+            for word, count in counts.items():
+                shard.counts[word] += count
+                shard.last_used[word] = day
+                shard.pending += count
+            return shard.pending
+
+    def touch(self, key, day):
+        """Zapamiętuje użycie klucza bez zmiany liczników"""
+        shard = self.shard()
+        with shard.lock:
+            shard.touched[key] = day
+
+    def local_counts(self):
+        """Niescalone przyrosty bieżącego wątku (tylko do odczytu)"""
+        return self.shard().counts
+
+    def drain(self):
+        """Zabiera przyrosty ze wszystkich fragmentów: (liczniki, ostatnie użycia, dotknięte klucze, zmiany)"""
+        counts = Counter()
+        last_used = {}
+        touched = {}
+        pending = 0
+
+        with self._shards_lock:
+            shards = list(self._shards)
+
+        for shard in shards:
+            with shard.lock:
+                if not shard.pending and not shard.touched:
+                    continue
+                counts.update(shard.counts)
+                last_used.update(shard.last_used)
+                touched.update(shard.touched)
+                pending += shard.pending
+                shard.counts = Counter()
+                shard.last_used = {}
+                shard.touched = {}
+                shard.pending = 0
+
+        return counts, last_used, touched, pending
+
+
+class CombinedCounts:
+    """Widok do odczytu: scalone liczniki + niescalone przyrosty bieżącego wątku"""
+
+    __slots__ = ('base', 'local')
+
+    def __init__(self, base, local):
+        self.base = base
+        self.local = local
+
+    def get(self, key, default=0):
+        return self.base.get(key, default) + self.local.get(key, 0)
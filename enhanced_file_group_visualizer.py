@@ -1,9 +1,21 @@
 # enhanced_file_group_visualizer.py
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-from collections import defaultdict, Counter
+from collections import defaultdict
 import os
 import re
+import traceback
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from similarity_index import HybridGroupIndex
+from semantic_categories import find_semantic_category
+from series_grouping import LaterNameIndex
+from group_engine import shared_file_table, group_summaries, summarize_files
+from table_widgets import ChunkedLoader, SortableHeadings, sort_rows, sync_listbox
+from search_index import FileNameIndex, GroupSearchIndex
+
+SEARCH_DEBOUNCE_MS = 150  # opóźnienie filtrowania po ostatnim naciśnięciu klawisza
+GROUPING_POLL_MS = 50  # co ile sprawdzać, czy grupowanie w tle się zakończyło
 
 
 def format_size(size_in_bytes):
@@ -25,8 +37,23 @@ class EnhancedFileGroupVisualizer:
         self.files_info = files_info
         self.category_analyzer = category_analyzer
         self.current_groups = {}
+        self._group_summaries = {}  # nazwa grupy -> GroupSummary bieżącego grupowania
         self._updating = False  # Flaga blokująca wielokrotne wywołania
 
+        # Zapamiętane grupowania: (metoda, wersja zbioru plików) -> wynik
+        self._groups_cache = {}
+        self._pending_groups = {}
+        self._files_revision = 0
+
+        # Wyszukiwanie grup: opóźnione filtrowanie i indeksy trigramów
+        self._filter_job = None
+        self._shown_groups = []  # nazwy aktualnie widoczne na liście grup
+        self._group_ranks = {}
+        self._group_search = None
+        self._file_name_index = None  # (wersja zbioru plików, FileNameIndex)
+        self._grouping_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grupowanie")
+        self._closed = False
+
         # Utworzenie okna
         try:
             self.window = tk.Toplevel(parent)
@@ -39,6 +66,9 @@ class EnhancedFileGroupVisualizer:
             self.window.title("Wizualizacja grup plików")
             self.window.geometry("1400x900")
 
+        # Zamknięcie okna kończy wątek grupowania
+        self.window.bind("<Destroy>", self._on_destroy)
+
         # Ustawienie stylu okna
         self.window.configure(bg='#f0f0f0')
 
@@ -148,10 +178,11 @@ class EnhancedFileGroupVisualizer:
         self.details_columns = ("Nazwa", "Rozszerzenie", "Rozmiar", "Data utworzenia", "Status")
         self.details_tree = ttk.Treeview(self.files_tab, columns=self.details_columns, show="headings")
 
-        # Nagłówki kolumn
+        # Nagłówki kolumn - kliknięcie sortuje pliki grupy
         for col in self.details_columns:
-            self.details_tree.heading(col, text=col)
             self.details_tree.column(col, width=150)
+        self.details_headings = SortableHeadings(self.details_tree, self.details_columns, self._sort_details)
+        self._details_files = []
 
         # Pasek przewijania dla tabeli szczegółów
         details_scrollbar_y = ttk.Scrollbar(self.files_tab, orient="vertical", command=self.details_tree.yview)
@@ -162,6 +193,7 @@ class EnhancedFileGroupVisualizer:
         details_scrollbar_y.pack(side="right", fill="y")
         details_scrollbar_x.pack(side="bottom", fill="x")
         self.details_tree.pack(fill="both", expand=True, padx=5, pady=5)
+        self._details_loader = ChunkedLoader(self.details_tree)
 
         # Zakładka 2: Analiza grup
         self.analysis_tab = ttk.Frame(self.details_notebook)
@@ -214,19 +246,52 @@ class EnhancedFileGroupVisualizer:
         banner_label.pack(fill="x", pady=5)
 
     def filter_groups(self, *args):
-        """Filtruje grupy na podstawie wyszukiwanego tekstu"""
-        search_term = self.search_var.get().lower()
-
-        # Wyczyść listbox
-        self.groups_listbox.delete(0, tk.END)
-
-        # Dodaj pasujące grupy
-        for group_name in self.all_groups_list:
-            if search_term in group_name.lower():
-                self.groups_listbox.insert(tk.END, group_name)
+        """Filtruje grupy na podstawie wyszukiwanego tekstu - z opóźnieniem, nie przy każdym klawiszu"""
+        if self._filter_job is not None:
+            self.window.after_cancel(self._filter_job)
+        self._filter_job = self.window.after(SEARCH_DEBOUNCE_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        """Pokazuje grupy, których nazwa lub pliki zawierają wyszukiwany tekst"""
+        self._filter_job = None
+        search_term = self.search_var.get()
+
+        if search_term:
+            positions = self._get_group_search().search(search_term)
+            wanted = [self.all_groups_list[position] for position in positions]
+        else:
+            wanted = self.all_groups_list
+
+        # Zmieniamy na liście tylko różnice zamiast usuwać i wstawiać wszystko
+        self._shown_groups = sync_listbox(self.groups_listbox, self._shown_groups, wanted, self._group_ranks)
+
+    def _get_group_search(self):
+        """Indeks wyszukiwania bieżących grup - zwykle gotowy z wątku tła, w razie braku budowany teraz"""
+        if self._group_search is None:
+            self._group_search = self._build_group_search(self.current_groups)
+        return self._group_search
+
+    def _build_group_search(self, groups):
+        """Buduje indeks wyszukiwania grup (indeks nazw plików - raz na zbiór plików)"""
+        version = self._files_version()
+        file_index = self._file_name_index
+        if file_index is None or file_index[0] != version:
+            file_index = self._file_name_index = (version, FileNameIndex(self.files_info))
+        # Indeks gołych nazw grup (bez " (N)"), w kolejności listy - pozycje wyników
+        # odpowiadają pozycjom w all_groups_list, a cyfry nie trafiają w liczności grup
+        return GroupSearchIndex(sorted(groups), groups, file_index=file_index[1])
 
     def update_groups(self):
-        """Aktualizacja grup na podstawie wybranej metody - POPRAWIONA WERSJA"""
+        """Aktualizacja grup na podstawie wybranej metody - POPRAWIONA WERSJA.
+
+        Wyniki są zapamiętywane dla pary (metoda, wersja zbioru plików), więc powrót do
+        wcześniej wybranej metody nie liczy grup od nowa. Nowe grupowanie liczy się w tle,
+        a okno pokazuje je po zakończeniu.
+        """
+        # Okno zamknięte - wątek grupowania już nie działa
+        if self._closed:
+            return
+
         # Zabezpieczenie przed wielokrotnym wywołaniem
         if hasattr(self, '_updating') and self._updating:
             return
@@ -243,401 +308,337 @@ class EnhancedFileGroupVisualizer:
             self.search_var.set("")
 
             # Czyszczenie tabeli szczegółów
-            for i in self.details_tree.get_children():
-                self.details_tree.delete(i)
+            self._clear_details()
 
             # Czyszczenie przechowywanych danych
             self.all_groups_list = []
+            self._shown_groups = []
+            self._group_ranks = {}
+            self._group_search = None
             self.current_groups = {}
+            self._group_summaries = {}
 
             # Pobieranie wybranej metody grupowania
             group_by = self.group_by_var.get()
             print(f"Wybrana metoda grupowania: {group_by}")
 
-            # CZYSTE grupowanie - każda metoda tworzy TYLKO SWOJE grupy
-            method_info = ""
-
-            if group_by == "rozszerzenie":
-                # TYLKO rozszerzenia - nie mieszamy z innymi kategoriami!
-                print("=== GRUPOWANIE WEDŁUG ROZSZERZENIA ===")
-                for file_info in self.files_info:
-                    ext = file_info.extension.lower() if file_info.extension else "(brak rozszerzenia)"
-                    if ext not in self.current_groups:
-                        self.current_groups[ext] = []
-                    self.current_groups[ext].append(file_info)
-                    print(f"Dodano {file_info.name} do grupy rozszerzenia: {ext}")
-
-                method_info = "Grupowanie według rozszerzenia pliku (.txt, .jpg, .pdf...)"
-
-            elif group_by == "typ_pliku":
-                # TYLKO typy plików z category_extension
-                print("=== GRUPOWANIE WEDŁUG TYPU PLIKU ===")
-                for file_info in self.files_info:
-                    file_type = file_info.category_extension
-                    if file_type not in self.current_groups:
-                        self.current_groups[file_type] = []
-                    self.current_groups[file_type].append(file_info)
-                    print(f"Dodano {file_info.name} do grupy typu: {file_type}")
-
-                method_info = "Grupowanie według typu pliku (dokumenty, obrazy, audio...)"
-
-            elif group_by == "slowa_nazwy":
-                print("=== ULEPSZONE GRUPOWANIE WEDŁUG NAZW ===")
-
-                # Rozbudowany słownik kategorii semantycznych
-                semantic_categories = {
-                    'przyroda': {
-                        'keywords': ['zwierzę', 'roślina', 'natura', 'las', 'drzewo', 'kwiat', 'ptak',
-                                     'ryba', 'owad', 'ssak', 'gad', 'płaz', 'fauna', 'flora', 'ekologia',
-                                     'animal', 'plant', 'nature', 'forest', 'tree', 'flower', 'bird'],
-                        'prefixes': ['bio', 'eco', 'zoo', 'bot']
-                    },
-                    'nauka': {
-                        'keywords': ['fizyka', 'chemia', 'matematyka', 'biologia', 'informatyka', 'nauka',
-                                     'eksperyment', 'badanie', 'analiza', 'teoria', 'wzór', 'równanie',
-                                     'physics', 'chemistry', 'math', 'biology', 'science', 'research'],
-                        'prefixes': ['lab', 'sci', 'mat', 'fiz', 'chem', 'bio']
-                    },
-                    'finanse': {
-                        'keywords': ['faktura', 'rachunek', 'płatność', 'konto', 'bank', 'pieniądze',
-                                     'budżet', 'wydatek', 'przychód', 'podatek', 'księgowość', 'bilans',
-                                     'invoice', 'payment', 'account', 'money', 'budget', 'tax'],
-                        'prefixes': ['fv', 'inv', 'pay', 'fin', 'acc']
-                    },
-                    'dokumenty_firmowe': {
-                        'keywords': ['umowa', 'kontrakt', 'oferta', 'protokół', 'sprawozdanie', 'raport',
-                                     'prezentacja', 'spotkanie', 'projekt', 'zlecenie', 'zamówienie',
-                                     'contract', 'offer', 'report', 'presentation', 'meeting', 'project'],
-                        'prefixes': ['doc', 'rep', 'prez', 'proj', 'meet']
-                    },
-                    'edukacja': {
-                        'keywords': ['lekcja', 'kurs', 'szkolenie', 'wykład', 'egzamin', 'test', 'zadanie',
-                                     'ćwiczenie', 'podręcznik', 'notatka', 'studium', 'seminarium',
-                                     'lesson', 'course', 'training', 'lecture', 'exam', 'exercise'],
-                        'prefixes': ['edu', 'kurs', 'szk', 'stud', 'learn']
-                    },
-                    'multimedia': {
-                        'keywords': ['zdjęcie', 'foto', 'obraz', 'grafika', 'wideo', 'film', 'muzyka',
-                                     'dźwięk', 'audio', 'klip', 'animacja', 'render', 'edycja',
-                                     'photo', 'image', 'graphic', 'video', 'music', 'sound', 'animation'],
-                        'prefixes': ['img', 'vid', 'aud', 'gfx', 'anim', 'foto']
-                    },
-                    'osobiste': {
-                        'keywords': ['prywatne', 'osobiste', 'rodzina', 'wakacje', 'urodziny', 'ślub',
-                                     'pamiątka', 'wspomnienie', 'dziennik', 'list', 'kartka',
-                                     'private', 'personal', 'family', 'vacation', 'birthday', 'diary'],
-                        'prefixes': ['priv', 'pers', 'my', 'moje']
-                    },
-                    'technologia': {
-                        'keywords': ['kod', 'program', 'aplikacja', 'system', 'baza', 'serwer', 'sieć',
-                                     'backup', 'kopia', 'instalacja', 'konfiguracja', 'skrypt',
-                                     'code', 'app', 'system', 'database', 'server', 'network', 'script'],
-                        'prefixes': ['app', 'sys', 'db', 'net', 'dev', 'prog']
-                    }
-                }
+            cache_key = (group_by, self._files_version())
+            cached = self._groups_cache.get(cache_key)
+            if cached is not None:
+                print("Grupy z pamięci podręcznej")
+                self._show_groups(*cached)
+                return
 
-                # Funkcja do wykrywania najlepszego dopasowania semantycznego
-                def find_semantic_category(filename):
-                    filename_lower = filename.lower()
-                    best_category = None
-                    best_score = 0
-
-                    for category, data in semantic_categories.items():
-                        score = 0
-
-                        # Sprawdź słowa kluczowe
-                        for keyword in data['keywords']:
-                            if keyword in filename_lower:
-                                score += 3  # Pełne dopasowanie słowa
-                            elif any(part.startswith(keyword[:4]) for part in filename_lower.split('_')):
-                                score += 1  # Częściowe dopasowanie
-
-                        # Sprawdź prefiksy
-                        for prefix in data['prefixes']:
-                            if filename_lower.startswith(prefix):
-                                score += 2
-
-                        if score > best_score:
-                            best_score = score
-                            best_category = category
-
-                    return best_category if best_score > 0 else None
-
-                # Funkcja do analizy wzorców numerycznych
-                def analyze_numeric_pattern(filename):
-                    # Wzorce do wykrycia
-                    patterns = {
-                        'wersja': r'v\d+|ver\d+|wersja\d+|version\d+',
-                        'data': r'\d{4}[-_]\d{2}[-_]\d{2}|\d{2}[-_]\d{2}[-_]\d{4}',
-                        'numer_seryjny': r'#\d+|nr\d+|no\d+',
-                        'część': r'część\d+|part\d+|cz\d+|pt\d+',
-                        'rozdział': r'rozdział\d+|chapter\d+|rozdz\d+|ch\d+'
-                    }
-
-                    for pattern_name, pattern in patterns.items():
-                        if re.search(pattern, filename.lower()):
-                            return pattern_name
-
-                    # Sprawdź sekwencje numeryczne
-                    if re.search(r'\d{2,}', filename):
-                        return 'numeracja'
+            future = self._pending_groups.get(cache_key)
+            if future is None:
+                future = self._grouping_executor.submit(self._compute_groups_with_summaries, group_by)
+                self._pending_groups[cache_key] = future
 
-                    return None
+            self.method_info_label.config(text="Obliczanie grup...")
+            self._wait_for_groups(cache_key, future)
+
+        finally:
+            # Zawsze resetuj flagę
+            self._updating = False
+
+    def set_files(self, files_info):
+        """Podmienia listę plików (np. po kolejnym organizowaniu) - unieważnia zapamiętane grupowania"""
+        if self._closed:
+            return
+        self.files_info = files_info
+        self._files_changed()
+
+    def _files_changed(self):
+        """Unieważnia zapamiętane grupowania i odświeża widok"""
+        self._files_revision += 1
+        self._groups_cache.clear()
+        self.update_groups()
+
+    def _files_version(self):
+        """Wersja zbioru plików: jawne podmiany listy + jej długość (dopisane pliki)"""
+        return self._files_revision, id(self.files_info), len(self.files_info)
+
+    def _on_destroy(self, event):
+        """Zamknięcie okna: porzuca oczekujące grupowania i zwalnia wątek tła"""
+        # <Destroy> okna przychodzi też dla każdego widżetu potomnego
+        if event.widget is not self.window or self._closed:
+            return
+        self._closed = True
+        self._pending_groups.clear()
+        self._grouping_executor.shutdown(wait=False, cancel_futures=True)
 
-                # Funkcja do wyodrębnienia wspólnego rdzenia nazwy
-                def extract_common_stem(filenames):
-                    if len(filenames) < 2:
-                        return None
+    def _wait_for_groups(self, cache_key, future):
+        """Czeka (bez blokowania okna) na grupowanie liczone w tle"""
+        if self._closed:
+            return
+        if not future.done():
+            try:
+                self.window.after(GROUPING_POLL_MS, self._wait_for_groups, cache_key, future)
+            except tk.TclError:
+                pass  # Okno zostało zamknięte
+            return
+
+        self._pending_groups.pop(cache_key, None)
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Błąd grupowania: {e}")
+            traceback.print_exc()
+            self.method_info_label.config(text=f"Błąd grupowania: {e}")
+            return
+
+        if cache_key[1] == self._files_version():
+            self._groups_cache[cache_key] = result
 
-                    # Znajdź najdłuższy wspólny prefiks
-                    common_prefix = os.path.commonprefix([f.lower() for f in filenames])
+        # Pokaż wynik tylko, jeśli użytkownik nie wybrał w międzyczasie innej metody
+        if cache_key == (self.group_by_var.get(), self._files_version()):
+            self._show_groups(*result)
 
-                    # Usuń końcowe cyfry i znaki specjalne
-                    common_prefix = re.sub(r'[\d_\-\s]+$', '', common_prefix)
+    def _show_groups(self, groups, method_info, display_names, summaries=None, group_search=None):
+        """Wyświetla gotowe grupy na liście i w statystykach"""
+        self.current_groups = groups
+        self._group_summaries = dict(summaries or {})
+        self.all_groups_list = list(display_names)
+        self._group_ranks = {name: position for position, name in enumerate(self.all_groups_list)}
+        self._group_search = group_search
 
-                    # Minimum 4 znaki dla sensownego rdzenia
-                    if len(common_prefix) >= 4:
-                        return common_prefix
+        # Dodanie grup do listy
+        self.groups_listbox.delete(0, tk.END)
+        if display_names:
+            self.groups_listbox.insert(tk.END, *display_names)
+        self._shown_groups = list(self.all_groups_list)
+
+        # Wymuszenie odświeżenia
+        self.groups_listbox.update_idletasks()
+
+        print(f"\n=== WYNIK GRUPOWANIA ===")
+        print(f"Dodano {len(self.current_groups)} grup do listy")
+
+        # Aktualizacja statystyk
+        self._update_stats(method_info)
+
+        # Czyszczenie tabeli szczegółów
+        self._clear_details()
+
+    def _compute_groups_with_summaries(self, group_by):
+        """Grupy wybranej metody wraz ze statystykami i indeksem wyszukiwania (w wątku tła).
+
+        Indeks trigramów gotowy razem z grupami - pierwsze wyszukiwanie nie buduje go w wątku okna.
+        """
+        groups, method_info, display_names = self._compute_groups(group_by)
+        if self._closed:
+            # Okno zamknięto w trakcie grupowania - statystyki i indeks nie są już potrzebne
+            return groups, method_info, display_names, {}, None
+        return (groups, method_info, display_names, group_summaries(groups, self._file_table()),
+                self._build_group_search(groups))
+
+    def _file_table(self):
+        """Wspólna tabela plików dla bieżącej wersji listy (set_files podbija wersję)"""
+        return shared_file_table(self.files_info, version=self._files_revision)
+
+    def _group_summary(self, group_name, files):
+        """Statystyki grupy - zapisane przy grupowaniu, a w razie braku liczone przy pierwszym kliknięciu"""
+        summary = self._group_summaries.get(group_name)
+        if summary is None:
+            summary = summarize_files(files)
+            self._group_summaries[group_name] = summary
+        return summary
+
+    def _compute_groups(self, group_by):
+        """Liczy grupy wybranej metody (w wątku tła - bez odwołań do widżetów).
+
+        Zwraca (grupy, opis metody, nazwy do wyświetlenia na liście).
+        """
+        files_info = self.files_info
+        # Grupy kategorii ze wspólnej tabeli plików
+        source = self._file_table()
+
+        # CZYSTE grupowanie - każda metoda tworzy TYLKO SWOJE grupy
+        groups = {}
+        method_info = ""
+
+        if group_by == "rozszerzenie":
+            # TYLKO rozszerzenia - nie mieszamy z innymi kategoriami!
+            print("=== GRUPOWANIE WEDŁUG ROZSZERZENIA ===")
+            groups = source.groups('extension', "(brak rozszerzenia)")
+
+            method_info = "Grupowanie według rozszerzenia pliku (.txt, .jpg, .pdf...)"
+
+        elif group_by == "typ_pliku":
+            # TYLKO typy plików z category_extension
+            print("=== GRUPOWANIE WEDŁUG TYPU PLIKU ===")
+            groups = source.groups('type')
+
+            method_info = "Grupowanie według typu pliku (dokumenty, obrazy, audio...)"
+
+        elif group_by == "slowa_nazwy":
+            print("=== ULEPSZONE GRUPOWANIE WEDŁUG NAZW ===")
+
+            # Funkcja do analizy wzorców numerycznych
+            def analyze_numeric_pattern(filename):
+                # Wzorce do wykrycia
+                patterns = {
+                    'wersja': r'v\d+|ver\d+|wersja\d+|version\d+',
+                    'data': r'\d{4}[-_]\d{2}[-_]\d{2}|\d{2}[-_]\d{2}[-_]\d{4}',
+                    'numer_seryjny': r'#\d+|nr\d+|no\d+',
+                    'część': r'część\d+|part\d+|cz\d+|pt\d+',
+                    'rozdział': r'rozdział\d+|chapter\d+|rozdz\d+|ch\d+'
+                }
+
+                for pattern_name, pattern in patterns.items():
+                    if re.search(pattern, filename.lower()):
+                        return pattern_name
 
+                # Sprawdź sekwencje numeryczne
+                if re.search(r'\d{2,}', filename):
+                    return 'numeracja'
+
+                return None
+
+            # Funkcja do wyodrębnienia wspólnego rdzenia nazwy
+            def extract_common_stem(filenames):
+                if len(filenames) < 2:
                     return None
 
-                # Grupowanie plików
-                temp_groups = defaultdict(list)
-                ungrouped_files = []
-                processed_files = set()  # Zbiór przetworzonych plików
-
-                for file_info in self.files_info:
-                    # Sprawdź czy plik już został przetworzony
-                    if file_info in processed_files:
-                        continue
-
-                    file_name_lower = file_info.name.lower()
-                    grouped = False
-
-                    # 1. Najpierw sprawdź kategorie semantyczne
-                    semantic_cat = find_semantic_category(file_info.name)
-                    if semantic_cat:
-                        temp_groups[f"Kategoria: {semantic_cat.replace('_', ' ').title()}"].append(file_info)
-                        processed_files.add(file_info)
-                        grouped = True
-                        continue
-
-                    # 2. Sprawdź wzorce numeryczne
-                    numeric_pattern = analyze_numeric_pattern(file_info.name)
-                    if numeric_pattern:
-                        temp_groups[f"Wzorzec: {numeric_pattern.replace('_', ' ').title()}"].append(file_info)
-                        processed_files.add(file_info)
-                        grouped = True
-                        continue
-
-                    # 3. Analiza prefiksów (4-8 znaków)
-                    if not grouped:
-                        for prefix_len in range(8, 3, -1):
-                            if len(file_name_lower) >= prefix_len:
-                                prefix = file_name_lower[:prefix_len]
-                                # Sprawdź czy prefiks jest sensowny (zawiera litery)
-                                if any(c.isalpha() for c in prefix):
-                                    # Znajdź pliki z podobnym prefiksem
-                                    similar_files = [f for f in self.files_info
-                                                     if f.name.lower().startswith(
-                                            prefix) and f != file_info and f not in processed_files]
-                                    if len(similar_files) >= 1:  # Co najmniej 2 pliki razem
-                                        group_name = f"Seria: {prefix.title()}"
-                                        if group_name not in temp_groups:
-                                            temp_groups[group_name] = []
-                                        temp_groups[group_name].append(file_info)
-                                        processed_files.add(file_info)
-                                        grouped = True
-                                        break
-
-                    # 4. Jeśli nadal nie zgrupowane, szukaj podobieństwa w słowach
-                    if not grouped:
-                        words = re.findall(r'[a-zA-ZżółćęśąźńŻÓŁĆĘŚĄŹŃ]{4,}', file_name_lower)
-                        for word in words:
-                            if len(word) >= 4:  # Minimalna długość słowa
-                                similar_files = [f for f in self.files_info
-                                                 if
-                                                 word in f.name.lower() and f != file_info and f not in processed_files]
-                                if len(similar_files) >= 1:
-                                    temp_groups[f"Zawiera: {word.title()}"].append(file_info)
+                # Znajdź najdłuższy wspólny prefiks
+                common_prefix = os.path.commonprefix([f.lower() for f in filenames])
+
+                # Usuń końcowe cyfry i znaki specjalne
+                common_prefix = re.sub(r'[\d_\-\s]+$', '', common_prefix)
+
+                # Minimum 4 znaki dla sensownego rdzenia
+                if len(common_prefix) >= 4:
+                    return common_prefix
+
+                return None
+
+            # Grupowanie plików
+            temp_groups = defaultdict(list)
+            ungrouped_files = []
+            processed_files = set()  # Zbiór przetworzonych plików
+
+            # Pliki są przetwarzane po kolei, więc "nieprzetworzone" to pliki późniejsze -
+            # indeks prefiksów i słów odpowiada na to bez przeglądania całej listy
+            name_index = LaterNameIndex([f.name.lower() for f in files_info])
+
+            for file_position, file_info in enumerate(files_info):
+                # Sprawdź czy plik już został przetworzony
+                if file_info in processed_files:
+                    continue
+
+                file_name_lower = file_info.name.lower()
+                grouped = False
+
+                # 1. Najpierw sprawdź kategorie semantyczne
+                semantic_cat = find_semantic_category(file_info.name)
+                if semantic_cat:
+                    temp_groups[f"Kategoria: {semantic_cat.replace('_', ' ').title()}"].append(file_info)
+                    processed_files.add(file_info)
+                    grouped = True
+                    continue
+
+                # 2. Sprawdź wzorce numeryczne
+                numeric_pattern = analyze_numeric_pattern(file_info.name)
+                if numeric_pattern:
+                    temp_groups[f"Wzorzec: {numeric_pattern.replace('_', ' ').title()}"].append(file_info)
+                    processed_files.add(file_info)
+                    grouped = True
+                    continue
+
+                # 3. Analiza prefiksów (4-8 znaków)
+                if not grouped:
+                    for prefix_len in range(8, 3, -1):
+                        if len(file_name_lower) >= prefix_len:
+                            prefix = file_name_lower[:prefix_len]
+                            # Sprawdź czy prefiks jest sensowny (zawiera litery)
+                            if any(c.isalpha() for c in prefix):
+                                # Czy jest późniejszy plik z tym samym prefiksem
+                                if name_index.has_later_prefix(prefix, file_position):  # Co najmniej 2 pliki razem
+                                    group_name = f"Seria: {prefix.title()}"
+                                    if group_name not in temp_groups:
+                                        temp_groups[group_name] = []
+                                    temp_groups[group_name].append(file_info)
                                     processed_files.add(file_info)
                                     grouped = True
                                     break
 
-                    # Jeśli nie znaleziono grupy, dodaj do niezgrupowanych
-                    if not grouped:
-                        ungrouped_files.append(file_info)
-                        processed_files.add(file_info)
-
-                # Przepisz grupy do finalnego słownika, usuwając pojedyncze pliki
-                for group_name, files in temp_groups.items():
-                    # Usuń duplikaty w obrębie grupy
-                    unique_files = list(dict.fromkeys(files))
-                    if len(unique_files) > 1:
-                        self.current_groups[group_name] = unique_files
-                    else:
-                        ungrouped_files.extend(unique_files)
-
-                # Dodaj wszystkie niezgrupowane pliki do grupy "Inne"
-                if ungrouped_files:
-                    self.current_groups["Inne"] = ungrouped_files
-
-                method_info = "Ulepszone grupowanie semantyczne według nazw plików"
-
-            elif group_by == "rozmiar":
-                # TYLKO kategorie rozmiaru
-                print("=== GRUPOWANIE WEDŁUG ROZMIARU ===")
-                for file_info in self.files_info:
-                    size_category = file_info.size_category
-                    if size_category not in self.current_groups:
-                        self.current_groups[size_category] = []
-                    self.current_groups[size_category].append(file_info)
-                    print(f"Dodano {file_info.name} do grupy rozmiaru: {size_category}")
-
-                method_info = "Grupowanie według rozmiaru pliku (małe, średnie, duże...)"
-
-            elif group_by == "data":
-                # TYLKO kategorie daty
-                print("=== GRUPOWANIE WEDŁUG DATY ===")
-                for file_info in self.files_info:
-                    date_category = file_info.date_category
-                    if date_category not in self.current_groups:
-                        self.current_groups[date_category] = []
-                    self.current_groups[date_category].append(file_info)
-                    print(f"Dodano {file_info.name} do grupy daty: {date_category}")
-
-                method_info = "Grupowanie według daty utworzenia/modyfikacji"
-
-            elif group_by == "inteligentne":
-                print("=== INTELIGENTNE GRUPOWANIE HYBRYDOWE ===")
-
-                # Używa kombinacji wszystkich metod
-                hybrid_groups = defaultdict(lambda: {'files': [], 'score': 0})
-
-                # Analiza każdego pliku
-                for file_info in self.files_info:
-                    best_group = None
-                    best_score = 0
-
-                    # Sprawdź istniejące grupy
-                    for group_name, group_data in hybrid_groups.items():
-                        if not group_data['files']:
-                            continue
-
-                        # Oblicz podobieństwo do grupy
-                        score = 0
-
-                        # Podobieństwo rozszerzeń
-                        if any(f.extension == file_info.extension for f in group_data['files']):
-                            score += 10
-
-                        # Podobieństwo typów
-                        if any(f.category_extension == file_info.category_extension for f in group_data['files']):
-                            score += 8
-
-                        # Podobieństwo nazw (używając difflib)
-                        from difflib import SequenceMatcher
-                        for existing_file in group_data['files'][:5]:  # Sprawdź max 5 plików
-                            similarity = SequenceMatcher(None, file_info.name.lower(),
-                                                         existing_file.name.lower()).ratio()
-                            if similarity > 0.6:
-                                score += int(similarity * 20)
-
-                        # Podobieństwo rozmiaru
-                        if any(f.size_category == file_info.size_category for f in group_data['files']):
-                            score += 5
-
-                        if score > best_score:
-                            best_score = score
-                            best_group = group_name
-
-                    # Jeśli znaleziono dobrą grupę
-                    if best_group and best_score > 15:
-                        hybrid_groups[best_group]['files'].append(file_info)
-                        hybrid_groups[best_group]['score'] += best_score
-                    else:
-                        # Utwórz nową grupę
-                        # Określ nazwę grupy na podstawie dominującej cechy
-                        if file_info.category_name and len(file_info.category_name) > 0:
-                            group_name = f"Grupa: {file_info.category_name[0].title()}"
-                        elif len(file_info.name) > 6:
-                            group_name = f"Seria: {file_info.name[:6].title()}"
-                        else:
-                            group_name = f"Typ: {file_info.category_extension}"
-
-                        hybrid_groups[group_name]['files'].append(file_info)
-                        hybrid_groups[group_name]['score'] = 10
-
-                # Konwertuj na finalny format, łącząc małe grupy
-                ungrouped = []
-                for group_name, group_data in hybrid_groups.items():
-                    if len(group_data['files']) > 1:
-                        self.current_groups[group_name] = group_data['files']
-                    else:
-                        ungrouped.extend(group_data['files'])
-
-                # Dodaj niezgrupowane do "Inne"
-                if ungrouped:
-                    self.current_groups["Inne"] = ungrouped
-
-                method_info = "Inteligentne grupowanie hybrydowe - fuzja wszystkich metod"
-
-            elif group_by == "wszystkie":
-                # Mix wszystkich kategorii z prefiksami - ale każdy plik tylko raz w każdej kategorii
-                print("=== WSZYSTKIE KATEGORIE RAZEM ===")
-
-                for file_info in self.files_info:
-                    # Rozszerzenie
-                    ext = file_info.extension.lower() if file_info.extension else "(brak)"
-                    ext_key = f"Rozszerzenie: {ext}"
-                    if ext_key not in self.current_groups:
-                        self.current_groups[ext_key] = []
-                    self.current_groups[ext_key].append(file_info)
-
-                    # Typ pliku
-                    type_key = f"Typ: {file_info.category_extension}"
-                    if type_key not in self.current_groups:
-                        self.current_groups[type_key] = []
-                    self.current_groups[type_key].append(file_info)
-
-                    # Rozmiar
-                    size_key = f"Rozmiar: {file_info.size_category}"
-                    if size_key not in self.current_groups:
-                        self.current_groups[size_key] = []
-                    self.current_groups[size_key].append(file_info)
-
-                    # Data
-                    date_key = f"Wiek: {file_info.date_category}"
-                    if date_key not in self.current_groups:
-                        self.current_groups[date_key] = []
-                    self.current_groups[date_key].append(file_info)
-
-                method_info = "Wszystkie możliwe kategorie razem"
-
-            # Dodanie grup do listy
-            for group_name, files in sorted(self.current_groups.items()):
-                display_name = f"{group_name} ({len(files)})"
-                self.all_groups_list.append(display_name)
-                self.groups_listbox.insert(tk.END, display_name)
-
-            # Wymuszenie odświeżenia
-            self.groups_listbox.update_idletasks()
-
-            print(f"\n=== WYNIK GRUPOWANIA ===")
-            print(f"Dodano {len(self.current_groups)} grup do listy")
-            for group_name, files in self.current_groups.items():
-                print(f"  Grupa '{group_name}': {len(files)} plików")
-
-            # Aktualizacja statystyk
-            self._update_stats(method_info)
-
-            # Czyszczenie tabeli szczegółów
-            for i in self.details_tree.get_children():
-                self.details_tree.delete(i)
-
-        finally:
-            # Zawsze resetuj flagę
-            self._updating = False
+                # 4. Jeśli nadal nie zgrupowane, szukaj podobieństwa w słowach
+                if not grouped:
+                    words = LaterNameIndex.WORD_PATTERN.findall(file_name_lower)
+                    for word in words:
+                        if len(word) >= 4:  # Minimalna długość słowa
+                            if name_index.has_later_word(word, file_position):
+                                temp_groups[f"Zawiera: {word.title()}"].append(file_info)
+                                processed_files.add(file_info)
+                                grouped = True
+                                break
+
+                # Jeśli nie znaleziono grupy, dodaj do niezgrupowanych
+                if not grouped:
+                    ungrouped_files.append(file_info)
+                    processed_files.add(file_info)
+
+            # Przepisz grupy do finalnego słownika, usuwając pojedyncze pliki
+            for group_name, files in temp_groups.items():
+                # Usuń duplikaty w obrębie grupy
+                unique_files = list(dict.fromkeys(files))
+                if len(unique_files) > 1:
+                    groups[group_name] = unique_files
+                else:
+                    ungrouped_files.extend(unique_files)
+
+            # Dodaj wszystkie niezgrupowane pliki do grupy "Inne"
+            if ungrouped_files:
+                groups["Inne"] = ungrouped_files
+
+            method_info = "Ulepszone grupowanie semantyczne według nazw plików"
+
+        elif group_by == "rozmiar":
+            # TYLKO kategorie rozmiaru
+            print("=== GRUPOWANIE WEDŁUG ROZMIARU ===")
+            groups = source.groups('size')
+
+            method_info = "Grupowanie według rozmiaru pliku (małe, średnie, duże...)"
+
+        elif group_by == "data":
+            # TYLKO kategorie daty
+            print("=== GRUPOWANIE WEDŁUG DATY ===")
+            groups = source.groups('date')
+
+            method_info = "Grupowanie według daty utworzenia/modyfikacji"
+
+        elif group_by == "inteligentne":
+            print("=== INTELIGENTNE GRUPOWANIE HYBRYDOWE ===")
+
+            # Używa kombinacji wszystkich metod - kandydaci z indeksu podobieństwa zamiast
+            # porównywania każdego pliku z każdą grupą
+            hybrid_index = HybridGroupIndex()
+            for file_info in files_info:
+                hybrid_index.add(file_info)
+
+            # Konwertuj na finalny format, łącząc małe grupy
+            ungrouped = []
+            for group_name, group_files in hybrid_index.as_dict().items():
+                if len(group_files) > 1:
+                    groups[group_name] = group_files
+                else:
+                    ungrouped.extend(group_files)
+
+            # Dodaj niezgrupowane do "Inne"
+            if ungrouped:
+                groups["Inne"] = ungrouped
+
+            method_info = "Inteligentne grupowanie hybrydowe - fuzja wszystkich metod"
+
+        elif group_by == "wszystkie":
+            # Mix wszystkich kategorii z prefiksami - ale każdy plik tylko raz w każdej kategorii
+            print("=== WSZYSTKIE KATEGORIE RAZEM ===")
+            groups = source.all_categories_groups()
+
+            method_info = "Wszystkie możliwe kategorie razem"
+
+        display_names = [f"{group_name} ({len(groups[group_name])})" for group_name in sorted(groups)]
+        return groups, method_info, display_names
 
     def show_group_details(self, event):
         """Wyświetla szczegóły wybranej grupy"""
@@ -651,8 +652,7 @@ class EnhancedFileGroupVisualizer:
         group_name = group_name_with_count.split(" (")[0]
 
         # Czyszczenie tabeli
-        for i in self.details_tree.get_children():
-            self.details_tree.delete(i)
+        self._clear_details()
 
         # Czyszczenie analizy
         self.analysis_text.delete('1.0', tk.END)
@@ -661,43 +661,34 @@ class EnhancedFileGroupVisualizer:
         if group_name in self.current_groups:
             files = self.current_groups[group_name]
 
+            summary = self._group_summary(group_name, files)
+
             # Aktualizacja informacji o grupie
-            self._show_group_info(group_name, files)
+            self._show_group_info(group_name, files, summary)
 
             # Dodaj analizę grupy
-            self._show_group_analysis(group_name, files)
+            self._show_group_analysis(group_name, files, summary)
 
             # Dodanie plików do tabeli
-            for file_info in files:
-                self.details_tree.insert("", "end", values=(
-                    file_info.name,
-                    file_info.extension,
-                    format_size(file_info.file_size),
-                    file_info.creation_date,
-                    file_info.status
-                ))
-
-    def _show_group_info(self, group_name, files):
-        """Pokazuje informacje o grupie"""
-        info_text = f"GRUPA: {group_name}\n\n"
-        info_text += f"Liczba plików: {len(files)}\n"
+            self._details_files = files
+            self._load_details()
 
-        # Oblicz statystyki grupy
-        total_size = sum(f.file_size for f in files)
-        info_text += f"Łączny rozmiar: {format_size(total_size)}\n"
+    def _show_group_info(self, group_name, files, summary):
+        """Pokazuje informacje o grupie (ze statystyk policzonych przy grupowaniu)"""
+        info_text = f"GRUPA: {group_name}\n\n"
+        info_text += f"Liczba plików: {summary.count}\n"
+        info_text += f"Łączny rozmiar: {format_size(summary.total_size)}\n"
+        info_text += f"Średni rozmiar: {format_size(summary.mean_size)}\n"
 
-        # Statystyki rozszerzeń
-        extensions = Counter(f.extension.lower() for f in files)
-        most_common_ext = extensions.most_common(1)[0] if extensions else ("brak", 0)
+        most_common_ext = summary.dominant_extension
         info_text += f"Dominujące rozszerzenie: {most_common_ext[0]} ({most_common_ext[1]} plików)\n"
 
         # Średnia długość nazwy
-        avg_name_length = sum(len(f.name) for f in files) / len(files) if files else 0
-        info_text += f"Średnia długość nazwy: {avg_name_length:.1f} znaków\n\n"
+        info_text += f"Średnia długość nazwy: {summary.mean_name_length:.1f} znaków\n\n"
 
         # Lista kilku przykładowych plików
         info_text += "Przykładowe pliki:\n"
-        for i, file_info in enumerate(files[:5], 1):
+        for i, file_info in enumerate(islice(files, 5), 1):
             info_text += f"{i}. {file_info.name}{file_info.extension}\n"
 
         if len(files) > 5:
@@ -707,46 +698,71 @@ class EnhancedFileGroupVisualizer:
         self.group_info_text.delete('1.0', tk.END)
         self.group_info_text.insert('1.0', info_text)
 
-    def _show_group_analysis(self, group_name, files):
-        """Pokazuje analizę grupy"""
+    def _show_group_analysis(self, group_name, files, summary):
+        """Pokazuje analizę grupy (ze statystyk policzonych przy grupowaniu)"""
         analysis_text = f"ANALIZA GRUPY: {group_name}\n"
         analysis_text += "=" * 50 + "\n\n"
 
-        # Analiza nazw plików
-        analysis_text += "Analiza nazw:\n"
-        file_names = [f.name for f in files]
-
         # Statystyki długości nazw
-        name_lengths = [len(name) for name in file_names]
-        analysis_text += f"• Długość nazw: min={min(name_lengths)}, max={max(name_lengths)}, śr={sum(name_lengths) / len(name_lengths):.1f}\n"
+        analysis_text += "Analiza nazw:\n"
+        analysis_text += (f"• Długość nazw: min={summary.min_name_length}, max={summary.max_name_length}, "
+                          f"śr={summary.mean_name_length:.1f}\n")
 
         # Analiza rozszerzeń
         analysis_text += f"\nAnaliza rozszerzeń:\n"
-        extensions = Counter(f.extension.lower() for f in files)
-        for ext, count in extensions.most_common():
-            percentage = (count / len(files)) * 100
+        for ext, count in summary.extensions:
+            percentage = (count / summary.count) * 100
             analysis_text += f"• {ext or '(brak)'}: {count} plików ({percentage:.1f}%)\n"
 
         # Analiza rozmiarów
         analysis_text += f"\nAnaliza rozmiarów:\n"
-        sizes = [f.file_size for f in files]
-        total_size = sum(sizes)
-        avg_size = total_size / len(sizes) if sizes else 0
-        analysis_text += f"• Łączny rozmiar: {format_size(total_size)}\n"
-        analysis_text += f"• Średni rozmiar: {format_size(avg_size)}\n"
-        analysis_text += f"• Zakres: {format_size(min(sizes))} - {format_size(max(sizes))}\n"
+        analysis_text += f"• Łączny rozmiar: {format_size(summary.total_size)}\n"
+        analysis_text += f"• Średni rozmiar: {format_size(summary.mean_size)}\n"
+        analysis_text += f"• Zakres: {format_size(summary.min_size)} - {format_size(summary.max_size)}\n"
+        percentiles = ", ".join(f"p{percent}={format_size(value)}" for percent, value in summary.size_percentiles)
+        analysis_text += f"• Percentyle: {percentiles}\n"
 
         # Rekomendacje
         analysis_text += f"\nRekomendacje:\n"
-        if len(files) > 10:
+        if summary.count > 10:
             analysis_text += "• Duża grupa - można podzielić na podgrupy\n"
-        if len(set(f.extension for f in files)) == 1:
+        if len(summary.extensions) == 1:
             analysis_text += "• Wszystkie pliki mają to samo rozszerzenie\n"
-        if total_size > 100 * 1024 * 1024:  # 100MB
+        if summary.total_size > 100 * 1024 * 1024:  # 100MB
             analysis_text += "• Duży łączny rozmiar - sprawdź czy wszystkie pliki są potrzebne\n"
 
         self.analysis_text.insert('1.0', analysis_text)
 
+    def _load_details(self):
+        """Wypełnia tabelę szczegółów plikami grupy w bieżącym porządku sortowania"""
+        files = self._details_files
+        if self.details_headings.column is not None:
+            files = sort_rows(files, self.details_headings.column, self.details_headings.descending)
+        # Wstawianie porcjami - pierwsze wiersze od razu, okno nie zamarza przy dużych grupach
+        self._details_loader.start(files, self._insert_detail_row)
+
+    def _sort_details(self, column, descending):
+        """Sortuje pliki wyświetlanej grupy po kliknięciu nagłówka"""
+        self._clear_details()
+        self._load_details()
+
+    def _insert_detail_row(self, file_info):
+        """Wstawia plik do tabeli szczegółów grupy"""
+        self.details_tree.insert("", "end", values=(
+            file_info.name,
+            file_info.extension,
+            format_size(file_info.file_size),
+            file_info.creation_date,
+            file_info.status
+        ))
+
+    def _clear_details(self):
+        """Przerywa wczytywanie poprzedniej grupy i czyści tabelę szczegółów"""
+        self._details_loader.cancel()
+        children = self.details_tree.get_children()
+        if children:
+            self.details_tree.delete(*children)
+
     def _update_stats(self, method_info=""):
         """Aktualizacja statystyk"""
         total_files = len(self.files_info)
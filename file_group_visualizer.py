@@ -1,8 +1,8 @@
 # file_group_visualizer.py
 import tkinter as tk
 from tkinter import ttk
-import os
-from collections import defaultdict, Counter
+from group_engine import shared_file_table
+from table_widgets import ChunkedLoader, SortableHeadings, sort_rows
 
 
 def format_size(size_in_bytes):
@@ -105,10 +105,11 @@ class FileGroupVisualizer:
         self.details_columns = ("Nazwa", "Rozszerzenie", "Rozmiar", "Data utworzenia", "Status")
         self.details_tree = ttk.Treeview(self.details_frame, columns=self.details_columns, show="headings")
 
-        # Nagłówki kolumn
+        # Nagłówki kolumn - kliknięcie sortuje pliki grupy
         for col in self.details_columns:
-            self.details_tree.heading(col, text=col)
             self.details_tree.column(col, width=150)
+        self.details_headings = SortableHeadings(self.details_tree, self.details_columns, self._sort_details)
+        self._details_files = []
 
         # Pasek przewijania dla tabeli szczegółów
         details_scrollbar_y = ttk.Scrollbar(self.details_frame, orient="vertical", command=self.details_tree.yview)
@@ -119,6 +120,7 @@ class FileGroupVisualizer:
         details_scrollbar_y.pack(side="right", fill="y")
         details_scrollbar_x.pack(side="bottom", fill="x")
         self.details_tree.pack(fill="both", expand=True, padx=5, pady=5)
+        self._details_loader = ChunkedLoader(self.details_tree)
 
         # Panel statystyk
         self.stats_frame = ttk.LabelFrame(self.main_frame, text="Statystyki grupowania")
@@ -186,90 +188,45 @@ class FileGroupVisualizer:
         self._update_stats(method_info)
 
         # Czyszczenie tabeli szczegółów
-        for i in self.details_tree.get_children():
-            self.details_tree.delete(i)
+        self._clear_details()
 
     def _group_by_extension(self):
         """Grupuje pliki według prostego rozszerzenia"""
-        result = defaultdict(list)
-        for file_info in self.files_info:
-            ext = file_info.extension.lower() if file_info.extension else "(brak rozszerzenia)"
-            result[ext].append(file_info)
-        return result
+        return shared_file_table(self.files_info).groups('extension', "(brak rozszerzenia)")
 
     def _group_by_file_type(self):
         """Grupuje pliki według kategorii typu pliku"""
-        result = defaultdict(list)
-        for file_info in self.files_info:
-            file_type = file_info.category_extension
-            result[file_type].append(file_info)
-        return result
+        return shared_file_table(self.files_info).groups('type')
 
     def _group_by_name_words(self):
         """Grupuje pliki według słów występujących w nazwach"""
-        result = defaultdict(list)
-
         # Zdefiniuj prawdziwe wzorce nazw
-        name_patterns = [
+        name_patterns = {
             'faktura', 'cv_resume', 'raport', 'backup', 'notatka', 'projekt',
             'dokumentacja', 'konfiguracja', 'prezentacja', 'umowa', 'oferta',
             'ankieta', 'zdjęcia', 'muzyka', 'wideo', 'szkic', 'książka', 'list',
             'prywatne', 'praca', 'szkoła', 'wydarzenie'
-        ]
-
-        for file_info in self.files_info:
-            file_added_to_group = False
-
-            if file_info.category_name:
-                for category in file_info.category_name:
-                    # Tylko prawdziwe wzorce nazw, nie sztuczne grupy
-                    if (len(category) > 2 and
-                            not category.startswith("słowo_") and
-                            category in name_patterns):
-                        result[category].append(file_info)
-                        file_added_to_group = True
-                        break
-
-            if not file_added_to_group:
-                result["Inne"].append(file_info)
+        }
 
-        return result
+        # Tylko prawdziwe wzorce nazw, nie sztuczne grupy - pierwsza pasująca kategoria pliku
+        return shared_file_table(self.files_info).first_name_category_groups(
+            lambda category: (len(category) > 2 and
+                              not category.startswith("słowo_") and
+                              category in name_patterns),
+            "Inne"
+        )
 
     def _group_by_size(self):
         """Grupuje pliki według rozmiaru"""
-        result = defaultdict(list)
-        for file_info in self.files_info:
-            size_category = file_info.size_category
-            result[size_category].append(file_info)
-        return result
+        return shared_file_table(self.files_info).groups('size')
 
     def _group_by_date(self):
         """Grupuje pliki według daty"""
-        result = defaultdict(list)
-        for file_info in self.files_info:
-            date_category = file_info.date_category
-            result[date_category].append(file_info)
-        return result
+        return shared_file_table(self.files_info).groups('date')
 
     def _group_all_categories(self):
         """Grupuje według wszystkich kategorii razem"""
-        result = defaultdict(list)
-
-        for file_info in self.files_info:
-            # Dodaj grupę według rozszerzenia
-            ext = file_info.extension.lower() if file_info.extension else "(brak)"
-            result[f"Rozszerzenie: {ext}"].append(file_info)
-
-            # Dodaj grupę według typu pliku
-            result[f"Typ: {file_info.category_extension}"].append(file_info)
-
-            # Dodaj grupę według rozmiaru
-            result[f"Rozmiar: {file_info.size_category}"].append(file_info)
-
-            # Dodaj grupę według daty
-            result[f"Wiek: {file_info.date_category}"].append(file_info)
-
-        return result
+        return shared_file_table(self.files_info).all_categories_groups()
 
     def show_group_details(self, event):
         """Wyświetla szczegóły wybranej grupy"""
@@ -283,20 +240,43 @@ class FileGroupVisualizer:
         group_name = group_name_with_count.split(" (")[0]
 
         # Czyszczenie tabeli
-        for i in self.details_tree.get_children():
-            self.details_tree.delete(i)
+        self._clear_details()
 
         # Dodanie plików z grupy
         if group_name in self.current_groups:
             files = self.current_groups[group_name]
-            for file_info in files:
-                self.details_tree.insert("", "end", values=(
-                    file_info.name,
-                    file_info.extension,
-                    format_size(file_info.file_size),
-                    file_info.creation_date,
-                    file_info.status
-                ))
+            self._details_files = files
+            self._load_details()
+
+    def _load_details(self):
+        """Wypełnia tabelę szczegółów plikami grupy w bieżącym porządku sortowania"""
+        files = self._details_files
+        if self.details_headings.column is not None:
+            files = sort_rows(files, self.details_headings.column, self.details_headings.descending)
+        # Wstawianie porcjami - pierwsze wiersze od razu, okno nie zamarza przy dużych grupach
+        self._details_loader.start(files, self._insert_detail_row)
+
+    def _sort_details(self, column, descending):
+        """Sortuje pliki wyświetlanej grupy po kliknięciu nagłówka"""
+        self._clear_details()
+        self._load_details()
+
+    def _insert_detail_row(self, file_info):
+        """Wstawia plik do tabeli szczegółów grupy"""
+        self.details_tree.insert("", "end", values=(
+            file_info.name,
+            file_info.extension,
+            format_size(file_info.file_size),
+            file_info.creation_date,
+            file_info.status
+        ))
+
+    def _clear_details(self):
+        """Przerywa wczytywanie poprzedniej grupy i czyści tabelę szczegółów"""
+        self._details_loader.cancel()
+        children = self.details_tree.get_children()
+        if children:
+            self.details_tree.delete(*children)
 
     def _update_stats(self, method_info=""):
         """Aktualizuje statystyki grupowania"""
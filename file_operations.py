@@ -104,6 +104,7 @@ def move_files(files, destination):
     files_info = []
 
     for file_path in files:
+        creation_time = modification_time = None
         try:
             # Podstawowe informacje o pliku
             file_name = os.path.basename(file_path)
@@ -141,6 +142,8 @@ def move_files(files, destination):
                 file_stats = os.stat(file_path)
                 creation_date = format_datetime(file_stats.st_ctime)
                 modification_date = format_datetime(file_stats.st_mtime)
+                creation_time = file_stats.st_ctime
+                modification_time = file_stats.st_mtime
 
                 print(f"Data utworzenia: {creation_date}")
                 print(f"Data modyfikacji: {modification_date}")
@@ -210,7 +213,8 @@ def move_files(files, destination):
                         mime_type, file_signature, keywords, headers_info,
                         category_extension, category_name, suggested_locations,
                         size_category, date_category, subject_categories,
-                        time_pattern_categories, all_categories
+                        time_pattern_categories, all_categories,
+                        creation_time=creation_time, modification_time=modification_time
                     )
                     files_info.append(file_info_skip)
                     continue
@@ -221,7 +225,8 @@ def move_files(files, destination):
             print(f"Plik pomyślnie przeniesiony")
 
             # Aktualny czas przeniesienia
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            operation_time = time.time()
+            current_time = datetime.fromtimestamp(operation_time).strftime("%Y-%m-%d %H:%M:%S")
             print(f"Czas operacji: {current_time}")
 
             # Tworzenie obiektu FileInfo
@@ -239,11 +244,13 @@ def move_files(files, destination):
                 mime_type, file_signature, keywords, headers_info,
                 category_extension, category_name, suggested_locations,
                 size_category, date_category, subject_categories,
-                time_pattern_categories, all_categories
+                time_pattern_categories, all_categories,
+                creation_time=creation_time, modification_time=modification_time
             )
 
             # Ustawienie czasu operacji (timestamp) na aktualny czas
             file_info.timestamp = current_time
+            file_info.operation_time = operation_time  # ten sam moment - klucz sortowania "Czas operacji"
             print(f"DEBUG: Final size category for {file_name}: {file_info.size_category}")
 
             # Sprawdźmy, czy file_size został poprawnie zapisany w obiekcie
@@ -265,6 +272,7 @@ def move_files(files, destination):
             try:
                 # Próba odczytu rozmiaru pliku nawet w przypadku błędu
                 file_size = 0
+                creation_time = modification_time = None
                 if os.path.exists(file_path):
                     try:
                         file_size = FileSizeReader.get_file_size(file_path)
@@ -279,6 +287,8 @@ def move_files(files, destination):
                     file_stats = os.stat(file_path)
                     creation_date = format_datetime(file_stats.st_ctime)
                     modification_date = format_datetime(file_stats.st_mtime)
+                    creation_time = file_stats.st_ctime
+                    modification_time = file_stats.st_mtime
                     attributes = get_file_attributes(file_path)
                 else:
                     print(f"Plik {file_path} nie istnieje podczas obsługi błędu.")
@@ -335,7 +345,8 @@ def move_files(files, destination):
                 all_categories = []
 
             # Aktualny czas błędu
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            operation_time = time.time()
+            current_time = datetime.fromtimestamp(operation_time).strftime("%Y-%m-%d %H:%M:%S")
 
             print(f"Tworzenie obiektu FileInfo dla błędu, rozmiar: {file_size} typu {type(file_size)}")
 
@@ -349,11 +360,13 @@ def move_files(files, destination):
                 mime_type, file_signature, keywords, headers_info,
                 category_extension, category_name, suggested_locations,
                 size_category, date_category, subject_categories,
-                time_pattern_categories, all_categories
+                time_pattern_categories, all_categories,
+                creation_time=creation_time, modification_time=modification_time
             )
 
             # Ustawienie czasu operacji (timestamp) na aktualny czas
             error_file_info.timestamp = current_time
+            error_file_info.operation_time = operation_time
 
             # Sprawdźmy, czy file_size został poprawnie zapisany w obiekcie błędu
             print(f"Zapisany w FileInfo (błąd) rozmiar: {error_file_info.file_size} typu {type(error_file_info.file_size)}")
@@ -361,6 +374,9 @@ def move_files(files, destination):
             files_info.append(error_file_info)
             print(f"Dodano informację o błędzie pliku do listy wyników")
 
+    # Zapisz wzorce nauczone w tym przebiegu
+    category_analyzer.flush()
+
     print(f"\n=== Podsumowanie operacji ===")
     print(f"Przetworzono plików: {len(files_info)}")
     for idx, fi in enumerate(files_info):
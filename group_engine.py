@@ -0,0 +1,333 @@
+# group_engine.py
+import math
+import threading
+from collections import Counter
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Klucze grupowania z jedną wartością na plik (kolumny tabeli)
+GROUP_KEYS = ('extension', 'type', 'size', 'date')
+# Prefiksy grup w widoku "wszystkie kategorie"
+ALL_CATEGORIES_PREFIXES = (
+    ('extension', "Rozszerzenie: "),
+    ('type', "Typ: "),
+    ('size', "Rozmiar: "),
+    ('date', "Wiek: "),
+)
+SIZE_PERCENTILES = (25, 50, 75, 90)
+
+
+def _split_by_code(rows, codes, count):
+    """Dzieli wiersze na grupy według kodów - lista tablic indeksów dla kodów 0..count-1.
+
+    Sortowanie stabilne zachowuje kolejność plików w każdej grupie.
+    """
+    if np is not None:
+        rows = np.asarray(rows, dtype=np.int64)
+        codes = np.asarray(codes, dtype=np.int64)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(count + 1))
+        sorted_rows = rows[order]
+        return [sorted_rows[bounds[code]:bounds[code + 1]] for code in range(count)]
+
+    buckets = [[] for _ in range(count)]
+    for row, code in zip(rows, codes):
+        buckets[code].append(row)
+    return buckets
+
+
+class GroupedFiles(Sequence):
+    """Pliki grupy jako widok na wspólną listę plików przez tablicę indeksów (bez kopiowania)"""
+
+    __slots__ = ('_files', 'indices')
+
+    def __init__(self, files, indices):
+        self._files = files
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._files[i] for i in self.indices[item]]
+        return self._files[self.indices[item]]
+
+    def __iter__(self):
+        files = self._files
+        for i in self.indices:
+            yield files[i]
+
+
+def _percentile(sorted_values, percent):
+    """Percentyl z interpolacją liniową (jak domyślnie w NumPy)"""
+    rank = percent / 100 * (len(sorted_values) - 1)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class GroupSummary:
+    """Statystyki grupy liczone raz na grupowanie: rozmiary, długości nazw, histogram rozszerzeń.
+
+    extensions - lista (rozszerzenie, liczba plików) od najczęstszego (remis - kolejność
+    pierwszego wystąpienia w grupie, jak Counter.most_common).
+    """
+
+    __slots__ = ('count', 'total_size', 'mean_size', 'min_size', 'max_size', 'size_percentiles',
+                 'min_name_length', 'max_name_length', 'mean_name_length', 'extensions')
+
+    def __init__(self, sizes, name_lengths, extension_codes, extension_labels):
+        self.count = len(sizes)
+        self.extensions = []
+        if not self.count:
+            self.total_size = self.min_size = self.max_size = 0
+            self.mean_size = 0.0
+            self.size_percentiles = tuple((percent, 0.0) for percent in SIZE_PERCENTILES)
+            self.min_name_length = self.max_name_length = 0
+            self.mean_name_length = 0.0
+            return
+
+        if np is not None:
+            sizes = np.asarray(sizes, dtype=np.int64)
+            name_lengths = np.asarray(name_lengths, dtype=np.int64)
+            self.total_size = int(sizes.sum())
+            self.min_size = int(sizes.min())
+            self.max_size = int(sizes.max())
+            self.size_percentiles = tuple(zip(SIZE_PERCENTILES, np.percentile(sizes, SIZE_PERCENTILES).tolist()))
+            self.min_name_length = int(name_lengths.min())
+            self.max_name_length = int(name_lengths.max())
+            self.mean_name_length = float(name_lengths.mean())
+
+            codes, first_rows, counts = np.unique(np.asarray(extension_codes, dtype=np.int64),
+                                                  return_index=True, return_counts=True)
+            order = np.lexsort((first_rows, -counts))
+            self.extensions = [(extension_labels[code], count)
+                               for code, count in zip(codes[order].tolist(), counts[order].tolist())]
+        else:
+            ordered = sorted(sizes)
+            self.total_size = sum(ordered)
+            self.min_size = ordered[0]
+            self.max_size = ordered[-1]
+            self.size_percentiles = tuple((percent, float(_percentile(ordered, percent)))
+                                          for percent in SIZE_PERCENTILES)
+            self.min_name_length = min(name_lengths)
+            self.max_name_length = max(name_lengths)
+            self.mean_name_length = sum(name_lengths) / self.count
+            self.extensions = [(extension_labels[code], count)
+                               for code, count in Counter(extension_codes).most_common()]
+
+        self.mean_size = self.total_size / self.count
+
+    @property
+    def dominant_extension(self):
+        """(rozszerzenie, liczba plików) najczęstszego rozszerzenia lub ("brak", 0)"""
+        return self.extensions[0] if self.extensions else ("brak", 0)
+
+
+def summarize_files(files):
+    """Statystyki dowolnej kolekcji plików (grupy spoza tabeli plików)"""
+    extension_map = {}
+    extension_codes = []
+    sizes = []
+    name_lengths = []
+    for file_info in files:
+        extension = file_info.extension.lower() if file_info.extension else ''
+        extension_codes.append(extension_map.setdefault(extension, len(extension_map)))
+        sizes.append(file_info.file_size)
+        name_lengths.append(len(file_info.name))
+    return GroupSummary(sizes, name_lengths, extension_codes, list(extension_map))
+
+
+def group_summaries(groups, table=None):
+    """Statystyki wszystkich grup: nazwa -> GroupSummary. Widoki tabeli liczone są na jej kolumnach"""
+    summaries = {}
+    for group_name, files in groups.items():
+        if table is not None and isinstance(files, GroupedFiles) and files._files is table.files:
+            summaries[group_name] = table.summarize(files.indices)
+        else:
+            summaries[group_name] = summarize_files(files)
+    return summaries
+
+
+class FileTable:
+    """Kolumnowa tabela plików do grupowania.
+
+    Jedno przejście po obiektach FileInfo koduje kolumny kategorii słownikowo (wartość -> kod
+    w kolejności pierwszego wystąpienia). Grupowanie po kolumnie to potem stabilne sortowanie
+    kodów - wynikiem są tablice indeksów, liczone raz na klucz i współdzielone przez widoki.
+    """
+
+    def __init__(self, files_info):
+        self.files = list(files_info)
+        self._labels = {}
+        self._codes = {}
+        self._groups = {}
+        self._summary_columns = None
+        self._lock = threading.Lock()
+
+        mappings = {key: {} for key in GROUP_KEYS}
+        codes = {key: [] for key in GROUP_KEYS}
+        extension_map, type_map, size_map, date_map = (mappings[key] for key in GROUP_KEYS)
+        extension_codes, type_codes, size_codes, date_codes = (codes[key] for key in GROUP_KEYS)
+
+        # Kategorie nazw (wiele na plik) w formacie CSR: pary (wiersz, kod kategorii)
+        name_map = {}
+        name_rows = []
+        name_codes = []
+        self.name_category_counts = []
+        self.file_sizes = []
+        self.name_lengths = []
+
+        for row, file_info in enumerate(self.files):
+            extension = file_info.extension.lower() if file_info.extension else ''
+            extension_codes.append(extension_map.setdefault(extension, len(extension_map)))
+            type_codes.append(type_map.setdefault(file_info.category_extension, len(type_map)))
+            size_codes.append(size_map.setdefault(file_info.size_category, len(size_map)))
+            date_codes.append(date_map.setdefault(file_info.date_category, len(date_map)))
+
+            categories = file_info.category_name or ()
+            for category in categories:
+                name_rows.append(row)
+                name_codes.append(name_map.setdefault(category, len(name_map)))
+            self.name_category_counts.append(len(categories))
+
+            self.file_sizes.append(file_info.file_size)
+            self.name_lengths.append(len(file_info.name))
+
+        for key in GROUP_KEYS:
+            self._labels[key] = list(mappings[key])
+            self._codes[key] = codes[key]
+        self._labels['name'] = list(name_map)
+        self._name_rows = name_rows
+        self._name_codes = name_codes
+
+    def __len__(self):
+        return len(self.files)
+
+    def group_indices(self, key):
+        """Słownik etykieta -> tablica indeksów plików dla klucza ('extension', 'type', 'size',
+        'date' lub 'name' - kategorie nazw, plik trafia do każdej swojej kategorii)"""
+        with self._lock:
+            groups = self._groups.get(key)
+            if groups is None:
+                labels = self._labels[key]
+                if key == 'name':
+                    buckets = _split_by_code(self._name_rows, self._name_codes, len(labels))
+                else:
+                    buckets = _split_by_code(range(len(self.files)), self._codes[key], len(labels))
+                groups = dict(zip(labels, buckets))
+                self._groups[key] = groups
+            return groups
+
+    def summarize(self, indices):
+        """Statystyki plików o podanych indeksach (GroupSummary) z kolumn tabeli"""
+        extension_labels = self._labels['extension']
+        if np is None:
+            extension_codes = self._codes['extension']
+            return GroupSummary([self.file_sizes[i] for i in indices], [self.name_lengths[i] for i in indices],
+                                [extension_codes[i] for i in indices], extension_labels)
+
+        with self._lock:
+            if self._summary_columns is None:
+                self._summary_columns = (np.asarray(self.file_sizes, dtype=np.int64),
+                                         np.asarray(self.name_lengths, dtype=np.int64),
+                                         np.asarray(self._codes['extension'], dtype=np.int64))
+            sizes, name_lengths, extension_codes = self._summary_columns
+        indices = np.asarray(indices, dtype=np.int64)
+        return GroupSummary(sizes[indices], name_lengths[indices], extension_codes[indices], extension_labels)
+
+    def files_at(self, indices):
+        """Widok plików o podanych indeksach"""
+        return GroupedFiles(self.files, indices)
+
+    def groups(self, key, empty_label=None, prefix=''):
+        """Grupy klucza jako słownik nazwa -> widok plików (pusta wartość jako empty_label)"""
+        result = {}
+        for label, indices in self.group_indices(key).items():
+            if not label and empty_label is not None:
+                label = empty_label
+            result[f"{prefix}{label}"] = GroupedFiles(self.files, indices)
+        return result
+
+    def group_by(self, keys, empty_labels=None):
+        """Grupowanie według kilku kluczy naraz: klucz -> (nazwa grupy -> widok plików)"""
+        empty_labels = empty_labels or {}
+        return {key: self.groups(key, empty_labels.get(key)) for key in keys}
+
+    def all_categories_groups(self, empty_extension_label="(brak)"):
+        """Grupy wszystkich kategorii razem, z prefiksami rodzaju kategorii"""
+        result = {}
+        for key, prefix in ALL_CATEGORIES_PREFIXES:
+            empty_label = empty_extension_label if key == 'extension' else None
+            result.update(self.groups(key, empty_label, prefix))
+        return result
+
+    def rows_without_name_categories(self):
+        """Indeksy plików bez żadnej kategorii nazwy"""
+        return [row for row, count in enumerate(self.name_category_counts) if not count]
+
+    def first_name_category_groups(self, accept, fallback_label):
+        """Grupuje pliki według pierwszej kategorii nazwy spełniającej accept(kategoria);
+        pliki bez takiej kategorii trafiają do grupy fallback_label"""
+        labels = self._labels['name']
+        accepted = [accept(label) for label in labels]
+
+        chosen = [None] * len(self.files)
+        for row, code in zip(self._name_rows, self._name_codes):
+            if chosen[row] is None and accepted[code]:
+                chosen[row] = code
+
+        fallback = len(labels)
+        codes = [fallback if code is None else code for code in chosen]
+        buckets = _split_by_code(range(len(self.files)), codes, len(labels) + 1)
+
+        result = {}
+        for label, indices in zip(labels + [fallback_label], buckets):
+            if len(indices):
+                result[label] = GroupedFiles(self.files, indices)
+        return result
+
+
+SHARED_TABLES_LIMIT = 4  # ile list plików (okien) trzyma pamięć podręczna tabel
+
+_shared_lock = threading.Lock()
+_shared_tables = {}  # id listy -> (lista plików, liczba plików, wersja, tabela), od najdawniej użytej
+
+
+def shared_file_table(files_info, version=None):
+    """Tabela plików współdzielona przez wszystkie widoki tej samej listy plików.
+
+    Budowana ponownie, gdy lista zmieni długość albo wersję - version podbija wywołujący
+    po zmianach w miejscu, które zachowują długość (podmiana elementów, zmiana kategorii).
+    version=None przyjmuje tabelę dowolnej wersji, więc widoki bez własnego licznika zmian
+    korzystają z tabeli zbudowanej dla okna, które go prowadzi, zamiast ją wypierać.
+    Pamiętanych jest kilka ostatnich list, więc okna z różnymi listami nie wypierają się nawzajem.
+    """
+    key = id(files_info)
+    with _shared_lock:
+        entry = _shared_tables.get(key)
+        if _shared_entry_valid(entry, files_info, version):
+            _shared_tables[key] = _shared_tables.pop(key)
+            return entry[3]
+
+    # Budowa poza blokadą - wyszukiwanie z innego wątku (np. wątku Tk) nie czeka na nią
+    table = FileTable(files_info)
+    with _shared_lock:
+        entry = _shared_tables.pop(key, None)
+        if not _shared_entry_valid(entry, files_info, version):
+            entry = (files_info, len(files_info), version, table)
+        _shared_tables[key] = entry
+        while len(_shared_tables) > SHARED_TABLES_LIMIT:
+            del _shared_tables[next(iter(_shared_tables))]
+        return entry[3]
+
+
+def _shared_entry_valid(entry, files_info, version):
+    """Czy zapamiętana tabela odpowiada liście plików (i wersji, o ile ją podano)"""
+    return (entry is not None and entry[0] is files_info and entry[1] == len(files_info)
+            and (version is None or entry[2] == version))
@@ -6,6 +6,8 @@ import traceback
 
 # Importuj funkcję formatowania rozmiaru
 from file_size_reader import FileSizeReader
+from group_engine import shared_file_table
+from table_widgets import VirtualTable, LazyGroupTree, FILE_SORT_KEYS
 
 
 def format_size(size_in_bytes):
@@ -44,6 +46,126 @@ def setup_ui(root, start_moving_process):
     close_button.pack(pady=10)
 
 
+BASIC_COLUMNS = (
+    "Nazwa", "Rozszerzenie", "Status", "Czas operacji",
+    "Rozmiar", "Data utworzenia", "Data modyfikacji", "Atrybuty"
+)
+ADVANCED_COLUMNS = (
+    "Nazwa", "Rozszerzenie", "Typ MIME", "Sygnatura pliku", "Słowa kluczowe", "Informacje o nagłówkach"
+)
+CATEGORY_COLUMNS = (
+    "Nazwa", "Rozszerzenie", "Typ pliku", "Kategoria rozmiaru", "Kategoria daty", "Kategorie z nazwy"
+)
+
+
+def basic_row_values(file_info):
+    """Wiersz tabeli podstawowych informacji"""
+    # Próba sformatowania rozmiaru
+    try:
+        formatted_size = format_size(file_info.file_size)
+    except Exception as size_error:
+        print(f"Błąd formatowania rozmiaru dla {file_info.name}: {size_error}")
+        formatted_size = "Błąd"
+
+    return (
+        file_info.name,
+        file_info.extension,
+        file_info.status,
+        file_info.timestamp,
+        formatted_size,
+        file_info.creation_date,
+        file_info.modification_date,
+        file_info.attributes
+    )
+
+
+def advanced_row_values(file_info):
+    """Wiersz tabeli zaawansowanych informacji"""
+    return (
+        file_info.name,
+        file_info.extension,
+        file_info.mime_type,
+        file_info.file_signature,
+        file_info.keywords,
+        file_info.headers_info
+    )
+
+
+def category_row_values(file_info):
+    """Wiersz tabeli kategorii"""
+    # Formatowanie listy kategorii z nazwy
+    try:
+        name_categories = ", ".join(file_info.category_name) if file_info.category_name else "Brak"
+    except Exception as cat_error:
+        print(f"Błąd formatowania kategorii z nazwy: {cat_error}")
+        name_categories = "Błąd"
+
+    return (
+        file_info.name,
+        file_info.extension,
+        file_info.category_extension,
+        file_info.size_category,
+        file_info.date_category,
+        name_categories
+    )
+
+
+def create_file_tables(files_info, basic_frame, advanced_frame, category_frame, height=10):
+    """Tworzy tabele podstawowych, zaawansowanych informacji i kategorii nad wspólną listą plików.
+
+    Wiersze są formatowane dopiero przy wyświetleniu, więc utworzenie tabel nie zależy od liczby plików.
+    """
+    basic_table = VirtualTable(
+        basic_frame, BASIC_COLUMNS, files_info, basic_row_values, height=height, sort_keys=FILE_SORT_KEYS
+    )
+    basic_table.pack(fill="both", expand=True)
+
+    advanced_table = VirtualTable(
+        advanced_frame, ADVANCED_COLUMNS, files_info, advanced_row_values,
+        widths={col: 300 if col in ["Słowa kluczowe", "Informacje o nagłówkach"] else 150
+                for col in ADVANCED_COLUMNS},
+        height=height, sort_keys=FILE_SORT_KEYS
+    )
+    advanced_table.pack(fill="both", expand=True)
+
+    category_table = VirtualTable(
+        category_frame, CATEGORY_COLUMNS, files_info, category_row_values,
+        widths={col: 300 if col in ["Kategorie z nazwy"] else 150 for col in CATEGORY_COLUMNS},
+        height=height, sort_keys=FILE_SORT_KEYS
+    )
+    category_table.pack(fill="both", expand=True)
+
+    return basic_table, advanced_table, category_table
+
+
+def create_grouping_tree(files_info, grouping_frame, height=None):
+    """Tworzy drzewo grupowania z leniwym rozwijaniem (według rozszerzenia, typu, rozmiaru i daty)"""
+    try:
+        sections = [
+            (title, lambda key=key: create_simple_grouping(files_info)[key])
+            for title, key in (
+                ("Według rozszerzenia", 'extension'),
+                ("Według typu pliku", 'type'),
+                ("Według rozmiaru", 'size'),
+                ("Według daty", 'date'),
+            )
+        ]
+        group_tree = LazyGroupTree(
+            grouping_frame, sections,
+            file_label=lambda file: f"{file.name}{file.extension}",
+            height=height
+        )
+        group_tree.pack(fill="both", expand=True)
+        return group_tree
+    except Exception as e:
+        print(f"BŁĄD podczas tworzenia drzewa grup: {e}")
+        traceback.print_exc()
+        # Dodaj prostą etykietę w przypadku błędu
+        error_label = ttk.Label(grouping_frame, text="Nie udało się wygenerować grup")
+        error_label.pack()
+        return None
+
+
 def show_files_table_inline(files_info, category_analyzer, parent_frame):
     """Funkcja wyświetlająca tabelę z informacjami o przeniesionych plikach w podanej ramce"""
     print("\n=== Wyświetlanie tabeli plików w głównym oknie ===")
@@ -90,214 +212,12 @@ def show_files_table_inline(files_info, category_analyzer, parent_frame):
     grouping_frame = ttk.Frame(notebook)
     notebook.add(grouping_frame, text="Grupowanie")
 
-    # Utworzenie tabeli z podstawowymi informacjami
-    basic_columns = (
-        "Nazwa", "Rozszerzenie", "Status", "Czas operacji",
-        "Rozmiar", "Data utworzenia", "Data modyfikacji", "Atrybuty"
-    )
-    basic_tree = ttk.Treeview(basic_frame, columns=basic_columns, show="headings", height=10)
-
-    # Definicja nagłówków kolumn
-    for col in basic_columns:
-        basic_tree.heading(col, text=col)
-        basic_tree.column(col, width=120)
-
-    # Dodanie danych do tabeli podstawowych informacji
-    print("\nDodawanie danych do tabeli podstawowych informacji:")
-    for idx, file_info in enumerate(files_info):
-        try:
-            # Próba sformatowania rozmiaru
-            try:
-                formatted_size = format_size(file_info.file_size)
-            except Exception as size_error:
-                print(f"Błąd formatowania rozmiaru dla {file_info.name}: {size_error}")
-                formatted_size = "Błąd"
-
-            values = (
-                file_info.name,
-                file_info.extension,
-                file_info.status,
-                file_info.timestamp,
-                formatted_size,
-                file_info.creation_date,
-                file_info.modification_date,
-                file_info.attributes
-            )
-
-            basic_tree.insert("", "end", values=values)
-        except Exception as e:
-            print(f"BŁĄD podczas dodawania do tabeli: {e}")
-            traceback.print_exc()
-
-    # Dodanie paska przewijania dla podstawowej tabeli
-    basic_scrollbar_y = ttk.Scrollbar(basic_frame, orient="vertical", command=basic_tree.yview)
-    basic_scrollbar_x = ttk.Scrollbar(basic_frame, orient="horizontal", command=basic_tree.xview)
-    basic_tree.configure(yscrollcommand=basic_scrollbar_y.set, xscrollcommand=basic_scrollbar_x.set)
-    basic_scrollbar_y.pack(side="right", fill="y")
-    basic_scrollbar_x.pack(side="bottom", fill="x")
-    basic_tree.pack(fill="both", expand=True)
-
-    # Utworzenie tabeli z zaawansowanymi informacjami
-    advanced_columns = (
-        "Nazwa", "Rozszerzenie", "Typ MIME", "Sygnatura pliku", "Słowa kluczowe", "Informacje o nagłówkach"
-    )
-    advanced_tree = ttk.Treeview(advanced_frame, columns=advanced_columns, show="headings", height=10)
-
-    # Definicja nagłówków kolumn dla zaawansowanych informacji
-    for col in advanced_columns:
-        advanced_tree.heading(col, text=col)
-        if col in ["Słowa kluczowe", "Informacje o nagłówkach"]:
-            advanced_tree.column(col, width=300)
-        else:
-            advanced_tree.column(col, width=150)
-
-    # Dodanie danych do tabeli zaawansowanych informacji
-    for idx, file_info in enumerate(files_info):
-        try:
-            values = (
-                file_info.name,
-                file_info.extension,
-                file_info.mime_type,
-                file_info.file_signature,
-                file_info.keywords,
-                file_info.headers_info
-            )
-            advanced_tree.insert("", "end", values=values)
-        except Exception as e:
-            print(f"BŁĄD podczas dodawania do tabeli zaawansowanej: {e}")
-            traceback.print_exc()
-
-    # Dodanie paska przewijania dla zaawansowanej tabeli
-    advanced_scrollbar_y = ttk.Scrollbar(advanced_frame, orient="vertical", command=advanced_tree.yview)
-    advanced_scrollbar_x = ttk.Scrollbar(advanced_frame, orient="horizontal", command=advanced_tree.xview)
-    advanced_tree.configure(yscrollcommand=advanced_scrollbar_y.set, xscrollcommand=advanced_scrollbar_x.set)
-    advanced_scrollbar_y.pack(side="right", fill="y")
-    advanced_scrollbar_x.pack(side="bottom", fill="x")
-    advanced_tree.pack(fill="both", expand=True)
-
-    # Utworzenie tabeli z informacjami o kategoriach
-    category_columns = (
-        "Nazwa", "Rozszerzenie", "Typ pliku", "Kategoria rozmiaru", "Kategoria daty", "Kategorie z nazwy"
-    )
-    category_tree = ttk.Treeview(category_frame, columns=category_columns, show="headings", height=10)
-
-    # Definicja nagłówków kolumn dla kategorii
-    for col in category_columns:
-        category_tree.heading(col, text=col)
-        if col in ["Kategorie z nazwy"]:
-            category_tree.column(col, width=300)
-        else:
-            category_tree.column(col, width=150)
-
-    # Dodanie danych do tabeli kategorii
-    for idx, file_info in enumerate(files_info):
-        try:
-            # Formatowanie listy kategorii z nazwy
-            try:
-                name_categories = ", ".join(file_info.category_name) if file_info.category_name else "Brak"
-            except Exception as cat_error:
-                print(f"Błąd formatowania kategorii z nazwy: {cat_error}")
-                name_categories = "Błąd"
-
-            values = (
-                file_info.name,
-                file_info.extension,
-                file_info.category_extension,
-                file_info.size_category,
-                file_info.date_category,
-                name_categories
-            )
-
-            category_tree.insert("", "end", values=values)
-        except Exception as e:
-            print(f"BŁĄD podczas dodawania do tabeli kategorii: {e}")
-            traceback.print_exc()
+    # Tabele plików z wirtualnym przewijaniem - Tk trzyma tylko widoczne wiersze
+    create_file_tables(files_info, basic_frame, advanced_frame, category_frame)
 
-    # Dodanie paska przewijania dla tabeli kategorii
-    category_scrollbar_y = ttk.Scrollbar(category_frame, orient="vertical", command=category_tree.yview)
-    category_scrollbar_x = ttk.Scrollbar(category_frame, orient="horizontal", command=category_tree.xview)
-    category_tree.configure(yscrollcommand=category_scrollbar_y.set, xscrollcommand=category_scrollbar_x.set)
-    category_scrollbar_y.pack(side="right", fill="y")
-    category_scrollbar_x.pack(side="bottom", fill="x")
-    category_tree.pack(fill="both", expand=True)
-
-    # Zakładka grupowania - uproszczona
+    # Zakładka grupowania - grupy i pliki wstawiane dopiero przy rozwinięciu węzła
     print("\nTworzenie zakładki grupowania...")
-
-    # Tworzenie prostego grupowania
-    try:
-        simple_groups = create_simple_grouping(files_info)
-
-        # Utworzenie widoku drzewa do wyświetlenia grup plików
-        group_tree = ttk.Treeview(grouping_frame, show="tree headings", height=10)
-        group_tree.heading("#0", text="Grupy plików")
-        group_tree.column("#0", width=400)
-
-        # Dodanie głównych kategorii grupowania
-        extension_node = group_tree.insert("", "end", text="Według rozszerzenia", open=True)
-        type_node = group_tree.insert("", "end", text="Według typu pliku", open=True)
-        size_node = group_tree.insert("", "end", text="Według rozmiaru", open=True)
-        date_node = group_tree.insert("", "end", text="Według daty", open=True)
-
-        # Pomocnicza funkcja do dodawania plików do grupy
-        def add_files_to_group(parent_node, category, files):
-            try:
-                group_node = group_tree.insert(parent_node, "end", text=f"{category} ({len(files)})", open=False)
-                for file in files[:10]:  # Pokaż tylko pierwsze 10 plików
-                    group_tree.insert(group_node, "end", text=f"{file.name}{file.extension}")
-                if len(files) > 10:
-                    group_tree.insert(group_node, "end", text=f"... i {len(files) - 10} więcej")
-            except Exception as group_error:
-                print(f"Błąd dodawania grupy: {group_error}")
-
-        # Wypełnianie drzewa dla każdej kategorii grupowania
-        print("Wypełnianie drzewa grupowania:")
-
-        # Według rozszerzenia
-        try:
-            for category, files in simple_groups['extension'].items():
-                add_files_to_group(extension_node, category, files)
-        except Exception as ext_error:
-            print(f"Błąd dodawania grup według rozszerzenia: {ext_error}")
-
-        # Według typu pliku
-        try:
-            for category, files in simple_groups['type'].items():
-                add_files_to_group(type_node, category, files)
-        except Exception as type_error:
-            print(f"Błąd dodawania grup według typu: {type_error}")
-
-        # Według rozmiaru
-        try:
-            for category, files in simple_groups['size'].items():
-                add_files_to_group(size_node, category, files)
-        except Exception as size_error:
-            print(f"Błąd dodawania grup według rozmiaru: {size_error}")
-
-        # Według daty
-        try:
-            for category, files in simple_groups['date'].items():
-                add_files_to_group(date_node, category, files)
-        except Exception as date_error:
-            print(f"Błąd dodawania grup według daty: {date_error}")
-
-    except Exception as e:
-        print(f"BŁĄD podczas tworzenia drzewa grup: {e}")
-        traceback.print_exc()
-        # Dodaj prostą etykietę w przypadku błędu
-        error_label = ttk.Label(grouping_frame, text="Nie udało się wygenerować grup")
-        error_label.pack()
-
-    # Dodanie paska przewijania dla drzewa grupowania
-    try:
-        group_scrollbar_y = ttk.Scrollbar(grouping_frame, orient="vertical", command=group_tree.yview)
-        group_scrollbar_x = ttk.Scrollbar(grouping_frame, orient="horizontal", command=group_tree.xview)
-        group_tree.configure(yscrollcommand=group_scrollbar_y.set, xscrollcommand=group_scrollbar_x.set)
-        group_scrollbar_y.pack(side="right", fill="y")
-        group_scrollbar_x.pack(side="bottom", fill="x")
-        group_tree.pack(fill="both", expand=True)
-    except:
-        print("Błąd podczas dodawania pasków przewijania")
+    create_grouping_tree(files_info, grouping_frame, height=10)
 
     # Ramka przycisków na dole
     buttons_frame = ttk.Frame(parent_frame)
@@ -361,214 +281,12 @@ def show_files_table(files_info, category_analyzer):
     grouping_frame = ttk.Frame(notebook)
     notebook.add(grouping_frame, text="Grupowanie")
 
-    # Utworzenie tabeli z podstawowymi informacjami
-    basic_columns = (
-        "Nazwa", "Rozszerzenie", "Status", "Czas operacji",
-        "Rozmiar", "Data utworzenia", "Data modyfikacji", "Atrybuty"
-    )
-    basic_tree = ttk.Treeview(basic_frame, columns=basic_columns, show="headings")
-
-    # Definicja nagłówków kolumn
-    for col in basic_columns:
-        basic_tree.heading(col, text=col)
-        basic_tree.column(col, width=120)
-
-    # Dodanie danych do tabeli podstawowych informacji
-    print("\nDodawanie danych do tabeli podstawowych informacji:")
-    for idx, file_info in enumerate(files_info):
-        try:
-            # Próba sformatowania rozmiaru
-            try:
-                formatted_size = format_size(file_info.file_size)
-            except Exception as size_error:
-                print(f"Błąd formatowania rozmiaru dla {file_info.name}: {size_error}")
-                formatted_size = "Błąd"
-
-            values = (
-                file_info.name,
-                file_info.extension,
-                file_info.status,
-                file_info.timestamp,
-                formatted_size,
-                file_info.creation_date,
-                file_info.modification_date,
-                file_info.attributes
-            )
-
-            basic_tree.insert("", "end", values=values)
-        except Exception as e:
-            print(f"BŁĄD podczas dodawania do tabeli: {e}")
-            traceback.print_exc()
-
-    # Dodanie paska przewijania dla podstawowej tabeli
-    basic_scrollbar_y = ttk.Scrollbar(basic_frame, orient="vertical", command=basic_tree.yview)
-    basic_scrollbar_x = ttk.Scrollbar(basic_frame, orient="horizontal", command=basic_tree.xview)
-    basic_tree.configure(yscrollcommand=basic_scrollbar_y.set, xscrollcommand=basic_scrollbar_x.set)
-    basic_scrollbar_y.pack(side="right", fill="y")
-    basic_scrollbar_x.pack(side="bottom", fill="x")
-    basic_tree.pack(fill="both", expand=True)
-
-    # Utworzenie tabeli z zaawansowanymi informacjami
-    advanced_columns = (
-        "Nazwa", "Rozszerzenie", "Typ MIME", "Sygnatura pliku", "Słowa kluczowe", "Informacje o nagłówkach"
-    )
-    advanced_tree = ttk.Treeview(advanced_frame, columns=advanced_columns, show="headings")
-
-    # Definicja nagłówków kolumn dla zaawansowanych informacji
-    for col in advanced_columns:
-        advanced_tree.heading(col, text=col)
-        if col in ["Słowa kluczowe", "Informacje o nagłówkach"]:
-            advanced_tree.column(col, width=300)
-        else:
-            advanced_tree.column(col, width=150)
-
-    # Dodanie danych do tabeli zaawansowanych informacji
-    for idx, file_info in enumerate(files_info):
-        try:
-            values = (
-                file_info.name,
-                file_info.extension,
-                file_info.mime_type,
-                file_info.file_signature,
-                file_info.keywords,
-                file_info.headers_info
-            )
-            advanced_tree.insert("", "end", values=values)
-        except Exception as e:
-            print(f"BŁĄD podczas dodawania do tabeli zaawansowanej: {e}")
-            traceback.print_exc()
-
-    # Dodanie paska przewijania dla zaawansowanej tabeli
-    advanced_scrollbar_y = ttk.Scrollbar(advanced_frame, orient="vertical", command=advanced_tree.yview)
-    advanced_scrollbar_x = ttk.Scrollbar(advanced_frame, orient="horizontal", command=advanced_tree.xview)
-    advanced_tree.configure(yscrollcommand=advanced_scrollbar_y.set, xscrollcommand=advanced_scrollbar_x.set)
-    advanced_scrollbar_y.pack(side="right", fill="y")
-    advanced_scrollbar_x.pack(side="bottom", fill="x")
-    advanced_tree.pack(fill="both", expand=True)
-
-    # Utworzenie tabeli z informacjami o kategoriach
-    category_columns = (
-        "Nazwa", "Rozszerzenie", "Typ pliku", "Kategoria rozmiaru", "Kategoria daty", "Kategorie z nazwy"
-    )
-    category_tree = ttk.Treeview(category_frame, columns=category_columns, show="headings")
-
-    # Definicja nagłówków kolumn dla kategorii
-    for col in category_columns:
-        category_tree.heading(col, text=col)
-        if col in ["Kategorie z nazwy"]:
-            category_tree.column(col, width=300)
-        else:
-            category_tree.column(col, width=150)
-
-    # Dodanie danych do tabeli kategorii
-    for idx, file_info in enumerate(files_info):
-        try:
-            # Formatowanie listy kategorii z nazwy
-            try:
-                name_categories = ", ".join(file_info.category_name) if file_info.category_name else "Brak"
-            except Exception as cat_error:
-                print(f"Błąd formatowania kategorii z nazwy: {cat_error}")
-                name_categories = "Błąd"
-
-            values = (
-                file_info.name,
-                file_info.extension,
-                file_info.category_extension,
-                file_info.size_category,
-                file_info.date_category,
-                name_categories
-            )
-
-            category_tree.insert("", "end", values=values)
-        except Exception as e:
-            print(f"BŁĄD podczas dodawania do tabeli kategorii: {e}")
-            traceback.print_exc()
-
-    # Dodanie paska przewijania dla tabeli kategorii
-    category_scrollbar_y = ttk.Scrollbar(category_frame, orient="vertical", command=category_tree.yview)
-    category_scrollbar_x = ttk.Scrollbar(category_frame, orient="horizontal", command=category_tree.xview)
-    category_tree.configure(yscrollcommand=category_scrollbar_y.set, xscrollcommand=category_scrollbar_x.set)
-    category_scrollbar_y.pack(side="right", fill="y")
-    category_scrollbar_x.pack(side="bottom", fill="x")
-    category_tree.pack(fill="both", expand=True)
+    # Tabele plików z wirtualnym przewijaniem - Tk trzyma tylko widoczne wiersze
+    create_file_tables(files_info, basic_frame, advanced_frame, category_frame)
 
-    # Zakładka grupowania - uproszczona
+    # Zakładka grupowania - grupy i pliki wstawiane dopiero przy rozwinięciu węzła
     print("\nTworzenie zakładki grupowania...")
-
-    # Tworzenie prostego grupowania
-    try:
-        simple_groups = create_simple_grouping(files_info)
-
-        # Utworzenie widoku drzewa do wyświetlenia grup plików
-        group_tree = ttk.Treeview(grouping_frame, show="tree headings")
-        group_tree.heading("#0", text="Grupy plików")
-        group_tree.column("#0", width=400)
-
-        # Dodanie głównych kategorii grupowania
-        extension_node = group_tree.insert("", "end", text="Według rozszerzenia", open=True)
-        type_node = group_tree.insert("", "end", text="Według typu pliku", open=True)
-        size_node = group_tree.insert("", "end", text="Według rozmiaru", open=True)
-        date_node = group_tree.insert("", "end", text="Według daty", open=True)
-
-        # Pomocnicza funkcja do dodawania plików do grupy
-        def add_files_to_group(parent_node, category, files):
-            try:
-                group_node = group_tree.insert(parent_node, "end", text=f"{category} ({len(files)})", open=False)
-                for file in files[:10]:  # Pokaż tylko pierwsze 10 plików
-                    group_tree.insert(group_node, "end", text=f"{file.name}{file.extension}")
-                if len(files) > 10:
-                    group_tree.insert(group_node, "end", text=f"... i {len(files) - 10} więcej")
-            except Exception as group_error:
-                print(f"Błąd dodawania grupy: {group_error}")
-
-        # Wypełnianie drzewa dla każdej kategorii grupowania
-        print("Wypełnianie drzewa grupowania:")
-
-        # Według rozszerzenia
-        try:
-            for category, files in simple_groups['extension'].items():
-                add_files_to_group(extension_node, category, files)
-        except Exception as ext_error:
-            print(f"Błąd dodawania grup według rozszerzenia: {ext_error}")
-
-        # Według typu pliku
-        try:
-            for category, files in simple_groups['type'].items():
-                add_files_to_group(type_node, category, files)
-        except Exception as type_error:
-            print(f"Błąd dodawania grup według typu: {type_error}")
-
-        # Według rozmiaru
-        try:
-            for category, files in simple_groups['size'].items():
-                add_files_to_group(size_node, category, files)
-        except Exception as size_error:
-            print(f"Błąd dodawania grup według rozmiaru: {size_error}")
-
-        # Według daty
-        try:
-            for category, files in simple_groups['date'].items():
-                add_files_to_group(date_node, category, files)
-        except Exception as date_error:
-            print(f"Błąd dodawania grup według daty: {date_error}")
-
-    except Exception as e:
-        print(f"BŁĄD podczas tworzenia drzewa grup: {e}")
-        traceback.print_exc()
-        # Dodaj prostą etykietę w przypadku błędu
-        error_label = ttk.Label(grouping_frame, text="Nie udało się wygenerować grup")
-        error_label.pack()
-
-    # Dodanie paska przewijania dla drzewa grupowania
-    try:
-        group_scrollbar_y = ttk.Scrollbar(grouping_frame, orient="vertical", command=group_tree.yview)
-        group_scrollbar_x = ttk.Scrollbar(grouping_frame, orient="horizontal", command=group_tree.xview)
-        group_tree.configure(yscrollcommand=group_scrollbar_y.set, xscrollcommand=group_scrollbar_x.set)
-        group_scrollbar_y.pack(side="right", fill="y")
-        group_scrollbar_x.pack(side="bottom", fill="x")
-        group_tree.pack(fill="both", expand=True)
-    except:
-        print("Błąd podczas dodawania pasków przewijania")
+    create_grouping_tree(files_info, grouping_frame)
 
     # Przycisk do eksportu danych
     export_button = tk.Button(
@@ -582,28 +300,8 @@ def show_files_table(files_info, category_analyzer):
 
 
 def create_simple_grouping(files_info):
-    """Tworzy proste grupowanie plików"""
-    from collections import defaultdict
-
-    groups = {
-        'extension': defaultdict(list),
-        'type': defaultdict(list),
-        'size': defaultdict(list),
-        'date': defaultdict(list)
-    }
-
-    for file_info in files_info:
-        # Według rozszerzenia
-        ext = file_info.extension.lower() if file_info.extension else "(brak)"
-        groups['extension'][ext].append(file_info)
-
-        # Według typu pliku
-        groups['type'][file_info.category_extension].append(file_info)
-
-        # Według rozmiaru
-        groups['size'][file_info.size_category].append(file_info)
-
-        # Według daty
-        groups['date'][file_info.date_category].append(file_info)
-
-    return groups
\ No newline at end of file
+    """Tworzy proste grupowanie plików - wspólna tabela grupowania wszystkich widoków"""
+    return shared_file_table(files_info).group_by(
+        ('extension', 'type', 'size', 'date'),
+        empty_labels={'extension': "(brak)"}
+    )
\ No newline at end of file
@@ -0,0 +1,50 @@
+# history_limits.py
+import time
+
+DAY = 86400
+
+
+def current_day(now=None):
+    """Zwraca numer dnia (dni od epoki) - ziarnistość znaczników ostatniego użycia"""
+    return int((time.time() if now is None else now) // DAY)
+
+
+def decay_factor(elapsed_seconds, half_life_days):
+    """Współczynnik zaniku wykładniczego dla upływu czasu i okresu połowicznego zaniku"""
+    if not half_life_days or elapsed_seconds <= 0:
+        return 1.0
+    return 0.5 ** (elapsed_seconds / (half_life_days * DAY))
+
+
+def decay_counter(counter, factor, drop_below=0.0):
+    """Mnoży liczniki przez współczynnik, usuwa te poniżej progu. Zwraca usunięte klucze"""
+    removed = []
+    for key, count in list(counter.items()):
+        value = round(count * factor, 3)
+        if value < drop_below:
+            del counter[key]
+            removed.append(key)
+        else:
+            counter[key] = value
+    return removed
+
+
+def display_count(count):
+    """Licznik do wyświetlenia i eksportu - po wygaszaniu liczniki są ułamkowe, na zewnątrz całkowite"""
+    return int(count + 0.5)
+
+
+def select_evictions(entries, max_entries, protected_count, slack=0.1):
+    """Wybiera klucze do usunięcia gdy liczba wpisów przekracza limit.
+
+    entries: lista krotek (klucz, liczba, dzień_ostatniego_użycia).
+    Najpierw usuwane są najdawniej używane wpisy z liczbą poniżej protected_count,
+    potem (jeśli trzeba) najdawniej używane pozostałe. Usuwa z zapasem (slack),
+    żeby sortowanie nie powtarzało się przy każdym nowym wpisie.
+    """
+    if len(entries) <= max_entries:
+        return []
+
+    target = int(max_entries * (1 - slack))
+    order = sorted(entries, key=lambda e: (e[1] >= protected_count, e[2], e[1]))
+    return [key for key, _, _ in order[:len(entries) - target]]
@@ -0,0 +1,100 @@
+# history_store.py
+import os
+import json
+import time
+import tempfile
+from contextlib import contextmanager
+
+# Blokady doradcze: fcntl na Linux/macOS, msvcrt na Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+@contextmanager
+def file_lock(path):
+    """Wyłączna blokada doradcza na pliku obok danych (path + '.lock').
+
+    Chroni sekwencję odczyt-scalenie-zapis przed innymi procesami korzystającymi
+    z tej samej historii. Sam plik danych nie jest blokowany - czytający bez blokady
+    zawsze widzą kompletny plik dzięki atomowej podmianie (atomic_write_json).
+    """
+    lock_file = open(path + '.lock', 'a+b')
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK ponawia tylko przez ~10 s - czekaj dalej
+                    time.sleep(0.05)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            lock_file.close()
+
+
+def _target_mode(path):
+    """Uprawnienia zapisywanego pliku: dotychczasowe albo domyślne dla nowego pliku (wg umask)"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_json(path, data, **dump_options):
+    """Zapisuje JSON do pliku tymczasowego w tym samym katalogu i podmienia go os.replace.
+
+    mkstemp tworzy plik tylko dla właściciela (0600) - przed podmianą dostaje on uprawnienia
+    pliku docelowego, żeby inne procesy nadal mogły czytać wspólną historię.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **dump_options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, _target_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_json(path):
+    """Wczytuje JSON z pliku lub zwraca None gdy plik nie istnieje"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def file_stamp(path):
+    """Znacznik wersji pliku - pozwala pominąć ponowny odczyt, gdy nikt inny go nie zmienił"""
+    try:
+        stats = os.stat(path)
+    except OSError:
+        return None
+    return stats.st_mtime_ns, stats.st_size, stats.st_ino
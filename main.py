@@ -6,6 +6,7 @@ import sys
 import traceback
 import threading
 import time
+import weakref
 
 # Upewniamy się, że katalog z naszymi modułami jest w ścieżce Pythona
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -37,6 +38,11 @@ except:
 from file_operations import select_files, select_destination, move_files
 from gui_components import create_main_window, show_files_table_inline
 from auto_folder_organizer import AutoFolderOrganizer
+from file_size_reader import FileSizeReader
+from progress_tracker import ProgressTracker, RateLimiter, UI_REFRESH_INTERVAL, format_duration
+from cancellation import CancellationToken, OperationCancelled
+
+CATEGORIZE_CHUNK_SIZE = 500  # pliki kategoryzowane w jednej partii - między partiami działa pauza i anulowanie
 
 # Próbujemy zaimportować rozszerzony wizualizer
 try:
@@ -53,14 +59,27 @@ except ImportError:
 
 
 class ProgressDialog:
-    """Klasa dla okna dialogowego postępu"""
+    """Klasa dla okna dialogowego postępu.
+
+    Z podaną liczbą plików pasek jest określony, a okno pokazuje tempo (pliki/s, bajty/s),
+    liczniki etapów i szacowany pozostały czas. Okno odświeżane jest najwyżej 10 razy
+    na sekundę, niezależnie od tego, jak często przychodzą aktualizacje.
+    Z tokenem (CancellationToken) okno ma przyciski wstrzymania i anulowania.
+    """
 
-    def __init__(self, parent, title="Analiza"):
+    def __init__(self, parent, title="Analiza", total_files=0, token=None, heading="Analiza w toku..."):
         self.window = tk.Toplevel(parent)
         self.window.title(title)
-        self.window.geometry("400x200")
+        self.window.geometry("420x280" if token is not None else "420x240")
         self.window.resizable(False, False)
         self.closed = False
+        self.token = token
+        self.heading = heading
+
+        self.tracker = ProgressTracker(total_files)
+        self._refresh_limiter = RateLimiter(UI_REFRESH_INTERVAL)
+        self._status = "Przygotowywanie analizy..."
+        self._details = ""
 
         # Wyśrodkuj okno
         self.window.transient(parent)
@@ -71,17 +90,20 @@ class ProgressDialog:
         main_frame.pack(fill="both", expand=True)
 
         # Etykieta tytułu
-        title_label = ttk.Label(main_frame, text="Analiza w toku...",
-                                font=("Arial", 12, "bold"))
-        title_label.pack(pady=(0, 10))
+        self.title_label = ttk.Label(main_frame, text=heading,
+                                     font=("Arial", 12, "bold"))
+        self.title_label.pack(pady=(0, 10))
 
-        # Pasek postępu
+        # Pasek postępu - nieokreślony do czasu podania liczby plików
         self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
         self.progress.pack(fill="x", pady=(0, 10))
-        self.progress.start()
+        if total_files:
+            self.start(total_files)
+        else:
+            self.progress.start()
 
         # Etykieta statusu
-        self.status_label = ttk.Label(main_frame, text="Przygotowywanie analizy...",
+        self.status_label = ttk.Label(main_frame, text=self._status,
                                       font=("Arial", 9))
         self.status_label.pack(pady=(0, 10))
 
@@ -91,16 +113,106 @@ class ProgressDialog:
                                        foreground="gray")
         self.details_label.pack()
 
+        # Tempo, pozostały czas i liczniki etapów
+        self.rate_label = ttk.Label(main_frame, text="", font=("Arial", 8))
+        self.rate_label.pack()
+        self.stages_label = ttk.Label(main_frame, text="", font=("Arial", 8), foreground="gray")
+        self.stages_label.pack()
+
+        # Wstrzymanie i anulowanie - operacja sprawdza token między plikami
+        if token is not None:
+            token.idle = self.pump
+            buttons_frame = ttk.Frame(main_frame)
+            buttons_frame.pack(pady=(10, 0))
+            self.pause_button = ttk.Button(buttons_frame, text="Wstrzymaj", command=self._toggle_pause)
+            self.pause_button.pack(side="left", padx=5)
+            self.cancel_button = ttk.Button(buttons_frame, text="Anuluj", command=self._cancel)
+            self.cancel_button.pack(side="left", padx=5)
+            self.window.protocol("WM_DELETE_WINDOW", self._cancel)
+
+    def start(self, total_files, total_bytes=0):
+        """Rozpoczyna przebieg o znanej liczbie plików - pasek określony"""
+        self.tracker.restart(total_files, total_bytes)
+        if self.closed:
+            return
+        try:
+            self.progress.stop()
+            self.progress.config(mode='determinate', maximum=max(total_files, 1), value=0)
+        except tk.TclError:
+            self.closed = True
+
     def update_status(self, status, details=""):
         """Aktualizuje status w oknie dialogowym"""
+        self._status = status
+        self._details = details
+        self._refresh()
+
+    def advance(self, stage=None, file_bytes=0, files=1):
+        """Rejestruje ukończone pliki (etap np. "przeanalizowane", "błędy") i ich rozmiar"""
+        self.tracker.advance(stage, file_bytes, files)
+        self._refresh()
+
+    def refresh(self):
+        """Odświeża okno natychmiast (np. przed dłuższą operacją bez aktualizacji)"""
+        self._refresh(force=True)
+
+    def pump(self):
+        """Obsługuje zdarzenia okna (np. w czasie pauzy operacji)"""
         if not self.closed:
             try:
-                self.status_label.config(text=status)
-                self.details_label.config(text=details)
                 self.window.update()
             except tk.TclError:
                 self.closed = True
 
+    def _toggle_pause(self):
+        if self.token.cancelled:
+            return
+        if self.token.paused:
+            self.token.resume()
+            self.pause_button.config(text="Wstrzymaj")
+            self.title_label.config(text=self.heading)
+        else:
+            self.token.pause()
+            self.pause_button.config(text="Wznów")
+            self.title_label.config(text="Wstrzymano - dokończono bieżący plik")
+
+    def _cancel(self):
+        self.token.cancel()
+        try:
+            self.pause_button.config(state="disabled")
+            self.cancel_button.config(state="disabled")
+            self.title_label.config(text="Anulowanie...")
+        except tk.TclError:
+            self.closed = True
+
+    def _refresh(self, force=False):
+        if self.closed:
+            return
+        if not self._refresh_limiter.ready() and not force:
+            return
+
+        tracker = self.tracker
+        try:
+            self.status_label.config(text=self._status)
+            self.details_label.config(text=self._details)
+
+            if tracker.total_files:
+                self.progress.config(value=min(tracker.files_done, tracker.total_files))
+                rate_text = (f"{tracker.files_done}/{tracker.total_files} plików • "
+                             f"{tracker.files_per_second:.1f} plików/s • "
+                             f"{FileSizeReader.format_size(tracker.bytes_per_second)}/s")
+                eta = tracker.eta
+                if eta is not None:
+                    rate_text += f" • pozostało ok. {format_duration(eta)}"
+                self.rate_label.config(text=rate_text)
+
+            self.stages_label.config(
+                text=", ".join(f"{stage}: {count}" for stage, count in tracker.stage_counts.items())
+            )
+            self.window.update()
+        except tk.TclError:
+            self.closed = True
+
     def close(self):
         """Zamyka okno dialogowe"""
         if not self.closed:
@@ -449,6 +561,7 @@ def main():
     # Zmienne globalne
     files_info_list = []
     details_frame_ref = [None]  # Używamy listy żeby móc modyfikować w funkcjach
+    open_visualizers = weakref.WeakSet()  # otwarte wizualizacje grup - odświeżane po organizowaniu
 
     # Inicjalizacja organizatora folderów
     auto_organizer = AutoFolderOrganizer(category_analyzer)
@@ -465,7 +578,8 @@ def main():
         print(f"Wybrano {len(files)} plików do organizowania:")
 
         # Analizuj pliki bez przenoszenia
-        progress_dialog = ProgressDialog(root, "Analiza plików")
+        token = CancellationToken()
+        progress_dialog = ProgressDialog(root, "Analiza plików", total_files=len(files), token=token)
         progress_dialog.update_status("Analizuję pliki...", "Przygotowywanie do organizowania")
 
         try:
@@ -480,10 +594,40 @@ def main():
                 except:
                     return "Data nieznana"
 
+            # Kategoryzacja wsadowa w partiach: wspólne odniesienie czasu, kategorie wielkości i daty
+            # liczone wektorowo, nazwy skanowane raz na unikalną nazwę. Między partiami okno
+            # obsługuje pauzę i anulowanie. Migawki os.stat z partii służą też do analizy poniżej.
+            progress_dialog.update_status("Kategoryzuję pliki...", f"{len(files)} plików")
+            # Status tuż po poprzednim zostałby odrzucony przez limit odświeżeń - wymuś przed partiami
+            progress_dialog.refresh()
+            batch_now = time.time()
+            batch_entries = {}  # ścieżka -> (kategoryzacja, rozmiar, czas utworzenia, czas modyfikacji)
+            for chunk_start in range(0, len(files), CATEGORIZE_CHUNK_SIZE):
+                token.checkpoint()
+                chunk = files[chunk_start:chunk_start + CATEGORIZE_CHUNK_SIZE]
+                try:
+                    batch = category_analyzer.categorize_files(
+                        [file_path for file_path in chunk if os.path.exists(file_path)], now=batch_now
+                    )
+                    for index, path in enumerate(batch.paths):
+                        batch_entries[path] = (batch.as_dict(index), batch.sizes[index],
+                                               batch.created_times[index], batch.modified_times[index])
+                except Exception as batch_error:
+                    print(f"Błąd kategoryzacji wsadowej: {batch_error}")
+                progress_dialog.update_status(
+                    "Kategoryzuję pliki...", f"{chunk_start + len(chunk)} z {len(files)} plików"
+                )
+                progress_dialog.advance("skategoryzowane", files=len(chunk))
+
+            # Właściwa analiza - pasek postępu od nowa
+            progress_dialog.start(len(files))
+
             # Stwórz tymczasowe obiekty FileInfo dla analizy
             temp_files_info = []
 
             for i, file_path in enumerate(files):
+                # Anulowanie/pauza między plikami
+                token.checkpoint()
                 try:
                     file_name = os.path.basename(file_path)
                     progress_dialog.update_status(
@@ -491,24 +635,37 @@ def main():
                         f"Plik {i + 1} z {len(files)}"
                     )
 
-                    if not os.path.exists(file_path):
+                    batch_entry = batch_entries.get(file_path)
+                    if batch_entry is None and not os.path.exists(file_path):
                         print(f"Plik nie istnieje: {file_path}")
+                        progress_dialog.advance("pominięte")
                         continue
 
                     # Podstawowe informacje o pliku
                     name, extension = os.path.splitext(file_name)
 
-                    # Pobierz statystyki pliku
-                    try:
-                        file_stats = os.stat(file_path)
-                        file_size = FileSizeReader.get_file_size(file_path)
-                        creation_date = safe_format_datetime(file_stats.st_ctime)
-                        modification_date = safe_format_datetime(file_stats.st_mtime)
-                    except Exception as stat_error:
-                        print(f"Błąd statystyk dla {file_name}: {stat_error}")
-                        file_size = 0
-                        creation_date = "Data nieznana"
-                        modification_date = "Data nieznana"
+                    # Statystyki pliku - z migawki partii, os.stat tylko gdy jej brak
+                    if batch_entry is not None and batch_entry[2] is not None:
+                        _, file_size, creation_time, modification_time = batch_entry
+                        if not file_size:
+                            # Zerowy rozmiar z os.stat - FileSizeReader próbuje innych metod
+                            file_size = FileSizeReader.get_file_size(file_path)
+                        creation_date = safe_format_datetime(creation_time)
+                        modification_date = safe_format_datetime(modification_time)
+                    else:
+                        try:
+                            file_stats = os.stat(file_path)
+                            file_size = FileSizeReader.get_file_size(file_path)
+                            creation_date = safe_format_datetime(file_stats.st_ctime)
+                            modification_date = safe_format_datetime(file_stats.st_mtime)
+                            creation_time = file_stats.st_ctime
+                            modification_time = file_stats.st_mtime
+                        except Exception as stat_error:
+                            print(f"Błąd statystyk dla {file_name}: {stat_error}")
+                            file_size = 0
+                            creation_date = "Data nieznana"
+                            modification_date = "Data nieznana"
+                            creation_time = modification_time = None
 
                     # Analiza zaawansowana - z obsługą błędów
                     try:
@@ -531,9 +688,12 @@ def main():
                     except Exception:
                         headers_info = "brak"
 
-                    # Kategoryzacja
+                    # Kategoryzacja - z partii, pojedynczo tylko gdy partia zawiodła
                     try:
-                        categorization = category_analyzer.categorize_file(file_path)
+                        if batch_entry is not None:
+                            categorization = batch_entry[0]
+                        else:
+                            categorization = category_analyzer.categorize_file(file_path)
                     except Exception as cat_error:
                         print(f"Błąd kategoryzacji dla {file_name}: {cat_error}")
                         # Domyślna kategoryzacja
@@ -560,18 +720,24 @@ def main():
                         categorization.get('kategoria_daty', 'nieznana'),
                         categorization.get('kategoria_przedmiotu', []),
                         categorization.get('kategoria_czasowa', []),
-                        categorization.get('wszystkie_kategorie', [])
+                        categorization.get('wszystkie_kategorie', []),
+                        creation_time=creation_time, modification_time=modification_time
                     )
 
                     temp_files_info.append(file_info)
                     print(f"✅ Przeanalizowano: {file_name}")
+                    progress_dialog.advance("przeanalizowane", file_size)
 
                 except Exception as e:
                     print(f"❌ Błąd analizy pliku {file_path}: {e}")
+                    progress_dialog.advance("błędy")
                     continue
 
             progress_dialog.close()
 
+            # Zapisz wzorce nauczone podczas analizy
+            category_analyzer.flush()
+
             if not temp_files_info:
                 messagebox.showerror("Błąd", "Nie udało się przeanalizować żadnego pliku.")
                 return
@@ -601,21 +767,41 @@ def main():
                 destination, temp_files_info, hierarchy
             )
 
-            # Wykonaj przenoszenie bez symulacji
+            # Wykonaj przenoszenie bez symulacji - z możliwością wstrzymania i przerwania
             print(f"Wykonywanie przenoszenia...")
+            move_token = CancellationToken()
+            progress_dialog = ProgressDialog(root, "Przenoszenie plików", total_files=len(file_mapping),
+                                             token=move_token, heading="Przenoszenie w toku...")
+
+            def report_move(stage, file_name):
+                progress_dialog.update_status(f"Przeniesiono: {file_name}")
+                progress_dialog.advance(stage)
+
             results = auto_organizer.create_folders_and_move_files(
-                file_mapping, dry_run=False, use_existing_structure=use_existing
+                file_mapping, dry_run=False, use_existing_structure=use_existing,
+                token=move_token, progress=report_move
             )
+            progress_dialog.close()
 
             # Aktualizuj zmienne globalne
             files_info_list = temp_files_info
 
+            # Otwarte wizualizacje grup pokazują teraz nowy zbiór plików
+            for visualizer in list(open_visualizers):
+                visualizer.set_files(files_info_list)
+
             # Pokaż wyniki
             show_organize_results(results)
 
             # Wyświetl tabelę z informacjami w głównym oknie
             show_files_table_inline(files_info_list, category_analyzer, details_frame_ref[0])
 
+        except OperationCancelled:
+            progress_dialog.close()
+            category_analyzer.flush()
+            print("Anulowano analizę plików")
+            messagebox.showinfo("Informacja", "Analiza plików została anulowana.")
+
         except Exception as e:
             if 'progress_dialog' in locals():
                 progress_dialog.close()
@@ -651,6 +837,9 @@ def main():
                   font=("Arial", 10)).pack(anchor="w")
         ttk.Label(stats_frame, text=f"Ponownie użyte foldery: {len(results.get('folders_reused', set()))}",
                   font=("Arial", 10)).pack(anchor="w")
+        if results.get('cancelled'):
+            ttk.Label(stats_frame, text=f"Przerwano - nieprzeniesione pliki: {len(results['skipped'])}",
+                      font=("Arial", 10), foreground="red").pack(anchor="w")
 
         # Lista wyników
         results_frame = ttk.LabelFrame(main_frame, text="Szczegóły", padding="10")
@@ -710,6 +899,7 @@ def main():
         try:
             if USE_ENHANCED_VISUALIZER:
                 visualizer = EnhancedFileGroupVisualizer(root, files_info_list, category_analyzer)
+                open_visualizers.add(visualizer)
             else:
                 visualizer = FileGroupVisualizer(root, files_info_list, category_analyzer)
         except Exception as e:
@@ -852,6 +1042,9 @@ def main():
     # Uruchomienie głównej pętli aplikacji
     root.mainloop()
 
+    # Zapisz zaległe wzorce przy zamykaniu
+    category_analyzer.flush()
+
 
 if __name__ == "__main__":
     try:
@@ -2,6 +2,7 @@
 # models.py
 from datetime import datetime
 import traceback
+import time
 import os
 
 
@@ -13,7 +14,8 @@ class FileInfo:
                  mime_type="", file_signature="", keywords="", headers_info="",
                  category_extension="", category_name=None, suggested_locations=None,
                  size_category="", date_category="", subject_categories=None,
-                 time_pattern_categories=None, all_categories=None):
+                 time_pattern_categories=None, all_categories=None,
+                 creation_time=None, modification_time=None):
         self.name = name
         self.extension = extension
         self.source_path = source_path
@@ -21,7 +23,8 @@ class FileInfo:
         self.status = status
 
         # Ustawiamy timestamp na aktualny czas w momencie utworzenia obiektu
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.operation_time = time.time()  # ten sam moment jako liczba - klucz sortowania
+        self.timestamp = datetime.fromtimestamp(self.operation_time).strftime("%Y-%m-%d %H:%M:%S")
 
         # Podstawowe metadane
         # Upewniamy się, że file_size jest liczbą
@@ -70,6 +73,9 @@ class FileInfo:
 
         self.creation_date = creation_date
         self.modification_date = modification_date
+        # Daty jako znaczniki czasu (sekundy od epoki) - do sortowania bez parsowania tekstu
+        self.creation_time = creation_time
+        self.modification_time = modification_time
         self.attributes = attributes  # atrybuty pliku jako string
 
         # Zaawansowane metadane
@@ -0,0 +1,46 @@
+# path_table.py
+import posixpath
+
+
+def normalize_destination(path):
+    """Normalizuje ścieżkę docelową - jednolite separatory '/', bez zbędnych segmentów"""
+    if not path:
+        return path
+
+    normalized = posixpath.normpath(path.replace('\\', '/'))
+
+    # Litera dysku wielkimi literami (c:/ i C:/ to ten sam katalog)
+    if len(normalized) >= 2 and normalized[1] == ':':
+        normalized = normalized[0].upper() + normalized[1:]
+
+    return normalized
+
+
+class PathTable:
+    """Tabela internowanych ścieżek: ścieżka <-> identyfikator liczbowy.
+
+    Identyfikator to pozycja ścieżki na liście, więc lista zapisana w historii
+    odtwarza dokładnie te same identyfikatory po ponownym wczytaniu.
+    """
+
+    def __init__(self, paths=()):
+        self.paths = list(paths)
+        self._ids = {}
+        for path_id, path in enumerate(self.paths):
+            self._ids.setdefault(path, path_id)
+
+    def intern(self, path):
+        """Zwraca identyfikator ścieżki, dodając ją do tabeli jeśli jest nowa"""
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = len(self.paths)
+            self.paths.append(path)
+            self._ids[path] = path_id
+        return path_id
+
+    def path(self, path_id):
+        """Zwraca ścieżkę dla identyfikatora"""
+        return self.paths[path_id]
+
+    def __len__(self):
+        return len(self.paths)
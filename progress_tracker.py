@@ -0,0 +1,94 @@
+# progress_tracker.py
+import time
+
+UI_REFRESH_INTERVAL = 0.1  # najwyżej 10 odświeżeń okna postępu na sekundę
+
+
+class ProgressTracker:
+    """Model postępu długiej operacji: liczniki plików i bajtów, etapy, tempo i ETA.
+
+    Tempo to średnia od startu (pliki/s, bajty/s) - stabilniejsza niż tempo ostatniego pliku,
+    gdy czasy pojedynczych plików bardzo się różnią. Nie odwołuje się do widżetów.
+    """
+
+    def __init__(self, total_files=0, total_bytes=0, clock=time.monotonic):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files_done = 0
+        self.bytes_done = 0
+        self.stage_counts = {}  # etap -> liczba plików (w kolejności pierwszego wystąpienia)
+        self._clock = clock
+        self._started = clock()
+
+    def restart(self, total_files=0, total_bytes=0):
+        """Zeruje liczniki i czas - nowy przebieg (np. kolejny etap operacji)"""
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files_done = 0
+        self.bytes_done = 0
+        self.stage_counts = {}
+        self._started = self._clock()
+
+    def advance(self, stage=None, file_bytes=0, files=1):
+        """Rejestruje ukończone pliki (opcjonalnie z etapem, np. "przeanalizowane", "błędy")"""
+        self.files_done += files
+        if isinstance(file_bytes, (int, float)):
+            self.bytes_done += file_bytes
+        if stage is not None:
+            self.stage_counts[stage] = self.stage_counts.get(stage, 0) + files
+
+    @property
+    def elapsed(self):
+        return self._clock() - self._started
+
+    @property
+    def files_per_second(self):
+        elapsed = self.elapsed
+        return self.files_done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self):
+        elapsed = self.elapsed
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def fraction(self):
+        """Ukończona część operacji (0-1) lub None, gdy liczba plików nie jest znana"""
+        if not self.total_files:
+            return None
+        return min(self.files_done / self.total_files, 1.0)
+
+    @property
+    def eta(self):
+        """Szacowany pozostały czas w sekundach lub None (brak danych o tempie)"""
+        rate = self.files_per_second
+        if not self.total_files or not rate:
+            return None
+        return max(self.total_files - self.files_done, 0) / rate
+
+
+class RateLimiter:
+    """Przepuszcza co najwyżej jedno zdarzenie na interval sekund"""
+
+    def __init__(self, interval=UI_REFRESH_INTERVAL, clock=time.monotonic):
+        self.interval = interval
+        self._clock = clock
+        self._last = None
+
+    def ready(self):
+        """Czy minął interwał od ostatniego przepuszczonego zdarzenia (jeśli tak - zapamiętuje je)"""
+        now = self._clock()
+        if self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+
+def format_duration(seconds):
+    """Czas w formacie g:mm:ss lub m:ss"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
@@ -0,0 +1,84 @@
+# search_index.py
+from collections import defaultdict
+
+TRIGRAM = 3
+
+
+def trigrams(text):
+    """Zbiór trzyznakowych fragmentów tekstu"""
+    return {text[i:i + TRIGRAM] for i in range(len(text) - TRIGRAM + 1)}
+
+
+class TrigramIndex:
+    """Indeks podciągów: trigram -> dokumenty, które go zawierają.
+
+    Dokument zawierający szukany tekst zawiera wszystkie jego trigramy, więc kandydatami jest
+    przecięcie list trigramów (od najkrótszej), sprawdzane na końcu zwykłym "in".
+    Krótsze niż 3 znaki zapytania przeglądają teksty liniowo.
+    """
+
+    def __init__(self, texts):
+        self.texts = [text.lower() for text in texts]
+        self._postings = defaultdict(list)
+        for doc, text in enumerate(self.texts):
+            for gram in trigrams(text):
+                self._postings[gram].append(doc)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, term):
+        """Numery dokumentów zawierających term (bez wielkości liter), rosnąco"""
+        term = term.lower()
+        texts = self.texts
+        if not term:
+            return list(range(len(texts)))
+        if len(term) < TRIGRAM:
+            return [doc for doc, text in enumerate(texts) if term in text]
+
+        postings = sorted((self._postings.get(gram, ()) for gram in trigrams(term)), key=len)
+        if not postings[0]:
+            return []
+
+        candidates = set(postings[0])
+        for docs in postings[1:]:
+            candidates.intersection_update(docs)
+            if not candidates:
+                return []
+        return sorted(doc for doc in candidates if term in texts[doc])
+
+
+class FileNameIndex(TrigramIndex):
+    """Indeks nazw plików (nazwa + rozszerzenie) - budowany raz na zbiór plików"""
+
+    def __init__(self, files_info):
+        self.files = list(files_info)
+        super().__init__(f"{file_info.name}{file_info.extension or ''}" for file_info in self.files)
+
+
+class GroupSearchIndex:
+    """Wyszukiwanie grup po nazwie grupy lub nazwach plików w grupie.
+
+    group_names - nazwy grup w kolejności wyświetlania, groups - nazwa -> pliki.
+    Przynależność pliku do grup (plik może być w kilku) zapamiętywana jest przez id pliku.
+    """
+
+    def __init__(self, group_names, groups, file_index=None):
+        self.group_names = list(group_names)
+        self._names = TrigramIndex(self.group_names)
+        self._file_index = file_index
+        self._owners = defaultdict(list)  # id pliku -> pozycje grup
+        if file_index is not None:
+            for position, group_name in enumerate(self.group_names):
+                for file_info in groups[group_name]:
+                    self._owners[id(file_info)].append(position)
+
+    def search(self, term):
+        """Pozycje grup (rosnąco), których nazwa lub któryś plik zawiera term"""
+        positions = set(self._names.search(term))
+        if self._file_index is not None and term:
+            files = self._file_index.files
+            owners = self._owners
+            for doc in self._file_index.search(term):
+                positions.update(owners.get(id(files[doc]), ()))
+        return sorted(positions)
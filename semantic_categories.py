@@ -0,0 +1,182 @@
+# semantic_categories.py
+from collections import defaultdict, deque
+
+# Rozbudowany słownik kategorii semantycznych nazw plików
+SEMANTIC_CATEGORIES = {
+    'przyroda': {
+        'keywords': ['zwierzę', 'roślina', 'natura', 'las', 'drzewo', 'kwiat', 'ptak',
+                     'ryba', 'owad', 'ssak', 'gad', 'płaz', 'fauna', 'flora', 'ekologia',
+                     'animal', 'plant', 'nature', 'forest', 'tree', 'flower', 'bird'],
+        'prefixes': ['bio', 'eco', 'zoo', 'bot']
+    },
+    'nauka': {
+        'keywords': ['fizyka', 'chemia', 'matematyka', 'biologia', 'informatyka', 'nauka',
+                     'eksperyment', 'badanie', 'analiza', 'teoria', 'wzór', 'równanie',
+                     'physics', 'chemistry', 'math', 'biology', 'science', 'research'],
+        'prefixes': ['lab', 'sci', 'mat', 'fiz', 'chem', 'bio']
+    },
+    'finanse': {
+        'keywords': ['faktura', 'rachunek', 'płatność', 'konto', 'bank', 'pieniądze',
+                     'budżet', 'wydatek', 'przychód', 'podatek', 'księgowość', 'bilans',
+                     'invoice', 'payment', 'account', 'money', 'budget', 'tax'],
+        'prefixes': ['fv', 'inv', 'pay', 'fin', 'acc']
+    },
+    'dokumenty_firmowe': {
+        'keywords': ['umowa', 'kontrakt', 'oferta', 'protokół', 'sprawozdanie', 'raport',
+                     'prezentacja', 'spotkanie', 'projekt', 'zlecenie', 'zamówienie',
+                     'contract', 'offer', 'report', 'presentation', 'meeting', 'project'],
+        'prefixes': ['doc', 'rep', 'prez', 'proj', 'meet']
+    },
+    'edukacja': {
+        'keywords': ['lekcja', 'kurs', 'szkolenie', 'wykład', 'egzamin', 'test', 'zadanie',
+                     'ćwiczenie', 'podręcznik', 'notatka', 'studium', 'seminarium',
+                     'lesson', 'course', 'training', 'lecture', 'exam', 'exercise'],
+        'prefixes': ['edu', 'kurs', 'szk', 'stud', 'learn']
+    },
+    'multimedia': {
+        'keywords': ['zdjęcie', 'foto', 'obraz', 'grafika', 'wideo', 'film', 'muzyka',
+                     'dźwięk', 'audio', 'klip', 'animacja', 'render', 'edycja',
+                     'photo', 'image', 'graphic', 'video', 'music', 'sound', 'animation'],
+        'prefixes': ['img', 'vid', 'aud', 'gfx', 'anim', 'foto']
+    },
+    'osobiste': {
+        'keywords': ['prywatne', 'osobiste', 'rodzina', 'wakacje', 'urodziny', 'ślub',
+                     'pamiątka', 'wspomnienie', 'dziennik', 'list', 'kartka',
+                     'private', 'personal', 'family', 'vacation', 'birthday', 'diary'],
+        'prefixes': ['priv', 'pers', 'my', 'moje']
+    },
+    'technologia': {
+        'keywords': ['kod', 'program', 'aplikacja', 'system', 'baza', 'serwer', 'sieć',
+                     'backup', 'kopia', 'instalacja', 'konfiguracja', 'skrypt',
+                     'code', 'app', 'system', 'database', 'server', 'network', 'script'],
+        'prefixes': ['app', 'sys', 'db', 'net', 'dev', 'prog']
+    }
+}
+
+# Wagi dopasowań
+KEYWORD_SCORE = 3  # słowo kluczowe w nazwie
+STEM_SCORE = 1  # pierwsze 4 litery słowa kluczowego na początku członu nazwy (człony oddziela '_')
+PREFIX_SCORE = 2  # nazwa zaczyna się od prefiksu kategorii
+STEM_LENGTH = 4
+
+
+class KeywordAutomaton:
+    """Automat Aho-Corasick - znajduje wszystkie wzorce w tekście w jednym przejściu.
+
+    Wynik find() to pary (wzorzec, pozycja_początku) dla każdego wystąpienia.
+    """
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            if pattern not in self._output[state]:
+                self._output[state].append(pattern)
+
+        # Łącza porażek w kolejności BFS; wyjścia stanu uzupełniane o wyjścia łącza
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """Wszystkie wystąpienia wzorców: lista (wzorzec, pozycja_początku)"""
+        matches = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in output[state]:
+                matches.append((pattern, position - len(pattern) + 1))
+        return matches
+
+
+class SemanticCategoryMatcher:
+    """Ocena wszystkich kategorii semantycznych w jednym przejściu po nazwie pliku"""
+
+    def __init__(self, categories=SEMANTIC_CATEGORIES):
+        self.categories = list(categories)
+        self._keywords = defaultdict(list)  # słowo -> indeksy kategorii (z powtórzeniami)
+        self._stems = defaultdict(list)  # rdzeń -> (indeks kategorii, słowo)
+        self._prefixes = defaultdict(list)  # prefiks -> indeksy kategorii
+
+        for index, data in enumerate(categories.values()):
+            for keyword in data['keywords']:
+                self._keywords[keyword].append(index)
+                self._stems[keyword[:STEM_LENGTH]].append((index, keyword))
+            for prefix in data['prefixes']:
+                self._prefixes[prefix].append(index)
+
+        self._automaton = KeywordAutomaton(set(self._keywords) | set(self._stems) | set(self._prefixes))
+
+    def scores(self, filename):
+        """Oceny kategorii (lista w kolejności tabeli) dla nazwy pliku"""
+        text = filename.lower()
+        found = set()
+        stems_found = set()
+        prefixes_found = set()
+
+        for pattern, start in self._automaton.find(text):
+            found.add(pattern)
+            if start == 0:
+                prefixes_found.add(pattern)
+            if start == 0 or text[start - 1] == '_':
+                stems_found.add(pattern)
+
+        scores = [0] * len(self.categories)
+        for keyword in found:
+            for index in self._keywords.get(keyword, ()):
+                scores[index] += KEYWORD_SCORE
+        for stem in stems_found:
+            for index, keyword in self._stems.get(stem, ()):
+                if keyword not in found:
+                    scores[index] += STEM_SCORE
+        for prefix in prefixes_found:
+            for index in self._prefixes.get(prefix, ()):
+                scores[index] += PREFIX_SCORE
+        return scores
+
+    def best_category(self, filename):
+        """Kategoria z najwyższą oceną (pierwsza przy remisie) lub None"""
+        best_category = None
+        best_score = 0
+        for category, score in zip(self.categories, self.scores(filename)):
+            if score > best_score:
+                best_score = score
+                best_category = category
+        return best_category
+
+
+_default_matcher = None
+
+
+def find_semantic_category(filename):
+    """Najlepsza kategoria semantyczna nazwy pliku (automat kompilowany raz)"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = SemanticCategoryMatcher()
+    return _default_matcher.best_category(filename)
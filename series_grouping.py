@@ -0,0 +1,152 @@
+# series_grouping.py
+import re
+from collections import defaultdict
+
+SERIES_PREFIX_LENGTH = 4  # minimalny wspólny prefiks serii
+SERIES_CONTAINMENT_LENGTH = 6  # minimalna długość nazwy zawartej w innej nazwie
+
+_NON_WORD = re.compile(r'[^\w]')
+_TRAILING_SEPARATORS = re.compile(r'[\d_\-\s]+$')
+
+
+def clean_series_name(name):
+    """Nazwa bez znaków specjalnych - normalizowana raz na plik"""
+    return _NON_WORD.sub('', name.lower())
+
+
+def find_series(names):
+    """Grupuje nazwy w serie bez porównywania każdej pary.
+
+    Zwraca listę krotek (indeks_ziarna, [indeksy_członków]) w kolejności nazw - wynik jest
+    taki sam jak zachłanne porównywanie parami: nazwy są podobne, gdy mają wspólny prefiks
+    >= 4 znaków albo jedna (>= 6 znaków) zawiera się w drugiej.
+
+    Wspólny prefiks >= 4 to ta sama czteroznakowa głowa, więc takie nazwy trafiają do jednego
+    kubełka. Zawieranie wyszukiwane jest indeksem krótszych nazw (pierwsze 6 znaków, długość).
+    """
+    cleaned = [clean_series_name(name) for name in names]
+
+    # Kubełki wspólnego prefiksu (relacja równoważności)
+    buckets = defaultdict(list)
+    for index, clean in enumerate(cleaned):
+        if len(clean) >= SERIES_PREFIX_LENGTH:
+            buckets[clean[:SERIES_PREFIX_LENGTH]].append(index)
+
+    # Zawieranie: indeks nazw >= 6 znaków - pierwsze 6 znaków -> długość -> nazwa -> indeksy
+    heads = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for index, clean in enumerate(cleaned):
+        if len(clean) >= SERIES_CONTAINMENT_LENGTH:
+            heads[clean[:SERIES_CONTAINMENT_LENGTH]][len(clean)][clean].append(index)
+
+    related = defaultdict(set)  # indeks -> indeksy powiązane przez zawieranie
+    for index, clean in enumerate(cleaned):
+        # Zawieranie od pozycji 0 to wspólny prefiks - już w kubełku
+        for start in range(1, len(clean) - SERIES_CONTAINMENT_LENGTH + 1):
+            by_length = heads.get(clean[start:start + SERIES_CONTAINMENT_LENGTH])
+            if not by_length:
+                continue
+            for length, by_name in by_length.items():
+                if start + length > len(clean):
+                    continue
+                for other in by_name.get(clean[start:start + length], ()):
+                    related[index].add(other)
+                    related[other].add(index)
+
+    processed = [False] * len(names)
+    series = []
+    for index, clean in enumerate(cleaned):
+        if processed[index]:
+            continue
+
+        members = set(related.get(index, ()))
+        if len(clean) >= SERIES_PREFIX_LENGTH:
+            members.update(buckets[clean[:SERIES_PREFIX_LENGTH]])
+        members.discard(index)
+
+        group = [index] + sorted(member for member in members if not processed[member])
+        for member in group:
+            processed[member] = True
+        series.append((index, group))
+
+    return series
+
+
+def find_common_part(names):
+    """Najdłuższy wspólny prefiks nazw (bez wielkości liter), bez końcowych cyfr i separatorów"""
+    if not names:
+        return ""
+
+    common = names[0]
+    for name in names[1:]:
+        length = 0
+        for c1, c2 in zip(common, name):
+            if c1.lower() != c2.lower():
+                break
+            length += 1
+        common = common[:length]
+        if not common:
+            break
+
+    common = _TRAILING_SEPARATORS.sub('', common)
+
+    return common if len(common) >= 3 else ""
+
+
+class LaterNameIndex:
+    """Indeks odwrotny nazw do grupowania "slowa_nazwy": prefiksy -> ostatni plik,
+    czteroliterowe fragmenty (przez skrót) -> pliki.
+
+    Krok serii pyta, czy jakiś późniejszy plik zaczyna się tym samym prefiksem (4-8 znaków) -
+    wystarczy największy indeks pliku dla prefiksu, czyli jeden odczyt ze słownika.
+    Krok "Zawiera" pyta, czy jakiś późniejszy plik zawiera dane słowo. Plik zawierający słowo
+    zawiera każdy jego czteroliterowy fragment, więc kandydatami są pliki z najkrótszej listy
+    fragmentów słowa, sprawdzane od końca zwykłym "in". Fragmenty trafiają do stałej liczby
+    kubełków (skrót fragmentu) - kolizje kosztują tylko dodatkowe sprawdzenie "in". Indeks ma
+    co najwyżej jeden wpis na literę nazwy, więc rośnie liniowo z liczbą plików.
+    """
+
+    PREFIX_LENGTHS = range(4, 9)
+    FRAGMENT_LENGTH = 4
+    MIN_BUCKETS = 1 << 12
+    WORD_PATTERN = re.compile(r'[a-zA-ZżółćęśąźńŻÓŁĆĘŚĄŹŃ]{4,}')
+
+    def __init__(self, names_lower):
+        self._names = list(names_lower)
+        self._last_prefix = {}
+        self._bucket_mask = max(self.MIN_BUCKETS, 1 << len(self._names).bit_length()) - 1
+        self._fragments = defaultdict(list)  # kubełek fragmentu -> indeksy plików rosnąco
+
+        for index, name in enumerate(self._names):
+            for length in self.PREFIX_LENGTHS:
+                if len(name) < length:
+                    break
+                self._last_prefix[name[:length]] = index
+
+            # Słowo zawarte w nazwie leży w całości w jednym ciągu liter
+            for fragment in self._word_fragments(self.WORD_PATTERN.findall(name)):
+                self._fragments[fragment].append(index)
+
+    def _word_fragments(self, runs):
+        """Kubełki czteroliterowych fragmentów ciągów liter (bez powtórzeń)"""
+        size = self.FRAGMENT_LENGTH
+        mask = self._bucket_mask
+        return {hash(run[start:start + size]) & mask for run in runs for start in range(len(run) - size + 1)}
+
+    def has_later_prefix(self, prefix, index):
+        """Czy plik o indeksie większym niż index zaczyna się od prefiksu"""
+        return self._last_prefix.get(prefix, -1) > index
+
+    def has_later_word(self, word, index):
+        """Czy plik o indeksie większym niż index zawiera słowo"""
+        names = self._names
+        if not self.WORD_PATTERN.fullmatch(word):
+            # Słowo spoza indeksu (krótkie lub z innymi znakami) - przegląd liniowy
+            return any(word in name for name in names[index + 1:])
+
+        candidates = min((self._fragments.get(fragment, ()) for fragment in self._word_fragments((word,))), key=len)
+        for other in reversed(candidates):
+            if other <= index:
+                break
+            if word in names[other]:
+                return True
+        return False
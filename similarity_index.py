@@ -0,0 +1,196 @@
+# similarity_index.py
+import zlib
+import random
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MINHASH_PRIME = (1 << 31) - 1
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 32  # 32 pasma po 2 wiersze - wysoka czułość (próg Jaccarda ok. (1/32)^(1/2) = 0.18),
+# bo podobieństwo difflib > 0.6 może odpowiadać niskiemu podobieństwu zbiorów k-gramów
+SHINGLE_SIZE = 2
+
+# Progi i wagi inteligentnego grupowania hybrydowego
+HYBRID_SAMPLE_SIZE = 5  # z iloma pierwszymi plikami grupy porównywana jest nazwa
+HYBRID_MIN_SCORE = 15
+HYBRID_NAME_SIMILARITY = 0.6
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Zbiór fragmentów znakowych (k-gramów) tekstu"""
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHashLSH:
+    """Indeks podobieństwa nazw: sygnatury MinHash z k-gramów + LSH z pasmami.
+
+    Klucze, których sygnatura zgadza się z zapytaniem w całym choć jednym paśmie,
+    są kandydatami - zapytanie kosztuje tyle co kilka odczytów ze słownika,
+    niezależnie od liczby zaindeksowanych nazw.
+    """
+
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, bands=LSH_BANDS, shingle_size=SHINGLE_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError("Liczba permutacji musi być wielokrotnością liczby pasm")
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = [rng.randrange(1, MINHASH_PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, MINHASH_PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._a_array = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_array = np.array(self._b, dtype=np.uint64)[:, None]
+        self._buckets = defaultdict(list)  # (pasmo, wartości pasma) -> klucze
+
+    def signature(self, text):
+        """Sygnatura MinHash tekstu (krotka liczb)"""
+        # crc32 zamiast hash() - sygnatury stałe między uruchomieniami
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text, self.shingle_size)]
+
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)[None, :]
+            return tuple(((self._a_array * values + self._b_array) % MINHASH_PRIME).min(axis=1).tolist())
+
+        return tuple(min((a * h + b) % MINHASH_PRIME for h in hashes) for a, b in zip(self._a, self._b))
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def add(self, key, signature):
+        """Dodaje klucz z sygnaturą do indeksu"""
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def query(self, signature):
+        """Zbiór kluczy - kandydatów podobnych do sygnatury"""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+
+class HybridGroup:
+    """Grupa inteligentnego grupowania ze zbiorami cech do oceny w czasie O(1)"""
+
+    __slots__ = ('name', 'files', 'extensions', 'categories', 'sizes', 'matchers')
+
+    def __init__(self, name):
+        self.name = name
+        self.files = []
+        self.extensions = set()
+        self.categories = set()
+        self.sizes = set()
+        self.matchers = []  # SequenceMatcher z nazwą pierwszych plików jako drugą sekwencją
+
+
+class HybridGroupIndex:
+    """Inteligentne grupowanie hybrydowe: rozszerzenie, typ, podobieństwo nazwy i rozmiar.
+
+    Plik trafia do grupy z najwyższą oceną (> 15): +10 to samo rozszerzenie, +8 ten sam typ,
+    +5 ta sama kategoria rozmiaru, +int(podobieństwo * 20) za każdą z pierwszych 5 nazw grupy
+    podobną w > 0.6. Zamiast oceniać każdą grupę, ocenia tylko kandydatów: grupy z podobnymi
+    nazwami (MinHash/LSH) i pierwsze grupy, które mają rozszerzenie i typ pliku w cechach.
+    """
+
+    def __init__(self, lsh=None):
+        self.lsh = lsh or MinHashLSH()
+        self.groups = []  # w kolejności utworzenia - przy remisie wygrywa wcześniejsza
+        self._by_name = {}
+        self._by_extension = defaultdict(list)  # rozszerzenie -> identyfikatory grup
+
+    def add(self, file_info):
+        """Przydziela plik do najlepszej grupy lub tworzy nową. Zwraca nazwę grupy"""
+        name = file_info.name.lower()
+        signature = self.lsh.signature(name)
+
+        best_id, best_score = None, 0
+        for group_id in sorted(self._candidates(file_info, signature)):
+            score = self._score(self.groups[group_id], file_info, name)
+            if score > best_score:
+                best_id, best_score = group_id, score
+
+        if best_id is not None and best_score > HYBRID_MIN_SCORE:
+            group_id = best_id
+        else:
+            # Nowa grupa - nazwa na podstawie dominującej cechy
+            if file_info.category_name and len(file_info.category_name) > 0:
+                group_name = f"Grupa: {file_info.category_name[0].title()}"
+            elif len(file_info.name) > 6:
+                group_name = f"Seria: {file_info.name[:6].title()}"
+            else:
+                group_name = f"Typ: {file_info.category_extension}"
+
+            group_id = self._by_name.get(group_name)
+            if group_id is None:
+                group_id = len(self.groups)
+                self.groups.append(HybridGroup(group_name))
+                self._by_name[group_name] = group_id
+
+        self._append(group_id, file_info, name, signature)
+        return self.groups[group_id].name
+
+    def _candidates(self, file_info, signature):
+        """Grupy, które mogą przekroczyć próg: podobne nazwy + pierwsze z rozszerzeniem i typem"""
+        candidates = self.lsh.query(signature)
+
+        # Bez podobieństwa nazw próg przekraczają tylko grupy z rozszerzeniem i typem (10 + 8);
+        # spośród nich wygrywa pierwsza z pasującym rozmiarem, a w razie braku - pierwsza w ogóle
+        first_full = first_pair = None
+        for group_id in self._by_extension.get(file_info.extension, ()):
+            group = self.groups[group_id]
+            if file_info.category_extension in group.categories:
+                if first_pair is None or group_id < first_pair:
+                    first_pair = group_id
+                if file_info.size_category in group.sizes and (first_full is None or group_id < first_full):
+                    first_full = group_id
+
+        candidates.update(group_id for group_id in (first_full, first_pair) if group_id is not None)
+        return candidates
+
+    def _score(self, group, file_info, name):
+        """Ocena dopasowania pliku do grupy"""
+        score = 0
+        if file_info.extension in group.extensions:
+            score += 10
+        if file_info.category_extension in group.categories:
+            score += 8
+
+        for matcher in group.matchers:
+            matcher.set_seq1(name)
+            # Szybkie górne ograniczenia przed pełnym ratio()
+            if matcher.real_quick_ratio() > HYBRID_NAME_SIMILARITY and matcher.quick_ratio() > HYBRID_NAME_SIMILARITY:
+                similarity = matcher.ratio()
+                if similarity > HYBRID_NAME_SIMILARITY:
+                    score += int(similarity * 20)
+
+        if file_info.size_category in group.sizes:
+            score += 5
+        return score
+
+    def _append(self, group_id, file_info, name, signature):
+        """Dodaje plik do grupy i aktualizuje cechy oraz indeksy"""
+        group = self.groups[group_id]
+        group.files.append(file_info)
+
+        if file_info.extension not in group.extensions:
+            group.extensions.add(file_info.extension)
+            self._by_extension[file_info.extension].append(group_id)
+        group.categories.add(file_info.category_extension)
+        group.sizes.add(file_info.size_category)
+
+        if len(group.matchers) < HYBRID_SAMPLE_SIZE:
+            group.matchers.append(SequenceMatcher(None, '', name))
+            self.lsh.add(group_id, signature)
+
+    def as_dict(self):
+        """Grupy jako słownik nazwa -> lista plików (w kolejności utworzenia)"""
+        return {group.name: group.files for group in self.groups}
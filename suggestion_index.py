@@ -0,0 +1,58 @@
+# suggestion_index.py
+import heapq
+
+
+class SuggestionIndex:
+    """Indeks top-k lokalizacji docelowych dla rozszerzeń i wzorców nazw.
+
+    Zamiast sortować cały słownik lokalizacji przy każdej kategoryzacji,
+    indeks trzyma k najczęstszych lokalizacji dla każdego klucza historii
+    i aktualizuje je przyrostowo przy zapisie przeniesienia. Wpisy przechowują ścieżki,
+    a nie identyfikatory z tabeli ścieżek - odczyt nie zależy od tabeli, którą scalanie
+    historii może w tym czasie podmieniać.
+    """
+
+    def __init__(self, k=2):
+        self.k = k
+        self._top = {}  # (tabela, klucz) -> krotka ((ścieżka, liczba), ...) malejąco
+
+    def rebuild(self, history, path_table, tables=('extensions', 'patterns')):
+        """Buduje indeks od zera na podstawie historii przeniesień.
+
+        Identyfikatory lokalizacji są zamieniane na ścieżki z path_table tej samej historii.
+        Nowy słownik jest podmieniany jednym przypisaniem, a wpisy są krotkami,
+        więc czytający w innych wątkach widzą zawsze spójną, niezmienną migawkę.
+        """
+        top = {}
+        for table in tables:
+            for key, destinations in history.get(table, {}).items():
+                entries = heapq.nlargest(self.k, destinations.items(), key=lambda x: x[1])
+                if entries:
+                    top[(table, key)] = tuple((path_table.path(loc_id), count) for loc_id, count in entries)
+        self._top = top
+
+    def discard(self, table, key):
+        """Usuwa klucz z indeksu (np. po usunięciu wzorca z historii)"""
+        self._top.pop((table, key), None)
+
+    def record(self, table, key, location, count):
+        """Aktualizuje indeks po zmianie licznika lokalizacji (count = nowa wartość)"""
+        top = list(self._top.get((table, key), ()))
+
+        for i, (loc, _) in enumerate(top):
+            if loc == location:
+                top[i] = (location, count)
+                break
+        else:
+            # Lokalizacja spoza top-k wchodzi tylko jeśli wyprzedza ostatnią
+            if len(top) >= self.k and count <= top[-1][1]:
+                return
+            top.append((location, count))
+
+        top.sort(key=lambda x: x[1], reverse=True)
+        self._top[(table, key)] = tuple(top[:self.k])
+
+    def top(self, table, key, n=None):
+        """Zwraca n najczęstszych lokalizacji dla klucza - O(k)"""
+        top = self._top.get((table, key), ())
+        return top if n is None else top[:n]
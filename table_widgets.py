@@ -0,0 +1,504 @@
+# table_widgets.py
+import time
+import tkinter as tk
+from tkinter import ttk
+import traceback
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_ROW_HEIGHT = 20
+CHUNK_BUDGET_MS = 8  # ile czasu na jedną porcję wstawiania w pętli zdarzeń Tk
+SORT_ARROWS = {False: " ▲", True: " ▼"}
+
+
+def _text_key(value):
+    return (value or "").lower()
+
+
+def _time_key(value):
+    # Brak znacznika czasu sortowany jako najstarszy
+    return value if value is not None else float('-inf')
+
+
+# Klucze sortowania kolumn tabel plików - surowe wartości modelu zamiast tekstu z komórek
+FILE_SORT_KEYS = {
+    "Nazwa": lambda file_info: _text_key(file_info.name),
+    "Rozszerzenie": lambda file_info: _text_key(file_info.extension),
+    "Status": lambda file_info: _text_key(file_info.status),
+    "Czas operacji": lambda file_info: _time_key(getattr(file_info, 'operation_time', None)),
+    "Rozmiar": lambda file_info: file_info.file_size,
+    "Data utworzenia": lambda file_info: _time_key(getattr(file_info, 'creation_time', None)),
+    "Data modyfikacji": lambda file_info: _time_key(getattr(file_info, 'modification_time', None)),
+    "Typ pliku": lambda file_info: _text_key(file_info.category_extension),
+    "Kategoria rozmiaru": lambda file_info: file_info.file_size,
+}
+
+
+def sort_order(keys, descending=False):
+    """Kolejność indeksów po posortowaniu kluczy (stabilna). Klucze liczbowe sortuje NumPy"""
+    if np is not None and keys and isinstance(keys[0], (int, float)):
+        values = np.asarray(keys, dtype=np.float64)
+        if descending:
+            values = -values
+        return np.argsort(values, kind='stable').tolist()
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=descending)
+
+
+def column_sort_keys(rows, key, column=""):
+    """Klucze sortowania wierszy jednego typu - liczby albo teksty, według pierwszego poprawnego.
+
+    Klucz, którego nie da się policzyć (błąd, None, inny typ - np. nieodczytany rozmiar),
+    dostaje wartość najmniejszą dla typu kolumny, więc takie wiersze trafiają na początek
+    (przy sortowaniu malejącym - na koniec), a porównania nie mieszają typów.
+    """
+    keys = []
+    for row in rows:
+        try:
+            keys.append(key(row))
+        except Exception as e:
+            print(f"Błąd klucza sortowania kolumny {column}: {e}")
+            keys.append(None)
+
+    first = next((value for value in keys if isinstance(value, (int, float, str))), None)
+    if isinstance(first, (int, float)):
+        fill = float('-inf')
+        return [value if isinstance(value, (int, float)) else fill for value in keys]
+    return [value if isinstance(value, str) else "" for value in keys]
+
+
+def sort_rows(rows, column, descending=False, sort_keys=FILE_SORT_KEYS):
+    """Wiersze (np. pliki grupy) posortowane według klucza kolumny"""
+    rows = list(rows)
+    keys = column_sort_keys(rows, sort_keys[column], column)
+    return [rows[index] for index in sort_order(keys, descending)]
+
+
+class SortableHeadings:
+    """Sortowanie po kliknięciu nagłówka: ponowne kliknięcie odwraca kierunek, strzałka w nagłówku"""
+
+    def __init__(self, tree, columns, on_sort):
+        self.tree = tree
+        self.columns = tuple(columns)
+        self.on_sort = on_sort
+        self.column = None
+        self.descending = False
+        for col in self.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.click(c))
+
+    def click(self, column):
+        descending = column == self.column and not self.descending
+        self.set(column, descending)
+        self.on_sort(column, descending)
+
+    def set(self, column, descending):
+        """Zaznacza kolumnę sortowania w nagłówkach (bez sortowania)"""
+        if self.column is not None:
+            self.tree.heading(self.column, text=self.column)
+        self.column = column
+        self.descending = descending
+        if column is not None:
+            self.tree.heading(column, text=column + SORT_ARROWS[descending])
+
+
+class VirtualTable:
+    """Tabela z wirtualnym przewijaniem na ttk.Treeview.
+
+    Treeview zawiera tylko tyle elementów, ile wierszy mieści się w oknie - przewijanie
+    podmienia ich wartości na kolejne wiersze modelu. Koszt odświeżenia zależy od liczby
+    widocznych wierszy, nie od liczby plików, a Tk nie przechowuje setek tysięcy elementów.
+
+    rows - sekwencja danych (np. lista FileInfo), row_values(wiersz) -> krotka wartości kolumn,
+    sort_keys - kolumna -> funkcja klucza sortowania (domyślnie tekst komórki). Klucze kolumny
+    liczone są raz, sortowanie zmienia tylko kolejność wyświetlania (pozycje -> wiersze modelu).
+    """
+
+    def __init__(self, parent, columns, rows, row_values, widths=None, height=10, sort_keys=None):
+        self.columns = tuple(columns)
+        self.rows = rows
+        self.row_values = row_values
+        self.sort_keys = sort_keys or {}
+        self.first = 0  # pozycja pierwszego widocznego wiersza
+        self.selected_index = None  # indeks zaznaczonego wiersza modelu
+
+        self._order = None  # pozycja -> indeks wiersza modelu (None - kolejność modelu)
+        self._positions = None  # odwrotność _order, liczona przy potrzebie
+        self._key_cache = {}  # kolumna -> klucze sortowania wierszy
+
+        self._visible = height
+        self._items = []  # elementy Treeview wielokrotnego użytku
+        self._item_rows = {}  # element -> indeks wiersza modelu
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=self.columns, show="headings", height=height)
+
+        # Definicja nagłówków kolumn - kliknięcie sortuje
+        widths = widths or {}
+        for col in self.columns:
+            self.tree.column(col, width=widths.get(col, 120))
+        self.headings = SortableHeadings(self.tree, self.columns, self.sort_by)
+
+        # Pionowy pasek przewija model, poziomy - samo Treeview
+        self.scrollbar_y = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar_x = ttk.Scrollbar(self.frame, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.scrollbar_x.set)
+        self.scrollbar_y.pack(side="right", fill="y")
+        self.scrollbar_x.pack(side="bottom", fill="x")
+        self.tree.pack(fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self._move_selection(-self._visible))
+        self.tree.bind("<Next>", lambda event: self._move_selection(self._visible))
+        self.tree.bind("<Home>", lambda event: self._move_selection(-len(self.rows)))
+        self.tree.bind("<End>", lambda event: self._move_selection(len(self.rows)))
+
+        self.refresh()
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def set_rows(self, rows):
+        """Podmienia dane tabeli i przewija na początek (z zachowaniem sortowania)"""
+        self.rows = rows
+        self.first = 0
+        self.selected_index = None
+        self._order = None
+        self._positions = None
+        self._key_cache = {}
+        if self.headings.column is not None:
+            self.sort_by(self.headings.column, self.headings.descending)
+        else:
+            self.refresh()
+
+    def sort_by(self, column, descending=False):
+        """Sortuje wyświetlane wiersze według kolumny"""
+        self._order = sort_order(self._sort_keys_for(column), descending)
+        self._positions = None
+        self.headings.set(column, descending)
+
+        # Zaznaczony wiersz pozostaje widoczny, inaczej - początek tabeli
+        self.first = 0
+        if self.selected_index is not None and self.selected_index < len(self.rows):
+            self.first = max(0, self._position_of(self.selected_index) - self._visible // 2)
+        self.refresh()
+
+    def _sort_keys_for(self, column):
+        keys = self._key_cache.get(column)
+        if keys is None:
+            key = self.sort_keys.get(column)
+            if key is None:
+                column_index = self.columns.index(column)
+                key = lambda row: str(self.row_values(row)[column_index]).lower()
+            keys = column_sort_keys(self.rows, key, column)
+            self._key_cache[column] = keys
+        return keys
+
+    def _row_index(self, position):
+        return self._order[position] if self._order is not None else position
+
+    def _position_of(self, index):
+        if self._order is None:
+            return index
+        if self._positions is None:
+            self._positions = [0] * len(self._order)
+            for position, row_index in enumerate(self._order):
+                self._positions[row_index] = position
+        return self._positions[index]
+
+    def visible_range(self):
+        """Zakres pozycji wierszy aktualnie widocznych w tabeli"""
+        return range(self.first, self.first + len(self._items))
+
+    def selected_row(self):
+        """Zaznaczony wiersz modelu lub None"""
+        if self.selected_index is None or self.selected_index >= len(self.rows):
+            return None
+        return self.rows[self.selected_index]
+
+    def yview(self, *args):
+        """Obsługa pionowego paska przewijania (moveto / scroll)"""
+        total = len(self.rows)
+        if not args or not total:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= max(1, self._visible - 1)
+            self._scroll_by(step)
+
+    def scroll_to(self, first):
+        """Ustawia pierwszy widoczny wiersz"""
+        first = max(0, min(first, len(self.rows) - self._visible))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+
+    def see(self, position):
+        """Przewija tak, aby wiersz na danej pozycji był widoczny"""
+        if position < self.first:
+            self.scroll_to(position)
+        elif position >= self.first + self._visible:
+            self.scroll_to(position - self._visible + 1)
+
+    def refresh(self):
+        """Przerysowuje widoczne okno wierszy - O(liczba widocznych wierszy)"""
+        total = len(self.rows)
+        self.first = max(0, min(self.first, total - self._visible))
+        count = min(self._visible, total - self.first)
+
+        # Dopasowanie liczby elementów Treeview do liczby widocznych wierszy
+        while len(self._items) < count:
+            self._items.append(self.tree.insert("", "end", values=()))
+        if len(self._items) > count:
+            self.tree.delete(*self._items[count:])
+            del self._items[count:]
+
+        self._item_rows = {}
+        selected_item = None
+        for offset, item in enumerate(self._items):
+            index = self._row_index(self.first + offset)
+            self.tree.item(item, values=self._values_for(index))
+            self._item_rows[item] = index
+            if index == self.selected_index:
+                selected_item = item
+
+        if selected_item is not None:
+            self.tree.selection_set(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total:
+            self.scrollbar_y.set(self.first / total, (self.first + count) / total)
+        else:
+            self.scrollbar_y.set(0, 1)
+
+    def _values_for(self, index):
+        try:
+            return self.row_values(self.rows[index])
+        except Exception as e:
+            print(f"BŁĄD podczas formatowania wiersza {index}: {e}")
+            traceback.print_exc()
+            return ("Błąd",) * len(self.columns)
+
+    def _on_resize(self, event):
+        row_height = DEFAULT_ROW_HEIGHT
+        header_height = DEFAULT_ROW_HEIGHT
+        if self._items:
+            bbox = self.tree.bbox(self._items[0])
+            if bbox:
+                header_height, row_height = bbox[1], bbox[3]
+        visible = max(1, (event.height - header_height) // max(1, row_height))
+        if visible != self._visible:
+            self._visible = visible
+            self.refresh()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        # Przerysowanie okna zmienia zaznaczenie elementów - zapamiętujemy tylko wybór wiersza
+        if selection and selection[0] in self._item_rows:
+            self.selected_index = self._item_rows[selection[0]]
+
+    def _on_mousewheel(self, event):
+        if event.delta:
+            self._scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _scroll_by(self, step):
+        self.scroll_to(self.first + step)
+        return "break"
+
+    def _move_selection(self, step):
+        if not self.rows:
+            return "break"
+        if self.selected_index is not None:
+            current = self._position_of(self.selected_index)
+        else:
+            current = self.first - (step > 0)
+        position = max(0, min(current + step, len(self.rows) - 1))
+        self.selected_index = self._row_index(position)
+        self.see(position)
+        self.refresh()
+        return "break"
+
+
+class LazyGroupTree:
+    """Drzewo grup z leniwym rozwijaniem (Treeview z kolumną "#0").
+
+    Węzły dostają tylko element zastępczy - prawdziwe dzieci powstają przy pierwszym
+    rozwinięciu (<<TreeviewOpen>>). Pliki dużych grup wczytywane są stronami, a ostatni
+    węzeł "... więcej" rozwija kolejną stronę. Utworzenie drzewa nie zależy od liczby plików.
+
+    sections - lista (tytuł, funkcja zwracająca słownik nazwa grupy -> pliki).
+    """
+
+    PAGE_SIZE = 200
+    PLACEHOLDER_TEXT = "Wczytywanie..."
+
+    def __init__(self, parent, sections, file_label, height=None):
+        self.file_label = file_label
+        self._loaders = {}  # węzeł -> funkcja wstawiająca jego dzieci
+
+        self.frame = ttk.Frame(parent)
+        tree_options = {"show": "tree headings"}
+        if height is not None:
+            tree_options["height"] = height
+        self.tree = ttk.Treeview(self.frame, **tree_options)
+        self.tree.heading("#0", text="Grupy plików")
+        self.tree.column("#0", width=400)
+
+        scrollbar_y = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        scrollbar_x = ttk.Scrollbar(self.frame, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        scrollbar_y.pack(side="right", fill="y")
+        scrollbar_x.pack(side="bottom", fill="x")
+        self.tree.pack(fill="both", expand=True)
+
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+
+        for title, groups_provider in sections:
+            self.add_lazy_node("", title, lambda node, provider=groups_provider: self._load_groups(node, provider))
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def add_lazy_node(self, parent, text, loader):
+        """Wstawia węzeł, którego dzieci utworzy loader(węzeł) przy pierwszym rozwinięciu"""
+        node = self.tree.insert(parent, "end", text=text, open=False)
+        self.tree.insert(node, "end", text=self.PLACEHOLDER_TEXT)
+        self._loaders[node] = loader
+        return node
+
+    def _on_open(self, event):
+        node = self.tree.focus()
+        loader = self._loaders.pop(node, None)
+        if loader is None:
+            return
+
+        children = self.tree.get_children(node)
+        if children:
+            self.tree.delete(*children)
+        try:
+            loader(node)
+        except Exception as e:
+            print(f"Błąd rozwijania węzła drzewa grup: {e}")
+            traceback.print_exc()
+
+    def _load_groups(self, node, groups_provider):
+        for category, files in groups_provider().items():
+            self.add_lazy_node(node, f"{category} ({len(files)})",
+                               lambda group_node, files=files: self._insert_page(group_node, files, 0))
+
+    def _insert_page(self, parent, files, start):
+        end = min(start + self.PAGE_SIZE, len(files))
+        for file_info in files[start:end]:
+            self.tree.insert(parent, "end", text=self.file_label(file_info))
+
+        remaining = len(files) - end
+        if remaining > 0:
+            self.add_lazy_node(parent, f"... i {remaining} więcej (rozwiń)",
+                               lambda more_node: self._load_more(more_node, parent, files, end))
+
+    def _load_more(self, more_node, parent, files, start):
+        self.tree.delete(more_node)
+        self._insert_page(parent, files, start)
+
+
+class ChunkedLoader:
+    """Wstawia wiersze do widżetu porcjami ograniczonymi czasem (domyślnie 8 ms na wywołanie after).
+
+    Pierwsza porcja trafia do widżetu od razu, kolejne - między zdarzeniami okna, więc
+    duża grupa nie zamraża interfejsu. start() i cancel() przerywają poprzednie wczytywanie
+    (np. przy wyborze innej grupy).
+    """
+
+    def __init__(self, widget, budget_ms=CHUNK_BUDGET_MS):
+        self.widget = widget
+        self.budget = budget_ms / 1000
+        self._rows = None
+        self._insert_row = None
+        self._on_done = None
+        self._job = None
+
+    @property
+    def running(self):
+        return self._rows is not None
+
+    def start(self, rows, insert_row, on_done=None):
+        """Zaczyna wstawianie: insert_row(wiersz) dla każdego wiersza, on_done() na koniec"""
+        self.cancel()
+        self._rows = iter(rows)
+        self._insert_row = insert_row
+        self._on_done = on_done
+        self._step()
+
+    def cancel(self):
+        """Przerywa wstawianie (już wstawione wiersze zostają)"""
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except tk.TclError:
+                pass
+        self._job = None
+        self._rows = None
+
+    def _step(self):
+        self._job = None
+        rows = self._rows
+        if rows is None:
+            return
+
+        deadline = time.perf_counter() + self.budget
+        try:
+            for row in rows:
+                self._insert_row(row)
+                if time.perf_counter() >= deadline:
+                    self._job = self.widget.after(1, self._step)
+                    return
+        except tk.TclError:
+            # Widżet zniszczony w trakcie wczytywania
+            self._rows = None
+            return
+
+        self._rows = None
+        if self._on_done is not None:
+            self._on_done()
+
+
+def sync_listbox(listbox, shown, wanted, rank):
+    """Zmienia zawartość listy z shown na wanted, usuwając i wstawiając tylko różnice.
+
+    Obie listy są podciągami tej samej uporządkowanej listy (rank: element -> pozycja),
+    więc wystarczy jedno przejście scalające. Sąsiednie zmiany wykonywane są jednym wywołaniem Tk.
+    Zwraca nową zawartość listy.
+    """
+    position = 0
+    i = j = 0
+    while i < len(shown) or j < len(wanted):
+        if i < len(shown) and j < len(wanted) and shown[i] == wanted[j]:
+            i += 1
+            j += 1
+            position += 1
+        elif j >= len(wanted) or (i < len(shown) and rank[shown[i]] < rank[wanted[j]]):
+            # Ciąg elementów do usunięcia
+            start = i
+            while i < len(shown) and (j >= len(wanted) or rank[shown[i]] < rank[wanted[j]]):
+                i += 1
+            listbox.delete(position, position + (i - start) - 1)
+        else:
+            # Ciąg elementów do wstawienia
+            start = j
+            while j < len(wanted) and (i >= len(shown) or rank[wanted[j]] < rank[shown[i]]):
+                j += 1
+            listbox.insert(position, *wanted[start:j])
+            position += j - start
+    return list(wanted)